@@ -0,0 +1,53 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add `last_reply_id` and `last_activity_at` to `request_metadata`."""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1792314000"
+down_revision = "3ca07f2ee12b"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "request_metadata",
+        sa.Column(
+            "last_reply_id", sqlalchemy_utils.types.uuid.UUIDType(), nullable=True
+        ),
+    )
+    op.add_column(
+        "request_metadata",
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # Backfill from the last comment of each request
+    op.execute("""
+        UPDATE request_metadata SET
+            last_reply_id = (
+                SELECT e.id FROM request_events e
+                WHERE e.request_id = request_metadata.id AND e.type = 'C'
+                ORDER BY e.created DESC
+                LIMIT 1
+            ),
+            last_activity_at = (
+                SELECT max(e.created) FROM request_events e
+                WHERE e.request_id = request_metadata.id AND e.type = 'C'
+            )
+        """)
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_column("request_metadata", "last_activity_at")
+    op.drop_column("request_metadata", "last_reply_id")
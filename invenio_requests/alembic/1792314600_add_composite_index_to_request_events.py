@@ -0,0 +1,33 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add index on `request_events` (`request_id`, `type`, `created`)."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1792314600"
+down_revision = "1792314000"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_index(
+        op.f("ix_request_events_request_id_type_created"),
+        "request_events",
+        ["request_id", "type", "created"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(
+        op.f("ix_request_events_request_id_type_created"), table_name="request_events"
+    )
@@ -0,0 +1,149 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Move `parent_id` of request events from the JSON to a column."""
+
+from uuid import UUID
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1792315200"
+down_revision = "1792314600"
+branch_labels = ()
+depends_on = None
+
+BATCH_SIZE = 1000
+
+request_events = sa.table(
+    "request_events",
+    sa.column("id", sqlalchemy_utils.types.uuid.UUIDType()),
+    sa.column("json", sa.JSON().with_variant(postgresql.JSONB(), "postgresql")),
+    sa.column("parent_id", sqlalchemy_utils.types.uuid.UUIDType()),
+)
+
+
+def _update_events(connection, values):
+    """Update the JSON and the parent of the given events."""
+    connection.execute(
+        sa.update(request_events)
+        .where(request_events.c.id == sa.bindparam("event_id"))
+        .values(
+            json=sa.bindparam("event_json"),
+            parent_id=sa.bindparam("event_parent_id"),
+        ),
+        values,
+    )
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "request_events",
+        sa.Column("parent_id", sqlalchemy_utils.types.uuid.UUIDType(), nullable=True),
+    )
+    connection = op.get_bind()
+
+    # Backfill from the JSON, and remove the key from it (the events leave the
+    # selection once updated)
+    json_parent_id = request_events.c.json["parent_id"].as_string()
+    query = (
+        sa.select(request_events.c.id, request_events.c.json)
+        .where(json_parent_id.isnot(None))
+        .limit(BATCH_SIZE)
+    )
+    while rows := connection.execute(query).fetchall():
+        values = []
+        for event_id, json in rows:
+            json = dict(json)
+            parent_id = json.pop("parent_id")
+            values.append(
+                {
+                    "event_id": event_id,
+                    "event_json": json,
+                    "event_parent_id": UUID(parent_id) if parent_id else None,
+                }
+            )
+        _update_events(connection, values)
+
+    # Replies to events that don't exist anymore can't satisfy the constraint
+    parents = request_events.alias("parents")
+    orphans = (
+        sa.select(request_events.c.id)
+        .select_from(
+            request_events.outerjoin(
+                parents, parents.c.id == request_events.c.parent_id
+            )
+        )
+        .where(request_events.c.parent_id.isnot(None), parents.c.id.is_(None))
+    )
+    orphan_ids = connection.execute(orphans).scalars().all()
+    for i in range(0, len(orphan_ids), BATCH_SIZE):
+        connection.execute(
+            sa.update(request_events)
+            .where(request_events.c.id.in_(orphan_ids[i : i + BATCH_SIZE]))
+            .values(parent_id=None)
+        )
+
+    op.create_index(
+        op.f("ix_request_events_parent_id"),
+        "request_events",
+        ["parent_id"],
+        unique=False,
+    )
+    op.create_foreign_key(
+        op.f("fk_request_events_parent_id_request_events"),
+        "request_events",
+        "request_events",
+        ["parent_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_constraint(
+        op.f("fk_request_events_parent_id_request_events"),
+        "request_events",
+        type_="foreignkey",
+    )
+    op.drop_index(op.f("ix_request_events_parent_id"), table_name="request_events")
+    connection = op.get_bind()
+
+    # Move the parent IDs back into the JSON
+    query = (
+        sa.select(
+            request_events.c.id, request_events.c.json, request_events.c.parent_id
+        )
+        .where(
+            request_events.c.parent_id.isnot(None),
+            request_events.c.json.isnot(None),
+        )
+        .order_by(request_events.c.id)
+        .limit(BATCH_SIZE)
+    )
+    last_id = None
+    while rows := connection.execute(
+        query if last_id is None else query.where(request_events.c.id > last_id)
+    ).fetchall():
+        _update_events(
+            connection,
+            [
+                {
+                    "event_id": event_id,
+                    "event_json": {**json, "parent_id": str(parent_id)},
+                    "event_parent_id": parent_id,
+                }
+                for event_id, json, parent_id in rows
+            ],
+        )
+        last_id = rows[-1][0]
+    op.drop_column("request_events", "parent_id")
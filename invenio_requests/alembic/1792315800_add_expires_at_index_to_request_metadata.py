@@ -0,0 +1,33 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add partial index on `request_metadata` (`expires_at`)."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1792315800"
+down_revision = "1792315200"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_index(
+        op.f("ix_request_metadata_expires_at"),
+        "request_metadata",
+        ["expires_at"],
+        unique=False,
+        postgresql_where=sa.text("expires_at IS NOT NULL"),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(op.f("ix_request_metadata_expires_at"), table_name="request_metadata")
@@ -0,0 +1,95 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add the expiry bucket to `request_metadata`."""
+
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1792316400"
+down_revision = "1792315800"
+branch_labels = ()
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# Default of REQUESTS_EXPIRY_BUCKET_SIZE
+BUCKET_SIZE = 60 * 60
+
+request_metadata = sa.table(
+    "request_metadata",
+    sa.column("id", sqlalchemy_utils.types.uuid.UUIDType()),
+    sa.column("expires_at", sa.DateTime(timezone=True)),
+    sa.column("expiry_bucket", sa.DateTime(timezone=True)),
+)
+
+
+def _expiry_bucket(expires_at):
+    """Get the start of the bucket containing the expiry date."""
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    timestamp = int(expires_at.timestamp())
+    return datetime.fromtimestamp(timestamp - timestamp % BUCKET_SIZE, tz=timezone.utc)
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "request_metadata",
+        sa.Column("expiry_bucket", sa.DateTime(timezone=True), nullable=True),
+    )
+    connection = op.get_bind()
+
+    # File the requests with an expiry date into the buckets of the default
+    # size, whatever their status: the requests that are not open are removed
+    # from their bucket by ``expire_due_requests`` once it's due, or by their
+    # next commit. The buckets are not recomputed when the size is configured
+    # differently, but they still start before the expiry date, so the
+    # requests are found once they're due.
+    query = (
+        sa.select(request_metadata.c.id, request_metadata.c.expires_at)
+        .where(request_metadata.c.expires_at.isnot(None))
+        .order_by(request_metadata.c.id)
+        .limit(BATCH_SIZE)
+    )
+    last_id = None
+    while rows := connection.execute(
+        query if last_id is None else query.where(request_metadata.c.id > last_id)
+    ).fetchall():
+        connection.execute(
+            sa.update(request_metadata)
+            .where(request_metadata.c.id == sa.bindparam("request_id"))
+            .values(expiry_bucket=sa.bindparam("request_bucket")),
+            [
+                {
+                    "request_id": request_id,
+                    "request_bucket": _expiry_bucket(expires_at),
+                }
+                for request_id, expires_at in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+    op.create_index(
+        op.f("ix_request_metadata_expiry_bucket"),
+        "request_metadata",
+        ["expiry_bucket"],
+        unique=False,
+        postgresql_where=sa.text("expiry_bucket IS NOT NULL"),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(
+        op.f("ix_request_metadata_expiry_bucket"), table_name="request_metadata"
+    )
+    op.drop_column("request_metadata", "expiry_bucket")
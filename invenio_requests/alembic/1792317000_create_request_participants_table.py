@@ -0,0 +1,101 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Create the `request_participants` table."""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1792317000"
+down_revision = "1792316400"
+branch_labels = ()
+depends_on = None
+
+BATCH_SIZE = 1000
+
+request_metadata = sa.table(
+    "request_metadata",
+    sa.column("id", sqlalchemy_utils.types.uuid.UUIDType()),
+)
+
+request_events = sa.table(
+    "request_events",
+    sa.column("request_id", sqlalchemy_utils.types.uuid.UUIDType()),
+    sa.column("json", sa.JSON().with_variant(postgresql.JSONB(), "postgresql")),
+)
+
+request_participants = sa.table(
+    "request_participants",
+    sa.column("request_id", sqlalchemy_utils.types.uuid.UUIDType()),
+    sa.column("user_id", sa.String(length=255)),
+)
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "request_participants",
+        sa.Column("request_id", sqlalchemy_utils.types.uuid.UUIDType(), nullable=False),
+        sa.Column("user_id", sa.String(length=255), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["request_id"],
+            ["request_metadata.id"],
+            name=op.f("fk_request_participants_request_id_request_metadata"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "request_id", "user_id", name=op.f("pk_request_participants")
+        ),
+    )
+
+    connection = op.get_bind()
+
+    # Backfill from the creators of the events, a batch of requests at a time
+    # (all the events of a request are in the same batch, so the participants
+    # are distinct across batches)
+    requests_query = (
+        sa.select(request_metadata.c.id)
+        .order_by(request_metadata.c.id)
+        .limit(BATCH_SIZE)
+    )
+    event_user_id = request_events.c.json[("created_by", "user")].as_string()
+    last_id = None
+    while request_ids := (
+        connection.execute(
+            requests_query
+            if last_id is None
+            else requests_query.where(request_metadata.c.id > last_id)
+        )
+        .scalars()
+        .all()
+    ):
+        rows = connection.execute(
+            sa.select(request_events.c.request_id, event_user_id)
+            .where(
+                request_events.c.request_id.in_(request_ids),
+                event_user_id.isnot(None),
+            )
+            .distinct()
+        ).fetchall()
+        values = {(request_id, str(user_id)) for request_id, user_id in rows}
+        if values:
+            connection.execute(
+                sa.insert(request_participants),
+                [
+                    {"request_id": request_id, "user_id": user_id}
+                    for request_id, user_id in values
+                ],
+            )
+        last_id = request_ids[-1]
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_table("request_participants")
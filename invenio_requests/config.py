@@ -37,6 +37,19 @@ REQUESTS_REGISTERED_EVENT_TYPES = [
 REQUESTS_ENTITY_RESOLVERS = [UserResolver(), GroupResolver()]
 """Registered resolvers for resolving/creating references in request metadata."""
 
+REQUESTS_ENTITY_CACHE_TTL = {}
+"""Seconds to cache the expanded entities of each type across HTTP requests.
+
+The keys are the types of the entity resolvers, e.g.
+``{"user": 300, "group": 300}``. Entities of other types are read again for
+every request. Cached users and groups are invalidated when a transaction
+updating or deleting them is committed by the same process, other processes
+see the change at the latest when the entry expires.
+"""
+
+REQUESTS_ENTITY_CACHE_SIZE = 1000
+"""Maximum number of entities cached by each process."""
+
 REQUESTS_ROUTES = {
     "download_file_html": "/requests/<uuid:pid_value>/files/<path:file_key>",
 }
@@ -148,6 +161,81 @@ This limits the size of indexed documents when comments have many replies.
 Additional replies can be loaded via pagination.
 """
 
+REQUESTS_COMMENT_PREVIEW_STRATEGY = "join"
+"""How the previews of the replies are fetched for a timeline page.
+
+- ``"join"``: a ``has_child`` join with inner hits, for every parent.
+- ``"batched"``: one extra query for the replies of the page's parents, which
+  skips the parents that have no replies according to their ``reply_count``.
+  The previews come from a ``top_hits`` aggregation per parent.
+- ``"collapse"``: like ``"batched"``, but the replies are collapsed by parent
+  and the previews come from the inner hits of each collapsed group.
+
+Both ``"batched"`` and ``"collapse"`` can be used on clusters where ``has_child``
+joins are disabled.
+"""
+
+REQUESTS_REINDEX_STRATEGY = "commit"
+"""How requests are reindexed after changes to their events.
+
+Within a unit of work, a request is reindexed at most once, no matter how many
+of its events are created, updated or deleted.
+
+- ``"commit"``: the request is indexed when the unit of work is committed.
+- ``"queue"``: the request is sent to the ``requests`` bulk indexing queue, which
+  also coalesces repeated messages across units of work. The queue has to be
+  processed periodically, e.g. with the ``process_bulk_queue`` task of
+  Invenio-Indexer and ``indexer_name="requests"``.
+"""
+
+REQUESTS_ACTION_INDEX_REFRESH = "wait_for"
+"""How the requests index is refreshed after executing an action.
+
+- ``"wait_for"``: the request is indexed with ``refresh=wait_for``, so the action
+  returns once the request is visible to search, without forcing a refresh.
+- ``True``: the requests index is refreshed after the action is committed.
+- ``False``: no refresh, the request becomes searchable with the next periodic
+  refresh of the index.
+
+Can be overridden per call with the ``refresh`` argument of
+``RequestsService.execute_action`` (or the ``refresh`` query string parameter of
+the REST API).
+"""
+
+REQUESTS_BULK_ACTION_MAX_REQUESTS = 100
+"""Maximum number of requests of a bulk action over the REST API."""
+
+REQUESTS_BULK_COMMENTS_MAX_ITEMS = 100
+"""Maximum number of comments created at once over the REST API."""
+
+REQUESTS_PARTICIPANTS_LOOKUP = "database"
+"""How the participants of a request or comment thread are looked up.
+
+- ``"database"``: from the participants recorded in the database when events
+  are created.
+- ``"aggregation"``: with a terms aggregation on the creators of the events of
+  the request, limited to ``REQUESTS_PARTICIPANTS_LIMIT`` users.
+"""
+
+REQUESTS_PARTICIPANTS_LIMIT = 1000
+"""Maximum number of participants returned by the ``"aggregation"`` lookup."""
+
+REQUESTS_EXPIRY_CHUNK_SIZE = 100
+"""Number of expired requests handled per transaction.
+
+``check_expired_requests`` pages through the expired requests and dispatches
+them in chunks of this size to ``expire_requests`` tasks, and
+``sweep_expired_requests`` locks and expires batches of this size.
+"""
+
+REQUESTS_EXPIRY_BUCKET_SIZE = 60 * 60  # 1 hour
+"""Size of the time buckets into which requests are filed by expiry date, in seconds.
+
+``expire_due_requests`` only looks at the requests of the due buckets. Requests
+expire at most one bucket size after their expiry date, if the task is
+scheduled at least as often.
+"""
+
 REQUESTS_FILES_DEFAULT_QUOTA_SIZE = 100 * 10**6  # 100MB
 REQUESTS_FILES_DEFAULT_MAX_FILE_SIZE = 10 * 10**6  # 10MB
 
@@ -13,6 +13,9 @@
 
 import inspect
 
+import sqlalchemy as sa
+from flask import current_app, has_app_context
+from invenio_accounts.models import Role, User
 from invenio_base.utils import entry_points
 
 from . import config
@@ -34,6 +37,8 @@ from .services import (
     RequestsServiceConfig,
     UserModerationRequestService,
 )
+from .services.links import URLTemplates
+from .services.results import ResolvedEntitiesCache
 
 
 class InvenioRequests:
@@ -47,6 +52,9 @@ class InvenioRequests:
         self.request_files_service = None
         self._schema_cache = {}
         self._events_schema_cache = {}
+        # Wrapped schemas used to dump result lists, see ``wrap_type_schema``.
+        self._wrapped_schema_cache = {}
+        self._wrapped_events_schema_cache = {}
         if app:
             self.init_app(app)
 
@@ -56,6 +64,8 @@ class InvenioRequests:
         self.init_services(app)
         self.init_resources(app)
         self.init_registry(app)
+        self.init_entity_cache(app)
+        self.url_templates = URLTemplates()
         app.extensions["invenio-requests"] = self
 
     def init_config(self, app):
@@ -128,6 +138,53 @@ class InvenioRequests:
             self.entity_resolvers_registry, "invenio_requests.entity_resolvers"
         )
 
+    def init_entity_cache(self, app):
+        """Initialize the cache of the entities resolved across HTTP requests."""
+        self.resolved_entities_cache = ResolvedEntitiesCache(
+            maxsize=app.config["REQUESTS_ENTITY_CACHE_SIZE"]
+        )
+        for identifier, receiver in (
+            ("after_flush", collect_cached_entities),
+            ("after_commit", invalidate_cached_entities),
+            ("after_transaction_end", discard_cached_entities),
+        ):
+            if not sa.event.contains(sa.orm.Session, identifier, receiver):
+                sa.event.listen(sa.orm.Session, identifier, receiver)
+
+
+CACHED_ENTITY_MODELS = {User: "user", Role: "group"}
+"""Models of the entities kept in the cache, with the type of their resolver."""
+
+
+def collect_cached_entities(session, flush_context):
+    """Collect the cached entities updated or deleted by a flush.
+
+    They are only invalidated once the transaction is committed, otherwise a
+    read between the flush and the commit would cache the old entity again.
+    """
+    for target in set(session.dirty) | set(session.deleted):
+        type_id = CACHED_ENTITY_MODELS.get(type(target))
+        if type_id is not None and target.id is not None:
+            pending = session.info.setdefault("requests_cached_entities", set())
+            pending.add((type_id, str(target.id)))
+
+
+def invalidate_cached_entities(session):
+    """Remove the entities changed by the committed transaction from the cache."""
+    pending = session.info.pop("requests_cached_entities", None)
+    if not pending or not has_app_context():
+        return
+    ext = current_app.extensions.get("invenio-requests")
+    if ext is not None:
+        for type_id, value in pending:
+            ext.resolved_entities_cache.invalidate(type_id, value)
+
+
+def discard_cached_entities(session, transaction):
+    """Forget the entities changed by a transaction that was rolled back."""
+    if transaction.parent is None:
+        session.info.pop("requests_cached_entities", None)
+
 
 def register_entry_point(registry, ep_name, app=None):
     """Register types from an entry point."""
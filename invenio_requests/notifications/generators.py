@@ -7,6 +7,7 @@
 
 """Notification generators."""
 
+from flask import current_app
 from invenio_access.permissions import system_identity
 from invenio_notifications.models import Recipient
 from invenio_notifications.services.generators import RecipientGenerator
@@ -14,7 +15,7 @@ from invenio_records.dictutils import dict_lookup
 from invenio_search.engine import dsl
 from invenio_users_resources.proxies import current_users_service
 
-from ..proxies import current_events_service
+from ..proxies import current_events_service, current_requests_service
 
 
 def _get_user_id_from_entity(entity_field):
@@ -42,12 +43,64 @@ def _get_user_id_from_entity(entity_field):
     return non_expanded_id or expanded_id
 
 
+def _aggregate_event_creators(query):
+    """Get the IDs of the users who created the events matching a query.
+
+    Uses a terms aggregation, limited to ``REQUESTS_PARTICIPANTS_LIMIT`` users.
+    """
+    service = current_events_service
+    search = (
+        service.create_search(
+            system_identity,
+            service.record_cls,
+            service.config.search,
+            permission_action="unused",
+        )
+        .filter(query)
+        .extra(size=0, track_total_hits=False)
+    )
+    search.aggs.bucket(
+        "creators",
+        "terms",
+        field="created_by.user",
+        size=current_app.config["REQUESTS_PARTICIPANTS_LIMIT"],
+    )
+    buckets = search.execute().aggregations.creators.buckets
+    return {bucket.key for bucket in buckets}
+
+
+def _add_user_recipients(user_ids, recipients):
+    """Fetch the given users and add them as recipients."""
+    # remove system_user_id if present
+    user_ids = set(user_ids)
+    user_ids.discard(system_identity.id)
+    if not user_ids:
+        return
+
+    filter_ = dsl.Q("terms", **{"id": list(user_ids)})
+    users = current_users_service.scan(system_identity, extra_filter=filter_)
+    for u in users:
+        recipients[u["id"]] = Recipient(data=u)
+
+
 class RequestParticipantsRecipient(RecipientGenerator):
-    """Recipient generator based on request and it's events."""
+    """Recipient generator based on request and it's events.
 
-    def __init__(self, key):
+    The users who created events of the request are looked up as configured
+    by ``REQUESTS_PARTICIPANTS_LOOKUP``, unless a ``lookup`` is given.
+    """
+
+    def __init__(self, key, lookup=None):
         """Ctor."""
         self.key = key
+        self.lookup = lookup
+
+    def _get_participant_ids(self, request):
+        """Get the IDs of the users who created events of the request."""
+        lookup = self.lookup or current_app.config["REQUESTS_PARTICIPANTS_LOOKUP"]
+        if lookup == "aggregation":
+            return _aggregate_event_creators(dsl.Q("term", request_id=request["id"]))
+        return current_requests_service.record_cls.get_participant_ids(request["id"])
 
     def __call__(self, notification, recipients: dict):
         """Fetch users involved in request and add as recipients."""
@@ -65,28 +118,9 @@ class RequestParticipantsRecipient(RecipientGenerator):
         if receiver_user_id:
             user_ids.add(receiver_user_id)
 
-        # fetching all request events to get involved users
-        request_events = current_events_service.scan(
-            request_id=request["id"],
-            identity=system_identity,
-            extra_filter=dsl.Q("term", request_id=request["id"]),
-        )
-
-        user_ids.update(
-            {
-                re["created_by"]["user"]
-                for re in request_events
-                if re["created_by"].get("user")
-            }
-        )
-
-        # remove system_user_id if present
-        user_ids.discard(system_identity.id)
+        user_ids.update(self._get_participant_ids(request))
 
-        filter_ = dsl.Q("terms", **{"id": list(user_ids)})
-        users = current_users_service.scan(system_identity, extra_filter=filter_)
-        for u in users:
-            recipients[u["id"]] = Recipient(data=u)
+        _add_user_recipients(user_ids, recipients)
         return recipients
 
 
@@ -101,10 +135,28 @@ class CommentRepliesParticipantsRecipient(RecipientGenerator):
     in the specific conversation thread, not all request participants.
     """
 
-    def __init__(self, key, event_key):
+    def __init__(self, key, event_key, lookup=None):
         """Ctor."""
         self.key = key
         self.event_key = event_key
+        self.lookup = lookup
+
+    def _get_participant_ids(self, request, parent_id):
+        """Get the IDs of the users who created the parent event or its replies."""
+        lookup = self.lookup or current_app.config["REQUESTS_PARTICIPANTS_LOOKUP"]
+        if lookup == "aggregation":
+            return _aggregate_event_creators(
+                dsl.Q(
+                    "bool",
+                    must=[dsl.Q("term", request_id=request["id"])],
+                    should=[
+                        dsl.Q("term", id=parent_id),
+                        dsl.Q("term", parent_id=parent_id),
+                    ],
+                    minimum_should_match=1,
+                )
+            )
+        return current_events_service.record_cls.get_thread_creator_ids(parent_id)
 
     def __call__(self, notification, recipients: dict):
         """Fetch users involved in the comment thread and add as recipients."""
@@ -115,55 +167,7 @@ class CommentRepliesParticipantsRecipient(RecipientGenerator):
         # If this event has a parent_id, use it. Otherwise, this IS the parent.
         parent_id = request_event.get("parent_id") or request_event["id"]
 
-        user_ids = set()
-
-        # Get parent event and its creator
-        try:
-            parent_event = current_events_service.read(
-                identity=system_identity, id_=parent_id
-            ).to_dict()
-
-            parent_user_id = _get_user_id_from_entity(
-                parent_event.get("created_by", {})
-            )
-            if parent_user_id:
-                user_ids.add(parent_user_id)
-        except Exception:
-            # Parent not found or error reading, skip
-            pass
-
-        # Get all replies to the parent event for the given request
-        replies_filter = dsl.Q(
-            "bool",
-            must=[
-                dsl.Q("term", request_id=request["id"]),
-                dsl.Q("term", parent_id=parent_id),
-            ],
-        )
-        # Get all children (replies) and their creators
-        # NOTE: To be improved in https://github.com/inveniosoftware/invenio-requests/issues/508
-        children_events = current_events_service.scan(
-            identity=system_identity,
-            request_id=request["id"],
-            extra_filter=replies_filter,
-        )
-
-        user_ids.update(
-            {
-                child["created_by"]["user"]
-                for child in children_events
-                if child.get("created_by", {}).get("user")
-            }
-        )
-
-        # Remove system user if present
-        user_ids.discard(system_identity.id)
-
-        # Fetch users and add as recipients
-        if user_ids:
-            filter_ = dsl.Q("terms", **{"id": list(user_ids)})
-            users = current_users_service.scan(system_identity, extra_filter=filter_)
-            for u in users:
-                recipients[u["id"]] = Recipient(data=u)
+        user_ids = self._get_participant_ids(request, parent_id)
 
+        _add_user_recipients(user_ids, recipients)
         return recipients
@@ -8,6 +8,7 @@
 
 """API classes for requests in Invenio."""
 
+from datetime import datetime, timezone
 from enum import Enum
 from functools import partial
 
@@ -18,20 +19,29 @@ from invenio_records.dumpers import SearchDumper
 from invenio_records.systemfields import ConstantField, DictField, ModelField
 from invenio_records_resources.records.api import FileRecord, Record
 from invenio_records_resources.records.systemfields import IndexField
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm.attributes import set_committed_value
 
 from invenio_requests.records.systemfields.files import RequestFilesField
 
+from ..customizations import CommentEventType
 from ..customizations import RequestState as State
 from .dumpers import (
     CalculatedFieldDumperExt,
     GrantTokensDumperExt,
     ParentChildDumperExt,
 )
-from .models import RequestEventModel, RequestFileMetadata, RequestMetadata
+from .models import (
+    RequestEventModel,
+    RequestFileMetadata,
+    RequestMetadata,
+    RequestParticipantModel,
+)
 from .systemfields import (
     EntityReferenceField,
     EventTypeField,
     ExpiredStateCalculatedField,
+    ExpiryBucketField,
     IdentityField,
     LastActivity,
     LastReply,
@@ -95,9 +105,178 @@ class RequestEvent(Record):
     created_by = EntityReferenceField("created_by", check_referenced)
     """Who created the event."""
 
-    parent_id = DictField("parent_id")
+    parent_id = ModelField("parent_id")
     """The parent event ID for parent-child relationships."""
 
+    reply_count = DictField("reply_count")
+    """The number of replies to a top-level event (denormalized)."""
+
+    last_reply_at = DictField("last_reply_at")
+    """When the last reply to a top-level event was created (denormalized)."""
+
+    @classmethod
+    def _thread_events_filters(cls, request_id, parent_id=None):
+        """Filters selecting the events of a request at the same threading level."""
+        model_cls = cls.model_cls
+        return [
+            model_cls.request_id == request_id,
+            model_cls.json.isnot(None),
+            (
+                model_cls.parent_id.is_(None)
+                if parent_id is None
+                else model_cls.parent_id == parent_id
+            ),
+        ]
+
+    @classmethod
+    def count_thread_events(
+        cls, request_id, parent_id=None, created_before=None, created_after=None
+    ):
+        """Count the events of a request at the same threading level.
+
+        Counts the top-level events of the request if no ``parent_id`` is given,
+        or the replies to the given parent event otherwise. The count can be
+        restricted to the events created strictly before/after a given date.
+        """
+        model_cls = cls.model_cls
+        query = db.session.query(func.count(model_cls.id)).filter(
+            *cls._thread_events_filters(request_id, parent_id)
+        )
+        if created_before is not None:
+            query = query.filter(model_cls.created < created_before)
+        if created_after is not None:
+            query = query.filter(model_cls.created > created_after)
+
+        return query.scalar()
+
+    @classmethod
+    def get_reply_stats(cls, request_id, parent_id):
+        """Get the number of replies to an event and when the last one was created."""
+        model_cls = cls.model_cls
+        return (
+            db.session.query(func.count(model_cls.id), func.max(model_cls.created))
+            .filter(*cls._thread_events_filters(request_id, parent_id))
+            .one()
+        )
+
+    @classmethod
+    def _set_reply_stats(cls, data, request_id, event_id):
+        """Set the current reply stats of an event in its data."""
+        reply_count, last_reply_created = cls.get_reply_stats(request_id, event_id)
+        data["reply_count"] = reply_count
+        if last_reply_created is not None:
+            data["last_reply_at"] = last_reply_created.isoformat()
+        else:
+            data.pop("last_reply_at", None)
+
+    @classmethod
+    def update_reply_stats(cls, parent_id):
+        """Persist the number of replies to an event and when the last one was created.
+
+        Stores the stats in the data of the parent event, without bumping its
+        revision, and returns the parent event with its updated data. The stats
+        are computed again whenever the parent event is committed, so that a
+        concurrent update of the parent doesn't overwrite them.
+        """
+        model_cls = cls.model_cls
+        # Lock the parent, so that concurrent replies are all counted.
+        model = (
+            model_cls.query.filter_by(id=parent_id)
+            .with_for_update()
+            .populate_existing()
+            .one()
+        )
+        json = dict(model.json)
+        cls._set_reply_stats(json, model.request_id, model.id)
+        db.session.execute(
+            update(model_cls).where(model_cls.id == model.id)
+            # keep ``updated`` as is, the event itself didn't change
+            .values(json=json, updated=model_cls.updated)
+        )
+        set_committed_value(model, "json", json)
+        return cls(model.data, model=model)
+
+    @classmethod
+    def last_reply_query(cls, request_id):
+        """Query the comment events of a request, from the newest one."""
+        model_cls = cls.model_cls
+        return (
+            db.session.query(model_cls)
+            .filter(
+                model_cls.request_id == request_id,
+                model_cls.type == CommentEventType.type_id,
+            )
+            .order_by(model_cls.created.desc())
+        )
+
+    @classmethod
+    def get_last_reply_model(cls, request_id):
+        """Get the model of the last comment event of a request."""
+        return cls.last_reply_query(request_id).first()
+
+    @classmethod
+    def get_thread_creator_ids(cls, parent_id):
+        """Get the IDs of the users who created a parent event or its replies."""
+        model_cls = cls.model_cls
+        user_id = model_cls.json[("created_by", "user")].as_string()
+        query = (
+            db.session.query(user_id)
+            .filter(
+                or_(model_cls.id == parent_id, model_cls.parent_id == parent_id),
+                user_id.isnot(None),
+            )
+            .distinct()
+        )
+        return {user_id for (user_id,) in query}
+
+    @classmethod
+    def build(cls, data, **kwargs):
+        """Build a new event, without storing it in the database yet.
+
+        Built events are stored in the database with :meth:`create_many`.
+        """
+        record = cls(data, model=cls.model_cls(data=data), **kwargs)
+        for e in cls._extensions:
+            e.pre_create(record)
+        return record
+
+    @classmethod
+    def create_many(cls, events):
+        """Store built events in the database with a single flush.
+
+        Same as :meth:`create` followed by :meth:`commit` for each event, but
+        without a savepoint and a flush per event.
+        """
+        for event in events:
+            for e in cls._extensions:
+                e.pre_commit(event)
+            event.model.json = event._validate()
+            db.session.add(event.model)
+        db.session.flush()
+
+        for event in events:
+            for e in cls._extensions:
+                e.post_create(event)
+            for e in cls._extensions:
+                e.post_commit(event)
+        return events
+
+    def commit(self, **kwargs):
+        """Store the changes of the event.
+
+        The reply stats of a top-level event are computed again, while holding
+        the lock of its row, as they might have changed since it was loaded.
+        """
+        if self.model is not None and "reply_count" in self:
+            model_cls = self.model_cls
+            db.session.execute(
+                select(model_cls.id)
+                .where(model_cls.id == self.model.id)
+                .with_for_update()
+            )
+            self._set_reply_stats(self, self.model.request_id, self.model.id)
+        return super().commit(**kwargs)
+
     def pre_commit(self):
         """Hook called before committing the record.
 
@@ -147,6 +326,9 @@ class Request(Record):
     model_cls = RequestMetadata
     """The model class for the request."""
 
+    participant_model_cls = RequestParticipantModel
+    """The model class for the participants of the request."""
+
     dumper = SearchDumper(
         extensions=[
             CalculatedFieldDumperExt("is_closed"),
@@ -204,6 +386,9 @@ class Request(Record):
     is_expired = ExpiredStateCalculatedField("expires_at")
     """Whether or not the request is already expired."""
 
+    expiry_bucket = ExpiryBucketField()
+    """The time bucket in which the open request expires (if any)."""
+
     last_reply = LastReply()
     """The complete last reply event in the request."""
 
@@ -225,3 +410,113 @@ class Request(Record):
         create=False,  # Lazy initialization
         bucket_args=get_files_quota,  # Quota config
     )
+
+    @classmethod
+    def get_participant_ids(cls, request_id):
+        """Get the IDs of the users who created events in the request."""
+        return cls.participant_model_cls.get_user_ids(request_id)
+
+    def add_participants(self, user_ids):
+        """Record the given users as participants of the request."""
+        self.participant_model_cls.add(self.id, user_ids)
+
+    @classmethod
+    def lock_expired_ids(cls, statuses, limit, exclude=None, now=None):
+        """Lock a batch of expired requests with the given statuses.
+
+        The rows are selected with ``FOR UPDATE SKIP LOCKED``, so that concurrent
+        sweeps get disjoint batches. The locks are held until the end of the
+        transaction.
+
+        :param statuses: the (open) statuses of the requests to select.
+        :param limit: the maximum number of requests to select.
+        :param exclude: IDs of requests not to select (e.g. failed ones).
+        :param now: the expiry reference date, defaults to the current date.
+        :returns: the IDs of the locked requests.
+        """
+        model_cls = cls.model_cls
+        now = now or datetime.now(timezone.utc)
+        query = (
+            db.session.query(model_cls.id)
+            .filter(
+                model_cls.expires_at.isnot(None),
+                model_cls.expires_at <= now,
+                model_cls.json["status"].as_string().in_(list(statuses)),
+            )
+            .order_by(model_cls.expires_at)
+        )
+        if exclude:
+            query = query.filter(model_cls.id.notin_(list(exclude)))
+        query = query.limit(limit).with_for_update(skip_locked=True)
+        return [id_ for (id_,) in query]
+
+    @classmethod
+    def lock_due_ids(cls, limit, exclude=None, now=None):
+        """Lock a batch of requests of the due expiry buckets.
+
+        Only the open requests with an expiry date are filed into buckets, see
+        ``ExpiryBucketField``, but the selected requests may not be open anymore
+        (e.g. if filed by a migration). As with :meth:`lock_expired_ids`, the rows are
+        selected with ``FOR UPDATE SKIP LOCKED``.
+
+        :param limit: the maximum number of requests to select.
+        :param exclude: IDs of requests not to select (e.g. failed ones).
+        :param now: the expiry reference date, defaults to the current date.
+        :returns: the IDs of the locked requests.
+        """
+        model_cls = cls.model_cls
+        now = now or datetime.now(timezone.utc)
+        query = (
+            db.session.query(model_cls.id)
+            .filter(
+                model_cls.expiry_bucket <= ExpiryBucketField.bucket_of(now),
+                model_cls.expires_at <= now,
+            )
+            .order_by(model_cls.expiry_bucket)
+        )
+        if exclude:
+            query = query.filter(model_cls.id.notin_(list(exclude)))
+        query = query.limit(limit).with_for_update(skip_locked=True)
+        return [id_ for (id_,) in query]
+
+    @classmethod
+    def unschedule_expiry(cls, ids):
+        """Remove the given requests from their expiry buckets."""
+        model_cls = cls.model_cls
+        db.session.execute(
+            update(model_cls).where(model_cls.id.in_(list(ids)))
+            # keep ``updated`` as is, the request itself didn't change
+            .values(expiry_bucket=None, updated=model_cls.updated)
+        )
+
+    def update_last_reply(self, last_reply=None):
+        """Persist the last reply of the request.
+
+        Stores the ID and creation date of the last reply in the model, without
+        bumping the revision of the request. If no reply is given, the last reply
+        is looked up among the comments of the request.
+        """
+        if last_reply is None:
+            last_reply_model = self.event_cls.get_last_reply_model(self.id)
+        else:
+            last_reply_model = last_reply.model
+
+        values = {
+            "last_reply_id": last_reply_model.id if last_reply_model else None,
+            "last_activity_at": (
+                last_reply_model.created if last_reply_model else None
+            ),
+        }
+        model_cls = self.model_cls
+        db.session.execute(
+            update(model_cls).where(model_cls.id == self.id)
+            # keep ``updated`` as is, the request itself didn't change
+            .values(updated=model_cls.updated, **values)
+        )
+        for key, value in values.items():
+            set_committed_value(self.model, key, value)
+
+        # Invalidate the cached computed fields
+        obj_cache = getattr(self, "_obj_cache", None) or {}
+        obj_cache.pop("last_reply", None)
+        obj_cache.pop("last_activity_at", None)
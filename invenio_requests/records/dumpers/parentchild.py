@@ -31,8 +31,9 @@ class ParentChildDumperExt(SearchDumperExt):
             # This is a child event (reply)
             data["parent_child"] = {"name": "child", "parent": str(record.parent_id)}
         else:
-            # This is a parent event
+            # This is a parent event, which has no `parent_id` in its dump
             data["parent_child"] = {"name": "parent"}
+            data.pop("parent_id", None)
 
     def load(self, data, record_cls):
         """Load the data.
@@ -41,3 +42,5 @@ class ParentChildDumperExt(SearchDumperExt):
         not in the record data, so we remove it when loading.
         """
         data.pop("parent_child", None)
+        # Parent events are dumped without `parent_id`
+        data.setdefault("parent_id", None)
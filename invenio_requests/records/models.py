@@ -29,6 +29,21 @@ class RequestMetadata(db.Model, RecordMetadataBase):
 
     __tablename__ = "request_metadata"
 
+    __table_args__ = (
+        # Covers the sweeps of expired requests, only few requests expire
+        db.Index(
+            "ix_request_metadata_expires_at",
+            "expires_at",
+            postgresql_where=text("expires_at IS NOT NULL"),
+        ),
+        # Covers the lookups of the due expiry buckets
+        db.Index(
+            "ix_request_metadata_expiry_bucket",
+            "expiry_bucket",
+            postgresql_where=text("expiry_bucket IS NOT NULL"),
+        ),
+    )
+
     id = db.Column(UUIDType, primary_key=True, default=uuid.uuid4)
 
     number = db.Column(String(50), unique=True, index=True, nullable=True)
@@ -39,6 +54,9 @@ class RequestMetadata(db.Model, RecordMetadataBase):
         nullable=True,
     )
 
+    # Only set for open requests with an expiry date
+    expiry_bucket = db.Column(db.UTCDateTime(), nullable=True)
+
     # Files attachment support
     bucket_id = db.Column(
         UUIDType,
@@ -48,6 +66,10 @@ class RequestMetadata(db.Model, RecordMetadataBase):
     )
     bucket = db.relationship(Bucket)
 
+    # Denormalized from the request events, to avoid querying them on every dump
+    last_reply_id = db.Column(UUIDType, nullable=True)
+    last_activity_at = db.Column(db.UTCDateTime(), nullable=True)
+
 
 class RequestFileMetadata(db.Model, RecordMetadataBase, FileRecordModelMixin):
     """Files associated with a request."""
@@ -65,12 +87,70 @@ class RequestEventModel(db.Model, RecordMetadataBase):
 
     __tablename__ = "request_events"
 
+    __table_args__ = (
+        # Covers the lookups of the last events of a given type of a request
+        db.Index(
+            "ix_request_events_request_id_type_created",
+            "request_id",
+            "type",
+            "created",
+        ),
+    )
+
     type = db.Column(db.String(1), nullable=False)
     request_id = db.Column(
         UUIDType, db.ForeignKey(RequestMetadata.id, ondelete="CASCADE"), index=True
     )
     request = db.relationship(RequestMetadata)
 
+    # The parent event of a reply, deleting the parent deletes its replies
+    parent_id = db.Column(
+        UUIDType,
+        db.ForeignKey("request_events.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+
+
+class RequestParticipantModel(db.Model):
+    """Users who created events of a request.
+
+    Denormalized from the request events, so that the participants of a
+    request can be looked up without going through its whole timeline.
+    """
+
+    __tablename__ = "request_participants"
+
+    request_id = db.Column(
+        UUIDType,
+        db.ForeignKey(RequestMetadata.id, ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id = db.Column(db.String(255), primary_key=True)
+
+    @classmethod
+    def add(cls, request_id, user_ids):
+        """Add participants to a request, skipping the existing ones."""
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        existing = db.session.query(cls.user_id).filter(
+            cls.request_id == request_id, cls.user_id.in_(user_ids)
+        )
+        for user_id in user_ids - {user_id for (user_id,) in existing}:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(cls(request_id=request_id, user_id=user_id))
+            except IntegrityError:
+                # Added by a concurrent transaction in the meantime
+                pass
+
+    @classmethod
+    def get_user_ids(cls, request_id):
+        """Get the IDs of the users who participated in a request."""
+        query = db.session.query(cls.user_id).filter(cls.request_id == request_id)
+        return {user_id for (user_id,) in query}
+
 
 class SequenceMixin:
     """Integer sequence generator.
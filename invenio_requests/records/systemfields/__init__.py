@@ -11,6 +11,7 @@ from .computed import LastActivity, LastReply
 from .entity_reference import EntityReferenceField
 from .event_type import EventTypeField
 from .expired_state import ExpiredStateCalculatedField
+from .expiry_bucket import ExpiryBucketField
 from .identity import IdentityField
 from .request_state import RequestStateCalculatedField
 from .request_type import RequestTypeField
@@ -20,6 +21,7 @@ __all__ = (
     "EntityReferenceField",
     "EventTypeField",
     "ExpiredStateCalculatedField",
+    "ExpiryBucketField",
     "IdentityField",
     "LastReply",
     "LastActivity",
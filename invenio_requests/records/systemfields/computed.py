@@ -14,8 +14,6 @@ from invenio_records_resources.records.systemfields.calculated import (
     CalculatedField,
 )
 
-from ...customizations import CommentEventType
-
 
 class CachedCalculatedField(CalculatedField):
     """Cache-aware calculated field."""
@@ -51,19 +49,13 @@ class LastReply(CachedCalculatedField):
         if res is not self.CACHE_MISS:
             return res
 
-        RequestEvent = record.event_cls
-        RequestEventModel = RequestEvent.model_cls
-
-        last_comment = (
-            db.session.query(RequestEventModel)
-            .filter(
-                RequestEventModel.request_id == record.id,
-                RequestEventModel.type == CommentEventType.type_id,
-            )
-            .order_by(RequestEventModel.created.desc())
-            .first()
-        )
+        # The ID of the last reply is persisted in the request's model
+        last_reply_id = getattr(record.model, "last_reply_id", None)
+        if last_reply_id is None:
+            return None
 
+        RequestEvent = record.event_cls
+        last_comment = db.session.get(RequestEvent.model_cls, last_reply_id)
         if last_comment:
             return RequestEvent(data=last_comment.data, model=last_comment)
 
@@ -106,11 +98,11 @@ class LastActivity(CachedCalculatedField):
 
         activity_dates = [record.model.updated]
 
-        # Take into account the last comment if any
+        # Take into account the last comment if any, which is persisted in the
+        # request's model
         # TODO: Extend this to other event types
-        last_comment = record.last_reply
-        if last_comment:
-            activity_dates.append(last_comment.model.created)
+        if record.model.last_activity_at:
+            activity_dates.append(record.model.last_activity_at)
 
         return max(activity_dates)
 
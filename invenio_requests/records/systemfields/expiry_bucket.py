@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Systemfield for filing a request into the time bucket of its expiry."""
+
+from datetime import datetime, timezone
+
+import arrow
+from flask import current_app
+from invenio_records.systemfields import SystemField
+
+
+class ExpiryBucketField(SystemField):
+    """Systemfield for the time bucket in which the request expires.
+
+    The bucket is the start of the ``REQUESTS_EXPIRY_BUCKET_SIZE`` window that
+    contains the expiry date. It is stored in the model whenever the request is
+    created or committed, and only set for open requests with an expiry date,
+    so that the due requests can be looked up without scanning the others.
+    """
+
+    def __init__(self, key="expiry_bucket", expires_at_key="expires_at"):
+        """Constructor."""
+        super().__init__(key=key)
+        self._expires_at_key = expires_at_key
+
+    @staticmethod
+    def bucket_of(date):
+        """Get the start of the time bucket containing the given date."""
+        bucket_size = current_app.config["REQUESTS_EXPIRY_BUCKET_SIZE"]
+        timestamp = int(arrow.get(date, tzinfo=timezone.utc).timestamp())
+        return datetime.fromtimestamp(
+            timestamp - timestamp % bucket_size, tz=timezone.utc
+        )
+
+    def _bucket(self, record):
+        """Compute the expiry bucket of the request."""
+        expires_at = getattr(record, self._expires_at_key)
+        if expires_at is None or not record.is_open:
+            return None
+        return self.bucket_of(expires_at)
+
+    def _schedule(self, record):
+        """Store the expiry bucket of the request in its model."""
+        if record.model is not None:
+            record.model.expiry_bucket = self._bucket(record)
+
+    def pre_create(self, record, **kwargs):
+        """Called before a record is created."""
+        self._schedule(record)
+
+    def pre_commit(self, record, **kwargs):
+        """Called before a record is committed."""
+        self._schedule(record)
+
+    def __get__(self, record, owner=None):
+        """Get the expiry bucket of the request."""
+        if record is None:
+            # access by class
+            return self
+        if record.model is None:
+            return None
+        return record.model.expiry_bucket
@@ -10,12 +10,14 @@
 
 """RequestEvent Resource Configuration."""
 
+from flask import current_app
 from flask_resources import HTTPJSONException, create_error_handler
+from invenio_i18n import lazy_gettext as _
 from invenio_records_resources.resources import (
     RecordResourceConfig,
     SearchRequestArgsSchema,
 )
-from marshmallow import fields
+from marshmallow import INCLUDE, Schema, ValidationError, fields, validates_schema
 
 from ...errors import (
     ChildrenNotSupportedError,
@@ -29,6 +31,38 @@ class RequestCommentsSearchRequestArgsSchema(SearchRequestArgsSchema):
     """Add parameter to parse tags."""
 
     focus_event_id = fields.UUID()
+    cursor = fields.String()
+
+
+class RequestCommentsBulkItemSchema(Schema):
+    """Comment created in bulk.
+
+    The fields other than the request and the parent are the comment data.
+    """
+
+    class Meta:
+        """Schema meta."""
+
+        unknown = INCLUDE
+
+    request_id = fields.UUID(required=True)
+    parent_id = fields.UUID(load_default=None)
+
+    @validates_schema(pass_many=True, skip_on_field_errors=False)
+    def validate_size(self, data, many, **kwargs):
+        """Limit the number of comments created at once."""
+        if not many:
+            return
+        max_items = current_app.config["REQUESTS_BULK_COMMENTS_MAX_ITEMS"]
+        if not data:
+            raise ValidationError(_("At least one comment is required."))
+        if len(data) > max_items:
+            raise ValidationError(
+                _(
+                    "At most %(max)s comments can be created at once.",
+                    max=max_items,
+                )
+            )
 
 
 class RequestCommentsResourceConfig(RecordResourceConfig):
@@ -38,6 +72,7 @@ class RequestCommentsResourceConfig(RecordResourceConfig):
     url_prefix = "/requests"
     routes = {
         "list": "/<request_id>/comments",
+        "bulk": "/comments/bulk",
         "item": "/<request_id>/comments/<comment_id>",
         "reply": "/<request_id>/comments/<comment_id>/reply",
         "replies": "/<request_id>/comments/<comment_id>/replies",
@@ -60,6 +95,7 @@ class RequestCommentsResourceConfig(RecordResourceConfig):
     }
 
     request_search_args = RequestCommentsSearchRequestArgsSchema
+    request_bulk_item_schema = RequestCommentsBulkItemSchema
 
     response_handlers = {
         "application/vnd.inveniordm.v1+json": RecordResourceConfig.response_handlers[
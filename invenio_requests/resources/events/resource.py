@@ -57,6 +57,7 @@ class RequestCommentsResource(RecordResource):
         routes = self.config.routes
         return [
             route("POST", routes["list"], self.create),
+            route("POST", routes["bulk"], self.create_many),
             route("POST", routes["reply"], self.reply),
             route("GET", routes["item"], self.read),
             route("PUT", routes["item"], self.update),
@@ -83,6 +84,36 @@ class RequestCommentsResource(RecordResource):
         )
         return item.to_dict(), 201
 
+    @request_extra_args
+    @data_parser
+    @response_handler(many=True)
+    def create_many(self):
+        """Create comments (top-level or replies) on several requests at once.
+
+        The body is a list of comments, each with the ``request_id`` of its
+        request, an optional ``parent_id`` for replies, and the comment data.
+        """
+        comments = self.config.request_bulk_item_schema().load(
+            resource_requestctx.data or [], many=True
+        )
+        items = [
+            {
+                "request_id": comment.pop("request_id"),
+                "parent_id": comment.pop("parent_id"),
+                "data": comment,
+                "event_type": CommentEventType,
+            }
+            for comment in comments
+        ]
+
+        results = self.service.create_many(
+            identity=g.identity,
+            items=items,
+            expand=resource_requestctx.args.get("expand", False),
+        )
+        hits = [item.to_dict() for item in results]
+        return {"hits": {"hits": hits, "total": len(hits)}}, 201
+
     @item_view_args_parser
     @request_extra_args
     @data_parser
@@ -11,7 +11,9 @@
 """Requests resource config."""
 
 import marshmallow as ma
+from flask import current_app
 from flask_resources import HTTPJSONException, create_error_handler
+from invenio_i18n import lazy_gettext as _
 from invenio_records_resources.resources import (
     RecordResourceConfig,
     SearchRequestArgsSchema,
@@ -20,7 +22,7 @@ from invenio_records_resources.services.base.config import ConfiguratorMixin, Fr
 from marshmallow import fields
 
 from ...errors import CannotExecuteActionError, NoSuchActionError, RequestLockedError
-from .fields import ReferenceString
+from .fields import IndexRefresh, ReferenceString
 
 
 #
@@ -36,6 +38,42 @@ class RequestSearchRequestArgsSchema(SearchRequestArgsSchema):
     shared_with_me = fields.Boolean()
 
 
+class RequestBulkActionSchema(ma.Schema):
+    """Body of a bulk action.
+
+    The fields other than the ``ids`` are the data of the action, e.g. the
+    ``payload`` of a comment added to each request.
+    """
+
+    class Meta:
+        """Schema meta."""
+
+        unknown = ma.INCLUDE
+
+    ids = fields.List(
+        fields.UUID(error_messages={"invalid_uuid": _("The ID must be a valid UUID.")}),
+        required=True,
+        error_messages={
+            "required": _("The IDs of the requests are required."),
+            "invalid": _("The IDs of the requests must be a list."),
+        },
+    )
+
+    @ma.validates("ids")
+    def validate_ids(self, value, **kwargs):
+        """Limit the number of requests of a bulk action."""
+        max_requests = current_app.config["REQUESTS_BULK_ACTION_MAX_REQUESTS"]
+        if not value:
+            raise ma.ValidationError(_("At least one request ID is required."))
+        if len(value) > max_requests:
+            raise ma.ValidationError(
+                _(
+                    "At most %(max)s requests can be processed at once.",
+                    max=max_requests,
+                )
+            )
+
+
 request_error_handlers = {
     CannotExecuteActionError: create_error_handler(
         lambda e: HTTPJSONException(
@@ -71,6 +109,7 @@ class RequestsResourceConfig(RecordResourceConfig, ConfiguratorMixin):
         "user-prefix": "/user",
         "item": "/<uuid:id>",
         "action": "/<uuid:id>/actions/<action>",
+        "bulk_action": "/actions/<action>",
         "lock": "/<uuid:id>/lock",
         "unlock": "/<uuid:id>/unlock",
     }
@@ -81,6 +120,12 @@ class RequestsResourceConfig(RecordResourceConfig, ConfiguratorMixin):
     }
 
     request_search_args = RequestSearchRequestArgsSchema
+    request_bulk_action_schema = RequestBulkActionSchema
+
+    request_extra_args = {
+        **RecordResourceConfig.request_extra_args,
+        "refresh": IndexRefresh(),
+    }
 
     error_handlers = FromConfig(
         "REQUESTS_ERROR_HANDLERS", default=request_error_handlers
@@ -9,7 +9,7 @@
 """Marshmallow fields for search parameter deserialization."""
 
 from invenio_i18n import lazy_gettext as _
-from marshmallow import fields
+from marshmallow import ValidationError, fields
 
 
 class ReferenceString(fields.Field):
@@ -44,3 +44,25 @@ class ReferenceString(fields.Field):
 
         key, value = list(value.items())[0]
         return f"{key}:{value}"
+
+
+class IndexRefresh(fields.Field):
+    """Field for the ``refresh`` querystring parameter.
+
+    Accepts the values of the search engine's ``refresh`` parameter, i.e.
+    ``"true"``, ``"false"`` and ``"wait_for"``.
+    """
+
+    #: Default error messages.
+    default_error_messages = {
+        "invalid": _("Not a valid refresh value."),
+    }
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        """Deserialize the refresh value."""
+        if value == "wait_for":
+            return value
+        try:
+            return fields.Boolean()._deserialize(value, attr, data, **kwargs)
+        except ValidationError:
+            raise self.make_error("invalid")
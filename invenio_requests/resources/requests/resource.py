@@ -55,6 +55,7 @@ class RequestsResource(RecordResource):
             route("PUT", p(routes["item"]), self.update),
             route("DELETE", p(routes["item"]), self.delete),
             route("POST", p(routes["action"]), self.execute_action),
+            route("POST", p(routes["bulk_action"]), self.execute_action_bulk),
             route("GET", s(routes["user-prefix"]), self.search_user_requests),
             route("GET", p(routes["lock"]), self.lock_request),
             route("GET", p(routes["unlock"]), self.unlock_request),
@@ -142,9 +143,34 @@ class RequestsResource(RecordResource):
             action=resource_requestctx.view_args["action"],
             data=resource_requestctx.data,
             expand=resource_requestctx.args.get("expand", False),
+            refresh=resource_requestctx.args.get("refresh"),
         )
         return item.to_dict(), 200
 
+    @request_extra_args
+    @request_view_args
+    @request_data
+    @response_handler()
+    def execute_action_bulk(self):
+        """Execute an action on several requests.
+
+        The body holds the ``ids`` of the requests, and optionally the
+        ``payload`` of a comment added to each of them.
+        """
+        data = self.config.request_bulk_action_schema().load(
+            resource_requestctx.data or {}
+        )
+        ids = data.pop("ids")
+        result = self.service.execute_action_bulk(
+            identity=g.identity,
+            ids=ids,
+            action=resource_requestctx.view_args["action"],
+            data=data,
+            expand=resource_requestctx.args.get("expand", False),
+            refresh=resource_requestctx.args.get("refresh"),
+        )
+        return result.to_dict(), 200
+
     @request_view_args
     @request_headers
     def lock_request(self):
@@ -14,8 +14,7 @@ from uuid import UUID
 from invenio_indexer.api import RecordIndexer
 from invenio_records_resources.services import (
     RecordServiceConfig,
-    ServiceSchemaWrapper,
-    pagination_endpoint_links,
+    SearchOptions,
 )
 from invenio_records_resources.services.base.config import ConfiguratorMixin, FromConfig
 from invenio_records_resources.services.records.results import (
@@ -25,14 +24,22 @@ from invenio_records_resources.services.records.results import (
 
 from ...proxies import (
     current_request_files_service,
+    current_requests,
 )
 from ...records.api import Request, RequestEvent, RequestFile
 from ...services.links import (
     RequestSingleCommentEndpointLink,
     RequestTypeDependentEndpointLink,
+    cursor_pagination_endpoint_links,
+)
+from ..permissions import PermissionPolicy, RequestEventPermissionsEvaluator
+from ..results import (
+    CachedFieldsResolver,
+    RequestEventHitProjection,
+    wrap_type_schema,
 )
-from ..permissions import PermissionPolicy
 from ..schemas import RequestEventSchema
+from .params import CursorPagination, CursorParam, is_cursor_mode
 
 
 def _expand_files_for_projections(projections, request, identity):
@@ -120,6 +127,7 @@ class RequestEventItem(RecordItem):
         request = kwargs.pop("request", None)
         super().__init__(*args, **kwargs)
         self._request = request
+        self._fields_resolver = CachedFieldsResolver(kwargs.get("expandable_fields"))
 
     @property
     def id(self):
@@ -161,17 +169,34 @@ class RequestEventItem(RecordItem):
 class RequestEventList(RecordList):
     """RequestEvent result item."""
 
+    hit_projection_cls = RequestEventHitProjection
+    """Projection used instead of loading the record of each hit (if set)."""
+
     def __init__(self, *args, **kwargs):
         """Constructor."""
         request = kwargs.pop("request", None)
+        replies_previews = kwargs.pop("replies_previews", None)
         super().__init__(*args, **kwargs)
         self._request = request
+        self._replies_previews = replies_previews
+        self._fields_resolver = CachedFieldsResolver(kwargs.get("expandable_fields"))
+
+    @property
+    def pagination(self):
+        """Create a pagination object (page- or cursor-based)."""
+        if is_cursor_mode(self._params):
+            return CursorPagination(self._params["size"], self._results.hits)
+        return super().pagination
 
     def to_dict(self):
         """Return result as a dictionary with expanded fields for parents and children."""
         # Call parent to handle standard expansion
         res = super().to_dict()
 
+        # There are no page numbers when paginating with a cursor
+        if is_cursor_mode(self._params):
+            res.pop("page", None)
+
         # Additionally expand children fields if present
         if self._expand and self._fields_resolver:
             self._expand_children_fields(res["hits"]["hits"])
@@ -216,16 +241,45 @@ class RequestEventList(RecordList):
         # Use common expansion function
         _expand_files_for_projections(all_projections, self._request, self._identity)
 
+    def _replies_preview(self, hit):
+        """Get the total number of replies of a hit and the hits of their preview."""
+        if self._replies_previews is not None:
+            # Previews fetched in a batch for all the hits
+            return self._replies_previews.get(hit.meta.id)
+
+        if hasattr(hit.meta, "inner_hits") and "replies_preview" in hit.meta.inner_hits:
+            # Extract children from inner_hits
+            inner_hits_data = hit.meta.inner_hits.replies_preview.hits
+            return inner_hits_data.total.value, inner_hits_data.hits
+
+        return None
+
+    def _load_hit(self, source):
+        """Load the record (or its projection) of a hit."""
+        record_cls = self._service.record_cls
+        if self.hit_projection_cls is not None:
+            return self.hit_projection_cls(source, record_cls)
+        return record_cls.loads(source)
+
     @property
     def hits(self):
         """Iterator over the hits."""
+        # One evaluator for the whole page, parents and children alike.
+        permissions_evaluator = None
+        if self._request is not None:
+            permissions_evaluator = RequestEventPermissionsEvaluator(
+                self._service, self._identity, self._request
+            )
+
         for hit in self._results:
             # Load dump
-            record = self._service.record_cls.loads(hit.to_dict())
+            record = self._load_hit(hit.to_dict())
 
             # Project the record
-            schema = ServiceSchemaWrapper(
-                self._service, record.type.marshmallow_schema()
+            schema = wrap_type_schema(
+                self._service,
+                record.type,
+                current_requests._wrapped_events_schema_cache,
             )
             projection = schema.dump(
                 record,
@@ -233,35 +287,32 @@ class RequestEventList(RecordList):
                     identity=self._identity,
                     record=record,
                     request=self._request,  # Need to pass the request to the schema to get the permissions to check if locked
+                    permissions_evaluator=permissions_evaluator,
                     meta=hit.meta,
                 ),
             )
 
-            # Handle inner_hits from has_child queries (join relationship approach)
+            # Handle the replies preview, from has_child inner_hits (join relationship
+            # approach) or from the batched query.
             # Initialize defaults for parents without children
             projection["children"] = []
             projection["children_count"] = 0
 
-            if (
-                hasattr(hit.meta, "inner_hits")
-                and "replies_preview" in hit.meta.inner_hits
-            ):
-                # Extract children from inner_hits
-                inner_hits_data = hit.meta.inner_hits.replies_preview.hits
-                inner_children = inner_hits_data.hits
-                total_children = inner_hits_data.total.value
+            replies_preview = self._replies_preview(hit)
+            if replies_preview is not None:
+                total_children, inner_children = replies_preview
 
                 projection["children_count"] = total_children
 
                 for inner_hit in inner_children:
                     # Load child record
-                    child_record = self._service.record_cls.loads(
-                        inner_hit["_source"].to_dict()
-                    )
+                    child_record = self._load_hit(inner_hit["_source"].to_dict())
 
                     # Project child record
-                    child_schema = ServiceSchemaWrapper(
-                        self._service, child_record.type.marshmallow_schema()
+                    child_schema = wrap_type_schema(
+                        self._service,
+                        child_record.type,
+                        current_requests._wrapped_events_schema_cache,
                     )
                     child_projection = child_schema.dump(
                         child_record,
@@ -269,6 +320,7 @@ class RequestEventList(RecordList):
                             identity=self._identity,
                             record=child_record,
                             request=self._request,  # Need to pass the request to the schema to get the permissions to check if locked
+                            permissions_evaluator=permissions_evaluator,
                             meta=hit.meta,
                         ),
                     )
@@ -317,6 +369,13 @@ def request_event_anchor(_, vars):
         return f"commentevent-{request_event.id}"
 
 
+class RequestEventSearchOptions(SearchOptions):
+    """Search options for request events."""
+
+    # The cursor param must come after the sort param.
+    params_interpreters_cls = SearchOptions.params_interpreters_cls + [CursorParam]
+
+
 class RequestEventsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     """Config."""
 
@@ -332,6 +391,7 @@ class RequestEventsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     result_list_cls = RequestEventList
     indexer_queue_name = "events"
     indexer_cls = ParentChildRecordIndexer
+    search = RequestEventSearchOptions
 
     # ResultItem configurations
     links_item = {
@@ -369,12 +429,12 @@ class RequestEventsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
         ),
     }
 
-    links_search = pagination_endpoint_links(
+    links_search = cursor_pagination_endpoint_links(
         "request_events.search",
         params=["request_id"],
     )
 
-    links_replies = pagination_endpoint_links(
+    links_replies = cursor_pagination_endpoint_links(
         "request_events.get_replies",
         params=["request_id", "comment_id"],
     )
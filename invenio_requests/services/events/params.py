@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Search parameter interpreters for request events."""
+
+import base64
+import binascii
+import json
+from uuid import UUID
+
+from invenio_i18n import gettext as _
+from invenio_records_resources.services.errors import QuerystringValidationError
+from invenio_records_resources.services.records.params import ParamInterpreter
+
+
+def encode_cursor(sort_values):
+    """Encode the sort values of a hit into an opaque cursor."""
+    raw = json.dumps(list(sort_values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode an opaque cursor into the sort values to search after.
+
+    The sort values are the ``created`` date (in epoch milliseconds) and the
+    ``id`` of the last hit of the previous page.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise QuerystringValidationError(_("Invalid cursor."))
+
+    if not isinstance(sort_values, list) or len(sort_values) != 2:
+        raise QuerystringValidationError(_("Invalid cursor."))
+    created, id_ = sort_values
+    if isinstance(created, bool) or not isinstance(created, int):
+        raise QuerystringValidationError(_("Invalid cursor."))
+    try:
+        UUID(id_)
+    except (TypeError, AttributeError, ValueError):
+        raise QuerystringValidationError(_("Invalid cursor."))
+    return sort_values
+
+
+def is_cursor_mode(params):
+    """Check if the search parameters request cursor-based pagination."""
+    return params is not None and params.get("cursor") is not None
+
+
+class CursorParam(ParamInterpreter):
+    """Evaluates the 'cursor' parameter.
+
+    When the parameter is present, the search is paginated with ``search_after``
+    over (``created``, ``id``) instead of ``from``/``size``. An empty cursor
+    returns the first page. This way, every page costs the same as the first one
+    and pagination is not limited by the index' ``max_result_window``.
+
+    Must run after the ``SortParam`` so that the tie-breaker is appended to the
+    selected sort.
+    """
+
+    tiebreaker_field = "id"
+
+    sort_fields = ("created",)
+    """Fields the search can be sorted by, before the tie-breaker is appended.
+
+    Other sorts (e.g. by ``_score``) don't keep the order of the hits stable
+    from one page to the next.
+    """
+
+    @staticmethod
+    def _sort_field(sort_option):
+        """Get the field of a sort option (e.g. ``-created``)."""
+        if isinstance(sort_option, dict):
+            (field,) = sort_option
+            return field
+        return sort_option.lstrip("-")
+
+    def apply(self, identity, search, params):
+        """Evaluate the cursor parameter on the search."""
+        if not is_cursor_mode(params):
+            return search
+
+        sort = list(search.to_dict().get("sort", ["created"]))
+        if any(self._sort_field(s) not in self.sort_fields for s in sort):
+            raise QuerystringValidationError(
+                _("Cursor pagination is not supported for the selected sort.")
+            )
+
+        # The page number is meaningless when paginating with a cursor.
+        params.pop("page", None)
+        search = search.extra(from_=0, size=params["size"])
+
+        # Make the sort total with the (unique) event id.
+        order = "asc"
+        if isinstance(sort[0], dict):
+            (options,) = sort[0].values()
+            order = (
+                options.get("order", "asc") if isinstance(options, dict) else options
+            )
+        sort.append({self.tiebreaker_field: {"order": order}})
+        search = search.sort(*sort)
+
+        if params["cursor"]:
+            search = search.extra(search_after=decode_cursor(params["cursor"]))
+
+        return search
+
+
+class CursorPagination:
+    """Pagination state of a cursor-paginated list of results.
+
+    Interface-compatible with the attributes used by the pagination links.
+    """
+
+    def __init__(self, size, hits):
+        """Constructor.
+
+        :param size: requested page size.
+        :param hits: the hits of the current page.
+        """
+        self.size = size
+        self.page = None
+        self._last_sort = hits[-1].meta.sort if len(hits) else None
+        self._count = len(hits)
+
+    @property
+    def has_prev(self):
+        """Cursors are forward-only."""
+        return False
+
+    @property
+    def has_next(self):
+        """True if the page was full, so that more results might exist."""
+        return self._last_sort is not None and self._count >= self.size
+
+    @property
+    def next_cursor(self):
+        """Opaque cursor pointing after the last hit of this page."""
+        if not self.has_next:
+            return None
+        return encode_cursor(self._last_sort)
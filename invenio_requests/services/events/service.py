@@ -18,16 +18,13 @@ from invenio_notifications.services.uow import NotificationOp
 from invenio_records_resources.services import RecordService, ServiceSchemaWrapper
 from invenio_records_resources.services.base.links import LinksTemplate
 from invenio_records_resources.services.errors import PermissionDeniedError
-from invenio_records_resources.services.records.params import PaginationParam
-from invenio_records_resources.services.uow import (
-    RecordCommitOp,
-    RecordIndexOp,
-    unit_of_work,
-)
+from invenio_records_resources.services.uow import RecordCommitOp, RecordIndexOp
 from invenio_search.engine import dsl
+from marshmallow import ValidationError
 
 from invenio_requests.customizations import CommentEventType
 from invenio_requests.customizations.event_types import LogEventType
+from invenio_requests.proxies import current_event_type_registry
 from invenio_requests.proxies import current_requests_service as requests_service
 from invenio_requests.services.results import EntityResolverExpandableField
 
@@ -38,6 +35,7 @@ from ...errors import (
 )
 from ...records.api import RequestEventFormat
 from ...resolvers.registry import ResolverRegistry
+from ..uow import BulkIndexOp, RequestIndexOp, unit_of_work
 
 
 class RequestEventsService(RecordService):
@@ -87,32 +85,17 @@ class RequestEventsService(RecordService):
         :param parent_id: Optional parent event ID for replies.
         """
         request = self._get_request(request_id)
-        self.require_permission(identity, "read", request=request)
-        try:
-            # If the event is a log, we don't check for permissions to not block logs creation
-            if event_type.type_id != LogEventType.type_id:
-                # Check permission based on whether this is a reply or top-level comment
-                permission = "reply_comment" if parent_id else "create_comment"
-                self.require_permission(identity, permission, request=request)
-        except PermissionDeniedError:
-            if current_app.config.get(
-                "REQUESTS_LOCKING_ENABLED", False
-            ) and request.get("is_locked", False):
-                raise RequestLockedError(
-                    description=_("Commenting is now locked for this conversation.")
-                )
-            else:
-                raise RequestEventPermissionError(
-                    description=_(
-                        "You do not have permission to comment on this conversation."
-                    )
-                )
+        # If the event is a log, we don't check for permissions to not block logs creation
+        if event_type.type_id != LogEventType.type_id:
+            # Check permission based on whether this is a reply or top-level comment
+            permission = "reply_comment" if parent_id else "create_comment"
+        else:
+            permission = None
+        self._check_create_permission(identity, request, permission)
 
-        # Validate that nested children (reply to reply) are not allowed
         if parent_id is not None:
             parent_event = self._get_event(parent_id)
-            if parent_event.parent_id is not None:
-                raise NestedChildrenNotAllowedError()
+            self._check_parent_event(parent_event, request)
 
         # Validate data (if there are errors, .load() raises)
         schema = self._wrap_schema(event_type.marshmallow_schema())
@@ -134,6 +117,9 @@ class RequestEventsService(RecordService):
         # Set parent_id for replies
         if parent_id is not None:
             event.parent_id = parent_id
+        elif event_type.allow_children:
+            # Top-level events keep track of their replies
+            event.reply_count = 0
 
         # Run components
         self.run_components(
@@ -148,17 +134,18 @@ class RequestEventsService(RecordService):
         # Persist record (DB and index)
         uow.register(RecordCommitOp(event, indexer=self.indexer))
 
+        if parent_id is not None:
+            self._update_reply_stats(parent_event, uow)
+
+        if event.type == CommentEventType:
+            request.update_last_reply(event)
+
+        request.add_participants(self._get_participant_ids([event]))
+
         # Reindex the request to update events-related computed fields
-        # NOTE: We're not reindexing if the event is a deletion log event, since the
-        # associated request will anyways be deleted from the index. Ideally, instead of
-        # checking this here, the Unit of Work, should be able to optimize away the
-        # unecessary reindexing operations (i.e. if there's a RecordDeleteOp registered,
-        # all previous RecordIndexOps for the same record should be ignored).
-        is_delete_event = (
-            isinstance(event_type, LogEventType) or event_type is LogEventType
-        ) and (data.get("payload", {}).get("event") == "deleted")
-        if not is_delete_event:
-            uow.register(RecordIndexOp(request, indexer=requests_service.indexer))
+        # NOTE: The operation is skipped if the request is indexed or deleted by
+        # another operation of the unit of work (e.g. for the deletion log event).
+        uow.register(RequestIndexOp(request, indexer=requests_service.indexer))
 
         if notify and event_type is CommentEventType:
             # Use different notification builder for replies vs top-level comments
@@ -182,6 +169,147 @@ class RequestEventsService(RecordService):
             request=request,
         )
 
+    @unit_of_work()
+    def create_many(self, identity, items, uow=None, expand=False, notify=True):
+        """Create several request events (top-level or replies) at once.
+
+        Each item is a dict with the ``request_id``, the ``event_type`` and the
+        ``data`` of an event, and the ``parent_id`` in case of replies. All items
+        are checked before any event is created, and the validation errors of
+        all items are raised together, keyed by item index.
+
+        The events are inserted with a single flush and indexed with a single
+        bulk request, and each affected request is reindexed once.
+
+        :param identity: Identity of user creating the events.
+        :param list items: The events to create.
+        :returns: A list of result items, in the order of the given items.
+        """
+        requests = self._get_requests(item["request_id"] for item in items)
+        parents = self._get_events(
+            item["parent_id"] for item in items if item.get("parent_id")
+        )
+
+        checked = set()
+        for item in items:
+            request = requests[str(item["request_id"])]
+            if item["event_type"].type_id != LogEventType.type_id:
+                permission = (
+                    "reply_comment" if item.get("parent_id") else "create_comment"
+                )
+            else:
+                permission = None
+            if (request.id, permission) not in checked:
+                self._check_create_permission(identity, request, permission)
+                checked.add((request.id, permission))
+
+        for item in items:
+            if item.get("parent_id"):
+                self._check_parent_event(
+                    parents[str(item["parent_id"])],
+                    requests[str(item["request_id"])],
+                )
+
+        # Validate data of all items before creating anything
+        loaded, all_errors = [], {}
+        for index, item in enumerate(items):
+            schema = self._wrap_schema(item["event_type"].marshmallow_schema())
+            try:
+                data, errors = schema.load(
+                    item["data"],
+                    context={"identity": identity},
+                )
+            except ValidationError as e:
+                all_errors[index] = e.messages
+                continue
+            loaded.append((schema, data, errors))
+        if all_errors:
+            raise ValidationError(all_errors)
+
+        events = []
+        for item, (schema, data, errors) in zip(items, loaded):
+            request = requests[str(item["request_id"])]
+            event_type = item["event_type"]
+            parent_id = item.get("parent_id")
+
+            event = self.record_cls.build(
+                {},
+                request=request.model,
+                request_id=str(request.id),
+                type=event_type,
+            )
+            event.update(data)
+            event.created_by = self._get_creator(identity, request=request)
+
+            if parent_id:
+                event.parent_id = parent_id
+            elif event_type.allow_children:
+                event.reply_count = 0
+
+            self.run_components(
+                "create",
+                identity,
+                data=data,
+                event=event,
+                errors=errors,
+                uow=uow,
+            )
+            events.append(event)
+
+        # Persist the events (DB and index)
+        self.record_cls.create_many(events)
+        uow.register(BulkIndexOp(events, indexer=self.indexer))
+
+        for parent_event in parents.values():
+            self._update_reply_stats(parent_event, uow)
+
+        last_replies = {}
+        for event in events:
+            if event.type == CommentEventType:
+                last_replies[str(event.request_id)] = event
+        for request_id, event in last_replies.items():
+            requests[request_id].update_last_reply(event)
+
+        events_by_request = {}
+        for event in events:
+            events_by_request.setdefault(str(event.request_id), []).append(event)
+        for request_id, request_events in events_by_request.items():
+            requests[request_id].add_participants(
+                self._get_participant_ids(request_events)
+            )
+
+        # Reindex each affected request once
+        for request in requests.values():
+            uow.register(RequestIndexOp(request, indexer=requests_service.indexer))
+
+        results = []
+        for item, event, (schema, _data, _errors) in zip(items, events, loaded):
+            request = requests[str(item["request_id"])]
+            if notify and item["event_type"] is CommentEventType:
+                if item.get("parent_id"):
+                    builder = request.type.reply_notification_builder
+                else:
+                    builder = request.type.comment_notification_builder
+                uow.register(NotificationOp(builder.build(request, event)))
+
+            results.append(
+                self.result_item(
+                    self,
+                    identity,
+                    event,
+                    schema=schema,
+                    links_tpl=self.links_tpl_factory(
+                        self.config.links_item,
+                        request=request,
+                        request_type=request.type,
+                    ),
+                    expandable_fields=self.expandable_fields,
+                    expand=expand,
+                    request=request,
+                )
+            )
+        return results
+
     def read(self, identity, id_, expand=False):
         """Retrieve a record."""
         event = self._get_event(id_)
@@ -259,7 +387,7 @@ class RequestEventsService(RecordService):
         uow.register(RecordCommitOp(event, indexer=self.indexer))
 
         # Reindex the request to update events-related computed fields
-        uow.register(RecordIndexOp(request, indexer=requests_service.indexer))
+        uow.register(RequestIndexOp(request, indexer=requests_service.indexer))
 
         return self.result_item(
             self,
@@ -329,8 +457,14 @@ class RequestEventsService(RecordService):
         # Commit the updated comment
         uow.register(RecordCommitOp(event, indexer=self.indexer))
 
+        if event.parent_id is not None:
+            self._update_reply_stats(self._get_event(event.parent_id), uow)
+
+        if request.model.last_reply_id == event.id:
+            request.update_last_reply()
+
         # Reindex the request to update events-related computed fields
-        uow.register(RecordIndexOp(request, indexer=requests_service.indexer))
+        uow.register(RequestIndexOp(request, indexer=requests_service.indexer))
 
         return True
 
@@ -347,8 +481,11 @@ class RequestEventsService(RecordService):
 
         Returns all top-level events (parent comments without parent_id) for the request.
         For parents that have children, includes a preview via inner_hits using
-        OpenSearch join relationships.
+        OpenSearch join relationships, or via a single batched query for the
+        replies of the page, see ``REQUESTS_COMMENT_PREVIEW_STRATEGY``.
 
+        Passing a ``cursor`` parameter (empty for the first page) switches from
+        page-based to cursor-based pagination, see ``CursorParam``.
         """
         params = params or {}
         params.setdefault("sort", "oldest")
@@ -360,6 +497,7 @@ class RequestEventsService(RecordService):
 
         # Build query for top-level events (parents) with optional children preview
         # Uses join relationships to include children via inner_hits when they exist
+        # (unless the previews are batched)
         search = self._search(
             "search",
             identity,
@@ -369,21 +507,7 @@ class RequestEventsService(RecordService):
             **kwargs,
         )
 
-        # Query structure:
-        # - must: filter to this request
-        # - must_not: exclude children (events with parent_id)
-        # - should: optionally add children preview via has_child + inner_hits
-        search = search.query(
-            "bool",
-            must=[
-                dsl.Q("term", request_id=str(request.id)),
-            ],
-            must_not=[
-                dsl.Q("exists", field="parent_id"),  # Exclude replies
-            ],
-            should=[self._timeline_query_child_preview(preview_size)],
-            minimum_should_match=0,  # Make should clause optional to return parents without children
-        )
+        search = search.query(self._timeline_query(request, preview_size))
 
         # Execute search
         search_result = search.execute()
@@ -402,6 +526,9 @@ class RequestEventsService(RecordService):
             expandable_fields=self.expandable_fields,
             expand=expand,
             request=request,
+            replies_previews=self._timeline_replies_previews(
+                identity, request, search_result, preview_size, search_preference
+            ),
         )
 
     def focused_list(
@@ -424,7 +551,9 @@ class RequestEventsService(RecordService):
         self.require_permission(identity, "read", request=request)
 
         # If a specific event ID is requested, we need to work out the corresponding page number.
-        focus_event = None
+        # The position of the event is derived from the database, so that the page
+        # can be fetched with a single search round trip.
+        page = 1
         try:
             focus_event = self._get_event(focus_event_id)
             # Make sure the event belongs to the request, otherwise the `require_permission` call above
@@ -434,43 +563,27 @@ class RequestEventsService(RecordService):
 
             if focus_event.parent_id is not None:
                 focus_event = self._get_event(focus_event.parent_id)
+
+            num_older_than_event = self.record_cls.count_thread_events(
+                request.id, created_before=focus_event.model.created
+            )
+            page = num_older_than_event // page_size + 1
         except sqlalchemy.exc.NoResultFound:
             # Silently ignore
             pass
 
-        params = {"sort": "oldest", "size": page_size}
+        params = {"sort": "oldest", "size": page_size, "page": page}
 
         # Build filter to only include parent comments (exclude child comments)
-        parent_filter = dsl.Q(
-            "bool",
-            must=[dsl.Q("term", request_id=str(request.id))],
-            must_not=[dsl.Q("exists", field="parent_id")],  # Exclude replies
-            should=[self._timeline_query_child_preview(preview_size)],
-            minimum_should_match=0,
-        )
-        search = self._search(
+        search_result = self._search(
             "search",
             identity,
             params,
             search_preference,
             permission_action="unused",
-            extra_filter=parent_filter,
-            versioning=False,
-        )
-
-        page = 1
-        if focus_event is not None:
-            num_older_than_event = search.filter(
-                "range", created={"lt": focus_event.created}
-            ).count()
-            page = num_older_than_event // page_size + 1
-
-        # Re run the pagination param interpreter to update the search with the new page number
-        params.update(page=page)
-        search = PaginationParam(self.config.search).apply(identity, search, params)
+            extra_filter=self._timeline_query(request, preview_size),
+        ).execute()
 
-        # We deactivated versioning before (it doesn't apply for count queries) so we need to re-enable it.
-        search_result = search.params(version=True).execute()
         return self.result_list(
             self,
             identity,
@@ -485,6 +598,9 @@ class RequestEventsService(RecordService):
             expandable_fields=self.expandable_fields,
             expand=expand,
             request=request,
+            replies_previews=self._timeline_replies_previews(
+                identity, request, search_result, preview_size, search_preference
+            ),
         )
 
     def scan(
@@ -535,7 +651,7 @@ class RequestEventsService(RecordService):
 
         :param identity: Identity of user.
         :param parent_id: ID of the parent comment.
-        :param params: Query parameters (page, size, sort, etc.).
+        :param params: Query parameters (page or cursor, size, sort, etc.).
         :param search_preference: Search preference.
         :returns: Paginated list of reply events.
         """
@@ -609,8 +725,15 @@ class RequestEventsService(RecordService):
         # Permissions - guarded by the request's can_read.
         self.require_permission(identity, "read", request=request)
 
+        params = params or {}
+        params.setdefault("sort", "newest")
+        params.setdefault("size", page_size)
+        # The page is derived from the focused event
+        params.pop("cursor", None)
+
         # If a specific event ID is requested, we need to work out the corresponding page number.
-        focus_event = None
+        # The position of the event is derived from the database, so that the page
+        # can be fetched with a single search round trip.
         try:
             focus_event = self._get_event(focus_reply_event_id)
             # Make sure the event belongs to the request, otherwise the `require_permission` call above
@@ -623,13 +746,16 @@ class RequestEventsService(RecordService):
 
             if focus_event.parent_id is None:
                 raise Exception("Cannot focus on non-reply event.")
+
+            num_newer_than_event = self.record_cls.count_thread_events(
+                request.id,
+                parent_id=parent_id,
+                created_after=focus_event.model.created,
+            )
+            params["page"] = num_newer_than_event // page_size + 1
         except sqlalchemy.exc.NoResultFound:
             # Silently ignore
-            pass
-
-        params = params or {}
-        params.setdefault("sort", "newest")
-        params.setdefault("size", page_size)
+            params["page"] = 1
 
         replies_filter = dsl.Q(
             "bool",
@@ -638,29 +764,15 @@ class RequestEventsService(RecordService):
                 dsl.Q("term", parent_id=parent_id),
             ],
         )
-        search = self._search(
+        search_result = self._search(
             "search",
             identity,
             params,
             search_preference,
             permission_action="unused",
             extra_filter=replies_filter,
-            versioning=False,
-        )
+        ).execute()
 
-        page = 1
-        if focus_event is not None:
-            num_newer_than_event = search.filter(
-                "range", created={"gt": focus_event.created}
-            ).count()
-            page = num_newer_than_event // page_size + 1
-
-        # Re run the pagination param interpreter to update the search with the new page number
-        params.update(page=page)
-        search = PaginationParam(self.config.search).apply(identity, search, params)
-
-        # We deactivated versioning before (it doesn't apply for count queries) so we need to re-enable it.
-        search_result = search.params(version=True).execute()
         return self.result_list(
             self,
             identity,
@@ -697,6 +809,50 @@ class RequestEventsService(RecordService):
         """Get associated event_id."""
         return self.record_cls.get_record(event_id, with_deleted=with_deleted)
 
+    def _get_requests(self, request_ids):
+        """Get the given requests with a single query, keyed by string ID."""
+        ids = {str(request_id) for request_id in request_ids}
+        requests = {str(r.id): r for r in self.request_cls.get_records(ids)}
+        for request_id in ids - requests.keys():
+            # Raises the same error as for a single request
+            requests[request_id] = self._get_request(request_id)
+        return requests
+
+    def _get_events(self, event_ids, with_deleted=True):
+        """Get the given events with a single query, keyed by string ID."""
+        ids = {str(event_id) for event_id in event_ids}
+        events = {
+            str(e.id): e
+            for e in self.record_cls.get_records(ids, with_deleted=with_deleted)
+        }
+        for event_id in ids - events.keys():
+            events[event_id] = self._get_event(event_id, with_deleted=with_deleted)
+        return events
+
+    def _check_create_permission(self, identity, request, permission):
+        """Check that the identity can create events on the request.
+
+        :param permission: The comment permission to check on top of ``read``,
+            or ``None`` for events that are not comments (e.g. logs).
+        """
+        self.require_permission(identity, "read", request=request)
+        try:
+            if permission is not None:
+                self.require_permission(identity, permission, request=request)
+        except PermissionDeniedError:
+            if current_app.config.get(
+                "REQUESTS_LOCKING_ENABLED", False
+            ) and request.get("is_locked", False):
+                raise RequestLockedError(
+                    description=_("Commenting is now locked for this conversation.")
+                )
+            else:
+                raise RequestEventPermissionError(
+                    description=_(
+                        "You do not have permission to comment on this conversation."
+                    )
+                )
+
     def _get_creator(self, identity, request=None):
         """Get the creator dict from the identity."""
         creator = None
@@ -712,6 +868,49 @@ class RequestEventsService(RecordService):
         )
         return referenced_creator
 
+    def _get_participant_ids(self, events):
+        """Get the IDs of the users who created the given events."""
+        return {
+            event["created_by"]["user"]
+            for event in events
+            if event.get("created_by", {}).get("user")
+        }
+
+    def _check_parent_event(self, parent_event, request):
+        """Check that a reply to the parent event can be created on the request."""
+        # Make sure the parent belongs to the request, otherwise the permission
+        # checks done on the request might not be valid for this particular event.
+        if str(parent_event.request_id) != str(request.id):
+            raise PermissionDeniedError()
+
+        # Validate that nested children (reply to reply) are not allowed
+        if parent_event.parent_id is not None:
+            raise NestedChildrenNotAllowedError()
+
+    def _update_reply_stats(self, parent_event, uow):
+        """Update the denormalized reply counters of a parent event."""
+        parent_event = self.record_cls.update_reply_stats(parent_event.id)
+        # Only the index is updated, the counters are already persisted
+        uow.register(RecordIndexOp(parent_event, indexer=self.indexer))
+
+    def _preview_strategy(self):
+        """Get the strategy used to fetch the previews of the replies."""
+        return current_app.config["REQUESTS_COMMENT_PREVIEW_STRATEGY"]
+
+    def _timeline_query(self, request, preview_size):
+        """Return an OpenSearch query for the top-level events of a request."""
+        should = []
+        if self._preview_strategy() == "join":
+            should.append(self._timeline_query_child_preview(preview_size))
+
+        return dsl.Q(
+            "bool",
+            must=[dsl.Q("term", request_id=str(request.id))],
+            must_not=[dsl.Q("exists", field="parent_id")],  # Exclude replies
+            should=should,
+            minimum_should_match=0,  # Make should clause optional to return parents without children
+        )
+
     def _timeline_query_child_preview(self, preview_size):
         """Return an OpenSearch query to include a size-limited preview of replies to a parent comment."""
         if preview_size is None:
@@ -727,3 +926,90 @@ class RequestEventsService(RecordService):
                 "sort": [{"created": "desc"}],
             },
         )
+
+    def _timeline_replies_previews(
+        self, identity, request, search_result, preview_size, search_preference=None
+    ):
+        """Fetch the previews of the replies of a timeline page in one query.
+
+        Only the parents that (might) have replies are looked up. Returns a dict
+        of parent id to the total number of replies and their most recent hits,
+        or ``None`` if the previews come from the join inner hits.
+        """
+        strategy = self._preview_strategy()
+        if strategy == "join":
+            return None
+        if preview_size is None:
+            preview_size = current_app.config["REQUESTS_COMMENT_PREVIEW_LIMIT"]
+
+        parent_ids = []
+        for hit in search_result:
+            event_type = current_event_type_registry.lookup(hit.type, quiet=True)
+            # Parents indexed before the counters existed have no `reply_count`
+            has_replies = getattr(hit, "reply_count", None) != 0
+            if event_type is not None and event_type.allow_children and has_replies:
+                parent_ids.append(hit.meta.id)
+
+        if not parent_ids:
+            return {}
+
+        search = self.create_search(
+            identity,
+            self.record_cls,
+            self.config.search,
+            permission_action="unused",
+            preference=search_preference,
+        )
+        search = search.filter(
+            "bool",
+            must=[
+                dsl.Q("term", request_id=str(request.id)),
+                dsl.Q("terms", parent_id=parent_ids),
+            ],
+        )
+
+        if strategy == "collapse":
+            return self._replies_previews_by_collapse(search, parent_ids, preview_size)
+        return self._replies_previews_by_aggregation(search, parent_ids, preview_size)
+
+    def _replies_previews_by_aggregation(self, search, parent_ids, preview_size):
+        """Get the replies previews from a top hits aggregation per parent."""
+        search = search.extra(size=0)
+        search.aggs.bucket(
+            "parents", "terms", field="parent_id", size=len(parent_ids)
+        ).metric(
+            "replies_preview",
+            "top_hits",
+            size=preview_size,
+            sort=[{"created": "desc"}],
+        )
+        buckets = search.execute().aggregations.parents.buckets
+
+        return {
+            bucket.key: (bucket.doc_count, list(bucket.replies_preview.hits.hits))
+            for bucket in buckets
+        }
+
+    def _replies_previews_by_collapse(self, search, parent_ids, preview_size):
+        """Get the replies previews from the inner hits of the replies collapsed by parent."""
+        search = (
+            search.source(["parent_id"])
+            .extra(
+                size=len(parent_ids),
+                collapse={
+                    "field": "parent_id",
+                    "inner_hits": {
+                        "name": "replies_preview",
+                        "size": preview_size,
+                        "sort": [{"created": "desc"}],
+                    },
+                },
+            )
+            .sort("created")
+        )
+
+        previews = {}
+        for hit in search.execute():
+            inner_hits = hit.meta.inner_hits.replies_preview.hits
+            previews[hit.parent_id] = (inner_hits.total.value, list(inner_hits.hits))
+        return previews
@@ -31,10 +31,17 @@ class Status(Generator):
         self._statuses = statuses
         self._generators = generators or []
 
+    def generators_for(self, request):
+        """Get the generators that apply to the status of the request."""
+        if request.status in self._statuses:
+            return self._generators
+        return []
+
     def needs(self, request=None, **kwargs):
         """Needs if status is in one of the provided ones."""
-        if request.status in self._statuses:
-            needs = [g.needs(request=request, **kwargs) for g in self._generators]
+        generators = self.generators_for(request)
+        if generators:
+            needs = [g.needs(request=request, **kwargs) for g in generators]
             return set(chain.from_iterable(needs))
         return []
 
@@ -202,6 +209,11 @@ class Commenter(Generator):
 class IfLocked(ConditionalGenerator):
     """Disallows the action if the request is locked."""
 
+    @staticmethod
+    def is_locked(request):
+        """Check if the request is locked."""
+        return request is not None and request.get("is_locked", False)
+
     def _condition(self, request=None, **kwargs):
         """Condition to choose generators set."""
-        return request is not None and request.get("is_locked", False)
+        return self.is_locked(request)
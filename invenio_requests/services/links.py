@@ -9,12 +9,128 @@
 
 """Utility for rendering URI template links."""
 
-import copy
+import re
+from copy import copy
+from uuid import UUID, uuid4
 
-from invenio_records_resources.services import EndpointLink
+from flask import current_app
+from invenio_base import invenio_url_for
+from invenio_records_resources.services import EndpointLink, LinksTemplate
 
+from ..proxies import current_requests
 
-class RequestEndpointLink(EndpointLink):
+_SAFE_VALUE = re.compile(r"^[A-Za-z0-9_.-]+$")
+"""Values rendered the same in any part of a URL, i.e. without any quoting."""
+
+
+class URLTemplates:
+    """Cache of the URLs of endpoints, as templates for string formatting.
+
+    Building a URL goes through the URL map of the application (or of the
+    complementary one), which is a lot of work for links that only differ by
+    an ID. The URL of each endpoint is built once with placeholder values,
+    and then rendered for other values with plain string formatting.
+
+    Only values that don't need any quoting (e.g. IDs, numbers and action
+    names) are formatted this way, others are built as usual. Endpoints whose
+    template doesn't render the same URL as building it are always built.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._templates = {}
+        self._placeholders = []
+
+    def _placeholder(self, i):
+        """Get a placeholder value that can't occur anywhere else in a URL."""
+        while len(self._placeholders) <= i:
+            self._placeholders.append(uuid4().hex)
+        return self._placeholders[i]
+
+    def _compile(self, endpoint, values, anchor):
+        """Build the template of an endpoint, or ``None`` if it can't have one."""
+        placeholders = {k: self._placeholder(i) for i, k in enumerate(values)}
+        if anchor is not None:
+            anchor_placeholder = self._placeholder(len(values))
+        try:
+            url = invenio_url_for(
+                endpoint,
+                _anchor=anchor_placeholder if anchor is not None else None,
+                **placeholders,
+            )
+        except Exception:
+            return None
+
+        template = url.replace("{", "{{").replace("}", "}}")
+        for i, placeholder in enumerate(placeholders.values()):
+            template = template.replace(placeholder, f"{{{i}}}")
+        if anchor is not None:
+            template = template.replace(anchor_placeholder, f"{{{len(values)}}}")
+        return template
+
+    def build(self, endpoint, values, anchor=None):
+        """Build the URL of an endpoint, like ``invenio_url_for``."""
+        args = [str(v) if isinstance(v, UUID) else v for v in values.values()]
+        if anchor is not None:
+            args.append(anchor)
+        if not all(isinstance(v, str) and _SAFE_VALUE.match(v) for v in args):
+            return invenio_url_for(endpoint, _anchor=anchor, **values)
+
+        key = (
+            endpoint,
+            tuple(values),
+            anchor is not None,
+            current_app.config.get("SITE_UI_URL"),
+            current_app.config.get("SITE_API_URL"),
+        )
+        template = self._templates.get(key, False)
+        if template is False:
+            template = self._compile(endpoint, values, anchor)
+            url = invenio_url_for(endpoint, _anchor=anchor, **values)
+            if template is not None and template.format(*args) != url:
+                template = None
+            self._templates[key] = template
+            return url
+
+        if template is None:
+            return invenio_url_for(endpoint, _anchor=anchor, **values)
+        return template.format(*args)
+
+
+class RequestLinksTemplate(LinksTemplate):
+    """Links template of requests, which can be extended with more context."""
+
+    def with_context(self, **context):
+        """Get a copy of the template, with additional context."""
+        return type(self)(self._links, context={**self._context, **context})
+
+
+class TemplatedEndpointLink(EndpointLink):
+    """Endpoint link rendered from the precomputed URL of its endpoint.
+
+    Expands like ``EndpointLink``, but builds the URL with ``URLTemplates``.
+    """
+
+    def expand(self, obj, context):
+        """Expand the endpoint."""
+        # Same as ``EndpointLink.expand``
+        vars = context.copy()
+        if context.get("args"):
+            vars["args"] = context["args"].copy()
+
+        self.vars(obj, vars)
+        if self._vars_func:
+            self._vars_func(obj, vars)
+
+        values = {k: v for k, v in vars.items() if k in self._params}
+        values.update(vars.get("args", {}))
+        values = dict(sorted(values.items()))
+        return current_requests.url_templates.build(
+            self._endpoint, values, anchor=self._anchor_func(obj, vars)
+        )
+
+
+class RequestEndpointLink(TemplatedEndpointLink):
     """Shortcut for writing request links."""
 
     def __init__(self, *args, **kwargs):
@@ -30,6 +146,10 @@ class RequestEndpointLink(EndpointLink):
         vars.update({"id": record.id})
 
 
+_no_op_link = EndpointLink("", when=lambda obj, vars: False)
+"""Link of a request type that doesn't define it, never rendered."""
+
+
 class RequestTypeDependentEndpointLink(EndpointLink):
     """Class that dynamically delegates to EndpointLink on RequestType's.
 
@@ -60,6 +180,7 @@ class RequestTypeDependentEndpointLink(EndpointLink):
         self._request_type_retriever = request_type_retriever
         self._request_event_retriever = request_event_retriever
         self._anchor_func = anchor
+        self._anchored_links = {}
 
     def _get_uniform_context(self, obj, context):
         """Fill `context` with retrieved values.
@@ -70,7 +191,8 @@ class RequestTypeDependentEndpointLink(EndpointLink):
         "request_event" that an EndpointLink defined on a RequestType can
         and should rely on.
         """
-        ctx = copy.deepcopy(context)
+        # The context holds records, which must not be copied (see EndpointLink)
+        ctx = context.copy()
         ctx["request"] = self._request_retriever(obj, ctx)
         ctx["request_type"] = self._request_type_retriever(obj, ctx)
         ctx["request_event"] = self._request_event_retriever(obj, ctx)
@@ -82,16 +204,22 @@ class RequestTypeDependentEndpointLink(EndpointLink):
         Requires _get_uniform_context to have been called to generate
         context.
         """
-        # For when an EndpointLink can't be found
-        no_op_link = EndpointLink("", when=lambda obj, vars: False)
-
         # Retrieval
         request_type = context["request_type"]
         if not request_type:
-            return no_op_link
+            return _no_op_link
         links_item_of_type = getattr(request_type, "links_item", {})
-        endpoint_link = links_item_of_type.get(self._key, no_op_link)
-        return endpoint_link
+        endpoint_link = links_item_of_type.get(self._key, _no_op_link)
+        if not hasattr(endpoint_link, "set_anchor"):
+            return endpoint_link
+
+        # The links of request types are shared, so the anchor is set on a copy
+        anchored_link = self._anchored_links.get(endpoint_link)
+        if anchored_link is None:
+            anchored_link = copy(endpoint_link)
+            anchored_link.set_anchor(self._anchor_func)
+            self._anchored_links[endpoint_link] = anchored_link
+        return anchored_link
 
     def should_render(self, obj, context):
         """Determine if the link should be rendered."""
@@ -103,12 +231,10 @@ class RequestTypeDependentEndpointLink(EndpointLink):
         """Expand/render the endpoint defined on the RequestType."""
         ctx = self._get_uniform_context(obj, context)
         endpoint_link = self._retrieve_endpoint_link(obj, ctx)
-        if hasattr(endpoint_link, "set_anchor"):
-            endpoint_link.set_anchor(self._anchor_func)
         return endpoint_link.expand(obj, ctx)
 
 
-class RequestListOfCommentsEndpointLink(EndpointLink):
+class RequestListOfCommentsEndpointLink(TemplatedEndpointLink):
     """Render links for a Request's Comments (Events).
 
     Note that the RequestCommentsResource uses RequestEventsService.
@@ -126,7 +252,7 @@ class RequestListOfCommentsEndpointLink(EndpointLink):
         vars.update({"request_id": record.id})
 
 
-class RequestSingleCommentEndpointLink(EndpointLink):
+class RequestSingleCommentEndpointLink(TemplatedEndpointLink):
     """Render links for a Request's Comment (Event)."""
 
     def __init__(self, *args, **kwargs):
@@ -178,3 +304,37 @@ class ActionsEndpointLinks:
                 links[action] = self._endpoint_link.expand(request, ctx)
 
         return links
+
+
+def _set_next_page_or_cursor(pagination, vars):
+    """Point the "next" link to the next page, or after the current cursor."""
+    if getattr(pagination, "next_cursor", None) is not None:
+        vars["args"].update({"cursor": pagination.next_cursor})
+    else:
+        vars["args"].update({"page": pagination.next_page.page})
+
+
+def cursor_pagination_endpoint_links(endpoint, params=None):
+    """Create pagination links (prev/self/next) supporting cursor pagination.
+
+    Behaves like ``pagination_endpoint_links`` for page-based results. For
+    cursor-based results, the "next" link carries the cursor of the next page
+    and no "prev" link is rendered.
+    """
+    return {
+        "prev": EndpointLink(
+            endpoint,
+            when=lambda pagination, ctx: pagination.has_prev,
+            vars=lambda pagination, vars: vars["args"].update(
+                {"page": pagination.prev_page.page}
+            ),
+            params=params,
+        ),
+        "self": EndpointLink(endpoint, params=params),
+        "next": EndpointLink(
+            endpoint,
+            when=lambda pagination, ctx: pagination.has_next,
+            vars=_set_next_page_or_cursor,
+            params=params,
+        ),
+    }
@@ -10,6 +10,10 @@
 
 """Request permissions."""
 
+from itertools import chain
+
+from flask import current_app
+from invenio_access import Permission
 from invenio_administration.generators import Administration
 from invenio_records_permissions import RecordPermissionPolicy
 from invenio_records_permissions.generators import (
@@ -21,7 +25,15 @@ from invenio_records_permissions.generators import (
     SystemProcessWithoutSuperUser,
 )
 
-from .generators import Commenter, Creator, IfLocked, Receiver, Reviewers, Status, Topic
+from .generators import (
+    Commenter,
+    Creator,
+    IfLocked,
+    Receiver,
+    Reviewers,
+    Status,
+    Topic,
+)
 
 
 class PermissionPolicy(RecordPermissionPolicy):
@@ -136,3 +148,250 @@ class PermissionPolicy(RecordPermissionPolicy):
 
     # Read (View/Download) files: Same permission as viewing the request and its timeline.
     can_read_files = can_read
+
+
+class RequestEventPermissionsEvaluator:
+    """Evaluates event permissions for many events of the same request.
+
+    Dumping a list of events checks the same few actions for every event,
+    although most of the policy only depends on the request. The evaluator
+    splits the generators of each action into request-scoped and event-scoped
+    ones (see ``event_generators``). The needs of the request-scoped generators
+    are computed once per action, and the event-scoped ones are answered with a
+    set lookup against the identity. Actions using other generators than the
+    declared ones are checked with the policy. The results are identical to
+    calling ``check_permission(identity, action, event=event, request=request)``.
+    """
+
+    event_generators = (Commenter,)
+    """Generators that depend on the event (instead of only on the request)."""
+
+    request_generators = (
+        Administration,
+        AnyUser,
+        AuthenticatedUser,
+        Creator,
+        Disable,
+        Receiver,
+        Reviewers,
+        SystemProcess,
+        SystemProcessWithoutSuperUser,
+        Topic,
+    )
+    """Generators whose needs only depend on the request."""
+
+    request_conditions = {
+        IfConfig: lambda generator, request: (
+            current_app.config.get(generator.config_key) in generator.accept_values
+        ),
+        IfLocked: lambda generator, request: IfLocked.is_locked(request),
+    }
+    """Conditional generators whose condition only depends on the request."""
+
+    def __init__(self, service, identity, request):
+        """Constructor."""
+        self._service = service
+        self._identity = identity
+        self._request = request
+        self._actions = {}
+        self._results = {}
+
+    def _is_request_scoped(self, generator):
+        """Check if the needs of a generator only depend on the request."""
+        if type(generator) is Status:
+            return all(
+                self._is_request_scoped(g)
+                for g in generator.generators_for(self._request)
+            )
+        return type(generator) in self.request_generators
+
+    def _split_generators(self, generators):
+        """Split generators into request-scoped and event-scoped ones.
+
+        :returns: the request-scoped and the event-scoped generators, or
+            ``None`` if a generator is not one of the declared types.
+        """
+        request_generators, event_generators = [], []
+        for generator in generators:
+            condition = self.request_conditions.get(type(generator))
+            if condition is not None:
+                branch = (
+                    generator.then_
+                    if condition(generator, self._request)
+                    else generator.else_
+                )
+                split = self._split_generators(branch)
+                if split is None:
+                    return None
+                request_generators.extend(split[0])
+                event_generators.extend(split[1])
+            elif type(generator) in self.event_generators:
+                event_generators.append(generator)
+            elif self._is_request_scoped(generator):
+                request_generators.append(generator)
+            else:
+                return None
+        return request_generators, event_generators
+
+    def _load_action(self, action):
+        """Compute the request-scoped part of the permission for an action.
+
+        :returns: whether the request-scoped needs match the identity, whether
+            the excludes do, and the event-scoped generators, or ``None`` if
+            the action must be checked with the policy.
+        """
+        policy = self._service.permission_policy(action, request=self._request)
+        split = self._split_generators(policy.generators)
+        if split is None:
+            self._actions[action] = None
+            return None
+        request_generators, event_generators = split
+
+        # Expands action needs and adds the superuser need, as the policy would.
+        permission = Permission(
+            *chain.from_iterable(
+                g.needs(request=self._request) for g in request_generators
+            )
+        )
+        permission.explicit_excludes.update(
+            chain.from_iterable(
+                g.excludes(request=self._request) for g in request_generators
+            )
+        )
+        provides = self._identity.provides
+        self._actions[action] = (
+            bool(permission.needs & provides),
+            bool(permission.excludes & provides),
+            event_generators,
+        )
+        return self._actions[action]
+
+    def _event_needs(self, generators, event):
+        """Compute the needs and excludes of the event-scoped generators."""
+        needs, excludes = set(), set()
+        for generator in generators:
+            needs.update(generator.needs(event=event, request=self._request))
+            excludes.update(generator.excludes(event=event, request=self._request))
+        return frozenset(needs), frozenset(excludes)
+
+    def _event_allows(self, needs, excludes):
+        """Check the event-scoped needs against the identity."""
+        action_needs = [n for n in chain(needs, excludes) if n.method == "action"]
+        if action_needs:
+            # Action needs must be expanded, fall back to a full permission.
+            permission = Permission(*needs)
+            permission.explicit_excludes.update(excludes)
+            provides = self._identity.provides
+            return bool(permission.needs & provides), bool(
+                permission.excludes & provides
+            )
+        provides = self._identity.provides
+        return bool(needs & provides), bool(excludes & provides)
+
+    def allows(self, action, event):
+        """Check if the identity can perform the action on the event."""
+        if action in self._actions:
+            loaded = self._actions[action]
+        else:
+            loaded = self._load_action(action)
+        if loaded is None:
+            return self._service.check_permission(
+                self._identity, action, event=event, request=self._request
+            )
+
+        request_match, request_excluded, event_generators = loaded
+        if request_excluded:
+            return False
+        if not event_generators:
+            return request_match
+
+        needs, excludes = self._event_needs(event_generators, event)
+        key = (action, needs, excludes)
+        if key not in self._results:
+            event_match, event_excluded = self._event_allows(needs, excludes)
+            self._results[key] = (request_match or event_match) and not event_excluded
+        return self._results[key]
+
+
+class RequestPermissionsEvaluator:
+    """Evaluates request permissions for many requests, for the same identity.
+
+    Rendering a list of requests checks the same few actions (e.g. for the
+    "actions" links) for every request, each check running the generators of
+    the policy and expanding the needs of the permission again. The evaluator
+    resolves the needs of each entity of a request (creator, receiver, ...)
+    once per request type and entity, and checks each distinct combination of
+    needs against the identity once. Actions using other generators than the
+    declared ones are checked with the policy. The results are identical to
+    calling ``check_permission(identity, action, request=request)``.
+    """
+
+    entity_generators = (Creator, Receiver)
+    """Generators whose needs are the entity needs of a field of the request."""
+
+    request_generators = (
+        Administration,
+        AnyUser,
+        AuthenticatedUser,
+        Disable,
+        Reviewers,
+        SystemProcess,
+        SystemProcessWithoutSuperUser,
+        Topic,
+    )
+    """Generators whose needs only depend on the request."""
+
+    def __init__(self, permission_policy_cls, identity):
+        """Constructor."""
+        self._permission_policy_cls = permission_policy_cls
+        self._identity = identity
+        self._entity_needs = {}
+        self._results = {}
+
+    def _get_entity_needs(self, request, field):
+        """Get the needs of an entity of the request (cached)."""
+        entity = getattr(request, field)
+        if entity is None:
+            return []
+        key = (request.type.type_id, tuple(entity.reference_dict.items()))
+        if key not in self._entity_needs:
+            self._entity_needs[key] = request.type.entity_needs(entity)
+        return self._entity_needs[key]
+
+    def _needs(self, generators, request):
+        """Compute the needs and excludes of the generators, as the policy would.
+
+        :returns: the needs and excludes, or ``None`` if a generator is not
+            one of the declared types.
+        """
+        needs, excludes = set(), set()
+        for generator in generators:
+            if type(generator) is Status:
+                # Like the policy, only the needs of the nested generators count
+                result = self._needs(generator.generators_for(request), request)
+                if result is None:
+                    return None
+                needs.update(result[0])
+            elif type(generator) in self.entity_generators:
+                needs.update(self._get_entity_needs(request, generator.entity_field))
+            elif type(generator) in self.request_generators:
+                needs.update(generator.needs(request=request))
+            else:
+                return None
+            excludes.update(generator.excludes(request=request))
+        return needs, excludes
+
+    def allows(self, action, request):
+        """Check if the identity can perform the action on the request."""
+        policy = self._permission_policy_cls(action, request=request)
+        result = self._needs(policy.generators, request)
+        if result is None:
+            return policy.allows(self._identity)
+
+        key = (frozenset(result[0]), frozenset(result[1]))
+        if key not in self._results:
+            # Expands action needs and adds the superuser need, as the policy would.
+            permission = Permission(*key[0])
+            permission.explicit_excludes.update(key[1])
+            self._results[key] = permission.allows(self._identity)
+        return self._results[key]
@@ -12,10 +12,11 @@
 
 from .components import RequestNumberComponent
 from .config import RequestsServiceConfig
-from .results import RequestItem, RequestList
+from .results import RequestBulkActionResult, RequestItem, RequestList
 from .service import RequestsService
 
 __all__ = (
+    "RequestBulkActionResult",
     "RequestNumberComponent",
     "RequestItem",
     "RequestList",
@@ -10,6 +10,7 @@
 
 """Requests service configuration."""
 
+from invenio_indexer.api import RecordIndexer
 from invenio_records_resources.services import (
     RecordServiceConfig,
     SearchOptions,
@@ -42,16 +43,51 @@ from .components import (
     RequestReviewersComponent,
 )
 from .params import IsOpenParam, ReferenceFilterParam, SharedOrMyRequestsParam
-from .results import RequestItem, RequestList
+from .results import RequestBulkActionResult, RequestItem, RequestList
 
 
 def _is_action_available(request, context):
     """Check if the given action is available on the request."""
     action = context.get("action")
+    if not RequestActions.can_execute(request, action):
+        return False
+
+    # Lists evaluate the permissions of all their requests together
+    permissions_evaluator = context.get("permissions_evaluator")
+    if permissions_evaluator is not None:
+        return permissions_evaluator.allows(f"action_{action}", request)
+
     identity = context.get("identity")
     permission_policy_cls = context.get("permission_policy_cls")
     permission = permission_policy_cls(f"action_{action}", request=request)
-    return RequestActions.can_execute(request, action) and permission.allows(identity)
+    return permission.allows(identity)
+
+
+class RequestRecordIndexer(RecordIndexer):
+    """Request indexer that coalesces the bulk queue.
+
+    Events reindex their request a lot, so the bulk queue tends to contain the
+    same request many times. Since the index action loads the current state of
+    the request, repeated messages for the same request are acknowledged
+    without being indexed again.
+    """
+
+    def _actionsiter(self, message_iterator):
+        """Iterate bulk actions, skipping repeated messages."""
+        return super()._actionsiter(self._coalesce(message_iterator))
+
+    @staticmethod
+    def _coalesce(message_iterator):
+        """Skip messages with the same operation as the previous one per record."""
+        last_ops = {}
+        for message in message_iterator:
+            payload = message.decode()
+            record_id = payload.get("id")
+            if last_ops.get(record_id) == payload.get("op"):
+                message.ack()
+                continue
+            last_ops[record_id] = payload.get("op")
+            yield message
 
 
 class RequestSearchOptions(SearchOptions, SearchOptionsMixin):
@@ -89,6 +125,7 @@ class RequestsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     )
     result_item_cls = RequestItem
     result_list_cls = RequestList
+    result_bulk_action_cls = RequestBulkActionResult
     search = FromConfigSearchOptions(
         config_key="REQUESTS_SEARCH",
         sort_key="REQUESTS_SORT_OPTIONS",
@@ -108,6 +145,7 @@ class RequestsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     record_cls = Request  # needed for model queries
     schema = None  # stored in the API classes, for customization
     indexer_queue_name = "requests"
+    indexer_cls = RequestRecordIndexer
     index_dumper = None
 
     # links configuration
@@ -10,11 +10,12 @@
 
 """Results for the requests service."""
 
-from invenio_records_resources.services.records.results import (
-    MultiFieldsResolver,
-    RecordItem,
-    RecordList,
-)
+from invenio_records_resources.services.records.results import RecordItem, RecordList
+
+from ...proxies import current_requests
+from ..links import RequestLinksTemplate
+from ..permissions import RequestPermissionsEvaluator
+from ..results import CachedFieldsResolver, RequestHitProjection, wrap_type_schema
 
 
 class RequestItem(RecordItem):
@@ -40,7 +41,7 @@ class RequestItem(RecordItem):
         self._service = service
         self._links_tpl = links_tpl
         self._schema = schema or service._wrap_schema(request.type.marshmallow_schema())
-        self._fields_resolver = MultiFieldsResolver(expandable_fields)
+        self._fields_resolver = CachedFieldsResolver(expandable_fields)
         self._expand = expand
 
     @property
@@ -126,6 +127,9 @@ class RequestItem(RecordItem):
 class RequestList(RecordList):
     """List of request results."""
 
+    hit_projection_cls = RequestHitProjection
+    """Projection used instead of loading the record of each hit (if set)."""
+
     def __init__(
         self,
         service,
@@ -150,18 +154,35 @@ class RequestList(RecordList):
         self._params = params
         self._links_tpl = links_tpl
         self._links_item_tpl = links_item_tpl
-        self._fields_resolver = MultiFieldsResolver(expandable_fields)
+        self._fields_resolver = CachedFieldsResolver(expandable_fields)
         self._expand = expand
+        self._permissions_evaluator = RequestPermissionsEvaluator(
+            service.config.permission_policy_cls, identity
+        )
+
+    def _load_hit(self, source):
+        """Load the request (or its projection) of a hit."""
+        request_cls = self._service.record_cls
+        if self.hit_projection_cls is not None:
+            return self.hit_projection_cls(source, request_cls)
+        return request_cls.loads(source)
 
     @property
     def hits(self):
         """Iterator over the hits."""
-        request_cls = self._service.record_cls
+        links_item_tpl = self._links_item_tpl
+        if isinstance(links_item_tpl, RequestLinksTemplate):
+            # The permissions of the action links are evaluated for all hits
+            links_item_tpl = links_item_tpl.with_context(
+                permissions_evaluator=self._permissions_evaluator
+            )
 
         for hit in self._results:
             # load dump
-            request = request_cls.loads(hit.to_dict())
-            schema = self._service._wrap_schema(request.type.marshmallow_schema())
+            request = self._load_hit(hit.to_dict())
+            schema = wrap_type_schema(
+                self._service, request.type, current_requests._wrapped_schema_cache
+            )
 
             # project the request
             projection = schema.dump(
@@ -173,13 +194,29 @@ class RequestList(RecordList):
                 },
             )
 
-            if self._links_item_tpl:
-                projection["links"] = self._links_item_tpl.expand(
-                    self._identity, request
-                )
+            if links_item_tpl:
+                projection["links"] = links_item_tpl.expand(self._identity, request)
 
             yield projection
 
+    def has_permissions_to(self, actions):
+        """Returns a dict of request ID to its dict of "can_<action>": bool.
+
+        Same as ``RequestItem.has_permissions_to`` for each hit, but the
+        permissions of all the hits are evaluated together.
+
+        :params actions: list of action strings
+        :returns dict:
+        """
+        results = {}
+        for hit in self._results:
+            request = self._load_hit(hit.to_dict())
+            results[str(request.id)] = {
+                f"can_{action}": self._permissions_evaluator.allows(action, request)
+                for action in actions
+            }
+        return results
+
     def to_dict(self):
         """Return result as a dictionary."""
         # TODO: This part should imitate the result item above. I.e. add a
@@ -208,3 +245,46 @@ class RequestList(RecordList):
                 res["links"] = self._links_tpl.expand(self._identity, self.pagination)
 
         return res
+
+
+class RequestBulkActionResult:
+    """Result of an action executed on several requests.
+
+    Holds the items of the requests on which the action was executed, and the
+    errors of the requests on which it couldn't be executed.
+    """
+
+    def __init__(self, items, errors):
+        """Constructor.
+
+        :params items: list of ``RequestItem`` of the successful requests
+        :params errors: list of ``(request_id, exception)`` of the failed ones
+        """
+        self._items = items
+        self._errors = errors
+
+    @property
+    def items(self):
+        """The items of the requests on which the action was executed."""
+        return self._items
+
+    @property
+    def errors(self):
+        """The errors, as a list of ``(request_id, exception)``."""
+        return self._errors
+
+    def to_dict(self):
+        """Return result as a dictionary."""
+        return {
+            "hits": {
+                "hits": [item.to_dict() for item in self._items],
+                "total": len(self._items),
+            },
+            "errors": [
+                {
+                    "id": str(request_id),
+                    "message": str(getattr(e, "description", None) or e),
+                }
+                for request_id, e in self._errors
+            ],
+        }
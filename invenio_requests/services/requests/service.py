@@ -10,32 +10,48 @@
 
 """Requests service."""
 
+from flask import current_app
 from invenio_i18n import lazy_gettext as _
+from invenio_pidstore.errors import PIDDoesNotExistError
 from invenio_records_resources.services import RecordService, ServiceSchemaWrapper
 from invenio_records_resources.services.base import LinksTemplate
+from invenio_records_resources.services.errors import PermissionDeniedError
 from invenio_records_resources.services.uow import (
     IndexRefreshOp,
     RecordCommitOp,
     RecordDeleteOp,
-    unit_of_work,
 )
 from invenio_search.engine import dsl
+from marshmallow import ValidationError
+from sqlalchemy.orm.exc import NoResultFound
 
 from ...customizations import RequestActions
 from ...customizations.event_types import CommentEventType
-from ...errors import CannotExecuteActionError, RequestLockedError
+from ...errors import CannotExecuteActionError, NoSuchActionError, RequestLockedError
 from ...proxies import current_events_service, current_request_type_registry
 from ...resolvers.registry import ResolverRegistry
+from ..links import RequestLinksTemplate
 from ..results import EntityResolverExpandableField, MultiEntityResolverExpandableField
+from ..uow import BulkIndexOp, RequestCommitOp, unit_of_work
 
 
 class RequestsService(RecordService):
     """Requests service."""
 
+    #: Errors reported for a request by bulk actions, without failing the others.
+    bulk_action_errors = (
+        PermissionDeniedError,
+        CannotExecuteActionError,
+        NoSuchActionError,
+        PIDDoesNotExistError,
+        NoResultFound,
+        ValidationError,
+    )
+
     @property
     def links_item_tpl(self):
         """Item links template."""
-        return LinksTemplate(
+        return RequestLinksTemplate(
             self.config.links_item,
             context={
                 "permission_policy_cls": self.config.permission_policy_cls,
@@ -228,13 +244,28 @@ class RequestsService(RecordService):
 
     @unit_of_work()
     def execute_action(
-        self, identity, id_, action, data=None, uow=None, expand=False, **kwargs
+        self,
+        identity,
+        id_,
+        action,
+        data=None,
+        uow=None,
+        expand=False,
+        refresh=None,
+        **kwargs,
     ):
         """Execute the given action for the request, if possible.
 
         For instance, it would be not possible to execute the specified
         action on the request, if the latter has the wrong status.
+
+        :param uow: a ``RequestsUnitOfWork``, created if not given.
+        :param refresh: how the index is refreshed (``"wait_for"``, ``True`` or
+            ``False``). Defaults to ``REQUESTS_ACTION_INDEX_REFRESH``.
         """
+        if refresh is None:
+            refresh = current_app.config["REQUESTS_ACTION_INDEX_REFRESH"]
+
         # Retrieve request and action
         request = self.record_cls.get_record(id_)
         action_obj = RequestActions.get_action(request, action)
@@ -250,7 +281,13 @@ class RequestsService(RecordService):
 
         # Execute action and register request for persistence.
         action_obj.execute(identity, uow, **kwargs)
-        uow.register(RecordCommitOp(request, indexer=self.indexer))
+        uow.register(
+            RequestCommitOp(
+                request,
+                indexer=self.indexer,
+                index_refresh="wait_for" if refresh == "wait_for" else False,
+            )
+        )
 
         # Assuming that data is just for comment payload
         if data:
@@ -261,8 +298,9 @@ class RequestsService(RecordService):
                 identity, request.id, _data, CommentEventType, uow=uow
             )
 
-        # make events immediately available in search
-        uow.register(IndexRefreshOp(indexer=self.indexer))
+        # make the request immediately available in search
+        if refresh is True:
+            uow.register(IndexRefreshOp(indexer=self.indexer))
 
         return self.result_item(
             self,
@@ -274,6 +312,94 @@ class RequestsService(RecordService):
             expand=expand,
         )
 
+    @unit_of_work()
+    def execute_action_bulk(
+        self,
+        identity,
+        ids,
+        action,
+        data=None,
+        uow=None,
+        expand=False,
+        refresh=None,
+        **kwargs,
+    ):
+        """Execute the given action for several requests, where possible.
+
+        The requests are fetched with a single query, and the permissions and
+        the possibility to execute the action are checked for each of them.
+        Requests on which the action can't be executed are reported as errors
+        and left unchanged, without failing the others.
+
+        The executed requests are indexed with a single bulk request, and the
+        index is refreshed at most once.
+
+        :param refresh: how the index is refreshed (``"wait_for"``, ``True`` or
+            ``False``). Defaults to ``REQUESTS_ACTION_INDEX_REFRESH``.
+        :returns: a ``RequestBulkActionResult`` with the executed requests and
+            the errors of the others.
+        """
+        if refresh is None:
+            refresh = current_app.config["REQUESTS_ACTION_INDEX_REFRESH"]
+
+        ids = list(dict.fromkeys(str(id_) for id_ in ids))
+        requests = {str(r.id): r for r in self.record_cls.get_records(ids)}
+        permission_name = f"action_{action}"
+
+        executed, errors = [], []
+        for id_ in ids:
+            request = requests.get(id_)
+            try:
+                if request is None:
+                    raise NoResultFound(_("Request not found."))
+                action_obj = RequestActions.get_action(request, action)
+                self.require_permission(identity, permission_name, request=request)
+                if not action_obj.can_execute():
+                    raise CannotExecuteActionError(action)
+
+                # Undo the changes of the request if its action fails
+                with uow.savepoint():
+                    action_obj.execute(identity, uow, **kwargs)
+                    uow.register(RequestCommitOp(request, indexer=None))
+                    # Assuming that data is just for comment payload
+                    if data:
+                        current_events_service.create(
+                            identity,
+                            request.id,
+                            dict(payload=data.get("payload", {})),
+                            CommentEventType,
+                            uow=uow,
+                        )
+            except self.bulk_action_errors as e:
+                errors.append((id_, e))
+                continue
+            executed.append(request)
+
+        # Persist the requests in the index
+        uow.register(
+            BulkIndexOp(
+                executed,
+                indexer=self.indexer,
+                index_refresh="wait_for" if refresh == "wait_for" else False,
+            )
+        )
+        if refresh is True and executed:
+            uow.register(IndexRefreshOp(indexer=self.indexer))
+
+        items = [
+            self.result_item(
+                self,
+                identity,
+                request,
+                schema=self._wrap_schema(request.type.marshmallow_schema()),
+                links_tpl=self.links_item_tpl,
+                expandable_fields=self.expandable_fields,
+                expand=expand,
+            )
+            for request in executed
+        ]
+        return self.config.result_bulk_action_cls(items, errors)
+
     def search_user_requests(
         self, identity, params=None, search_preference=None, expand=False, **kwargs
     ):
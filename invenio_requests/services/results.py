@@ -7,12 +7,434 @@
 
 """Request service results."""
 
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import cached_property
+from types import SimpleNamespace
+from uuid import UUID
+
+import arrow
+from flask import current_app, g, has_request_context
 from invenio_access.permissions import system_user_id
-from invenio_records_resources.services.records.results import ExpandableField
+from invenio_records_resources.services import ServiceSchemaWrapper
+from invenio_records_resources.services.records.results import (
+    ExpandableField,
+    MultiFieldsResolver,
+)
+from marshmallow_utils.context import context_schema
 
+from ..customizations import RequestState
+from ..proxies import (
+    current_event_type_registry,
+    current_request_type_registry,
+    current_requests,
+)
 from ..resolvers.registry import ResolverRegistry
 
 
+class ReusableSchemaWrapper(ServiceSchemaWrapper):
+    """Service schema wrapper that dumps with a reused schema instance.
+
+    Instantiating a marshmallow schema copies all its declared fields, which is
+    the main cost of dumping a small object like a request or an event. Each
+    thread gets its own instance, and the dump context is passed through the
+    context variable of ``marshmallow_utils`` rather than set on the instance.
+    """
+
+    def __init__(self, service, schema):
+        """Constructor."""
+        super().__init__(service, schema)
+        self._local = threading.local()
+
+    @property
+    def schema_instance(self):
+        """The schema instance of the current thread."""
+        instance = getattr(self._local, "instance", None)
+        if instance is None:
+            instance = self._local.instance = self.schema()
+        return instance
+
+    def dump(self, data, schema_args=None, context=None):
+        """Dump data using the schema instance of the current thread."""
+        if schema_args:
+            return super().dump(data, schema_args=schema_args, context=context)
+
+        token = context_schema.set(self._build_context(context or {}))
+        try:
+            return self.schema_instance.dump(data)
+        finally:
+            context_schema.reset(token)
+
+
+def parse_datetime(value):
+    """Parse a datetime dumped into the search index."""
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def parse_uuid(value):
+    """Parse a UUID dumped into the search index."""
+    return UUID(value) if value is not None else None
+
+
+def resolve_reference(projection, key):
+    """Resolve an entity reference of the projection to an entity proxy."""
+    reference = projection.get(key)
+    if reference is None:
+        return None
+    return ResolverRegistry.resolve_entity_proxy(reference)
+
+
+def resolve_references(projection, key):
+    """Resolve a list of entity references of the projection to entity proxies."""
+    return [
+        ResolverRegistry.resolve_entity_proxy(reference)
+        for reference in projection.get(key) or []
+    ]
+
+
+def is_in_state(projection, state):
+    """Check if the request's status is mapped to the given state."""
+    return projection.type.available_statuses.get(projection.status) == state
+
+
+def is_expired(projection):
+    """Check if the request's expiration date is in the past."""
+    expires_at = projection.expires_at
+    if expires_at is None:
+        return False
+    expires_at = arrow.get(expires_at, tzinfo=timezone.utc).datetime
+    return expires_at < datetime.now(timezone.utc)
+
+
+class HitProjection(dict):
+    """Read-only stand-in for a record, built straight from its indexed source.
+
+    ``Record.loads()`` runs all the dumper extensions and system field hooks,
+    even though a search result only needs a handful of attributes to be
+    dumped and linked. A projection is declared per record type:
+
+    - ``index_keys``: keys that only exist in the index and are dropped.
+    - ``model_fields``: dump keys holding model columns, with their parsers.
+    - ``fields``: attributes computed from the projection, mirroring the
+      record class' system fields and properties of the same name.
+
+    Any other attribute falls back to the fully loaded record.
+    """
+
+    index_keys = ()
+    """Keys of the indexed source that are not part of the record data."""
+
+    model_fields = {
+        "uuid": ("id", parse_uuid),
+        "version_id": ("version_id", int),
+        "created": ("created", parse_datetime),
+        "updated": ("updated", parse_datetime),
+    }
+    """Map of dump keys to the model attribute and the parser of its value."""
+
+    fields = {
+        "id": lambda p: p.model.id,
+        "revision_id": lambda p: (
+            p.model.version_id - 1 if p.model.version_id is not None else None
+        ),
+        "created": lambda p: p.model.created,
+        "updated": lambda p: p.model.updated,
+    }
+    """Map of record attributes to the function computing them from a projection."""
+
+    def __init__(self, source, record_cls):
+        """Constructor.
+
+        :param source: The indexed document (``_source`` of the hit).
+        :param record_cls: The record class the projection stands in for.
+        """
+        self._source = source
+        self.record_cls = record_cls
+        self._record = None
+        self.model = SimpleNamespace(
+            **{
+                attr: parse(source[key]) if source.get(key) is not None else None
+                for key, (attr, parse) in self.model_fields.items()
+            }
+        )
+        excluded = set(self.index_keys) | set(self.model_fields)
+        super().__init__({k: v for k, v in source.items() if k not in excluded})
+
+    @property
+    def record(self):
+        """The fully loaded record."""
+        if self._record is None:
+            self._record = self.record_cls.loads(self._source)
+        return self._record
+
+    def __getattr__(self, name):
+        """Compute a declared attribute, or fall back to the loaded record."""
+        if name.startswith("_") or not hasattr(self.record_cls, name):
+            # Neither would the record have it (e.g. a missing data key).
+            raise AttributeError(name)
+        if name in self.fields:
+            value = self.fields[name](self)
+            # The projection is read-only, so the value can be kept.
+            self.__dict__[name] = value
+            return value
+        return getattr(self.record, name)
+
+
+class RequestEventHitProjection(HitProjection):
+    """Projection of an indexed request event."""
+
+    index_keys = ("parent_child",)
+
+    model_fields = {
+        **HitProjection.model_fields,
+        "id": ("id", parse_uuid),
+        "type": ("type", str),
+        "parent_id": ("parent_id", parse_uuid),
+    }
+
+    fields = {
+        **HitProjection.fields,
+        "type": lambda p: current_event_type_registry.lookup(p.model.type),
+        "request_id": lambda p: p.get("request_id"),
+        "parent_id": lambda p: p.model.parent_id,
+        "created_by": lambda p: resolve_reference(p, "created_by"),
+        "reply_count": lambda p: p.get("reply_count"),
+        "last_reply_at": lambda p: p.get("last_reply_at"),
+    }
+
+
+class RequestHitProjection(HitProjection):
+    """Projection of an indexed request."""
+
+    index_keys = (
+        "grants",
+        "is_closed",
+        "is_open",
+        "last_reply",
+        "last_activity_at",
+    )
+
+    model_fields = {
+        **HitProjection.model_fields,
+        "number": ("number", str),
+        "expires_at": ("expires_at", parse_datetime),
+    }
+
+    fields = {
+        **HitProjection.fields,
+        "type": lambda p: current_request_type_registry.lookup(p.get("type")),
+        "number": lambda p: p.model.number,
+        "status": lambda p: p.get("status"),
+        "is_closed": lambda p: is_in_state(p, RequestState.CLOSED),
+        "is_open": lambda p: is_in_state(p, RequestState.OPEN),
+        "expires_at": lambda p: p.model.expires_at,
+        "is_expired": is_expired,
+        "is_locked": lambda p: p.get("is_locked"),
+        "created_by": lambda p: resolve_reference(p, "created_by"),
+        "receiver": lambda p: resolve_reference(p, "receiver"),
+        "topic": lambda p: resolve_reference(p, "topic"),
+        "reviewers": lambda p: resolve_references(p, "reviewers"),
+    }
+
+    @cached_property
+    def last_reply(self):
+        """The last reply, projected from its embedded dump."""
+        last_reply = self._source.get("last_reply")
+        if not last_reply:
+            return None
+        return RequestEventHitProjection(last_reply, self.record_cls.event_cls)
+
+    @cached_property
+    def last_activity_at(self):
+        """The last activity, parsed from its dump."""
+        return parse_datetime(self._source.get("last_activity_at"))
+
+
+def wrap_type_schema(service, type_, cache):
+    """Get the cached, ready-to-dump schema wrapper of a request/event type.
+
+    The entries are keyed by ``type_id`` and are rebuilt whenever the type's
+    marshmallow schema changes, i.e. when the extension's schema cache is
+    cleared.
+    """
+    schema = type_.marshmallow_schema()
+    wrapper = cache.get(type_.type_id)
+    if (
+        wrapper is None
+        or wrapper.schema is not schema
+        or wrapper._permission_policy_cls is not service.config.permission_policy_cls
+    ):
+        wrapper = cache[type_.type_id] = ReusableSchemaWrapper(service, schema)
+    return wrapper
+
+
+class ResolvedEntitiesCache:
+    """Process-level LRU cache of resolved entities, with a time to live.
+
+    Users and groups rarely change, but are read again by every expanded
+    response. The entity types to cache and for how long are configured in
+    ``REQUESTS_ENTITY_CACHE_TTL``. Entries are keyed by the entity type, its
+    ID and what the identity can see.
+    """
+
+    def __init__(self, maxsize=1000):
+        """Constructor."""
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get a cached entity, or ``None`` if it is not cached (anymore)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        """Cache an entity for ``ttl`` seconds, evicting the least recent ones."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, type_id, value):
+        """Remove an entity from the cache, for all the identities."""
+        with self._lock:
+            for key in [k for k in self._entries if k[:2] == (type_id, value)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Remove all the entities from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+class EntityCache:
+    """Cache of the entities resolved while handling an HTTP request.
+
+    The same few users (creators, receivers, reviewers, ...) are expanded in
+    several places of a single response, e.g. the request, the timeline hits
+    and their replies. The entities are resolved once per identity and kept
+    for the rest of the request.
+
+    Resolved entities are keyed by the service that resolves them, their ID
+    and what the identity can see (its provided needs). Entities that could
+    not be resolved are kept as ``None``. Entity types configured in
+    ``REQUESTS_ENTITY_CACHE_TTL`` are looked up in the process-level
+    :class:`ResolvedEntitiesCache` before being read.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def current(cls):
+        """Get the cache of the current HTTP request, or ``None`` outside of one."""
+        if not has_request_context():
+            return None
+        if "requests_entity_cache" not in g:
+            g.requests_entity_cache = cls()
+        return g.requests_entity_cache
+
+    @staticmethod
+    def _visibility(identity):
+        """Get the part of the identity that determines what it can see."""
+        return frozenset(identity.provides)
+
+    @staticmethod
+    def _get_type_id(service):
+        """Get the type of the entities resolved by a service."""
+        for resolver in ResolverRegistry.get_registered_resolvers():
+            if getattr(resolver, "_service_id", None) == service.id:
+                return resolver.type_id
+        return None
+
+    def fetch(self, identity, grouped_values):
+        """Resolve the values not cached yet, with one read per service.
+
+        :param grouped_values: dict of service to the set of values (IDs) it
+            resolves, as collected by the fields resolver.
+        """
+        visibility = self._visibility(identity)
+        resolved_entities = current_requests.resolved_entities_cache
+        ttls = current_app.config["REQUESTS_ENTITY_CACHE_TTL"]
+
+        for service, values in grouped_values.items():
+            type_id = self._get_type_id(service)
+            ttl = ttls.get(type_id)
+            missing = []
+            for value in values:
+                key = (service.id, value, visibility)
+                if key in self._entries:
+                    self.hits += 1
+                    continue
+                if ttl:
+                    cached = resolved_entities.get((type_id, value, visibility))
+                    if cached is not None:
+                        self._entries[key] = cached
+                        self.hits += 1
+                        continue
+                self.misses += 1
+                missing.append(value)
+            if not missing:
+                continue
+
+            results = service.read_many(identity, missing)
+            found = {hit.get("id", None): hit for hit in results.hits}
+            for value in missing:
+                self._entries[(service.id, value, visibility)] = found.get(value)
+                # Entities that are not found are not cached across requests
+                if ttl and value in found:
+                    resolved_entities.set(
+                        (type_id, value, visibility), found[value], ttl
+                    )
+
+    def prefetch(self, identity, references):
+        """Resolve a batch of entity references (e.g. ``{"user": "1"}``)."""
+        grouped_values = {}
+        for reference in references:
+            proxy = ResolverRegistry.resolve_entity_proxy(reference)
+            if proxy is None:
+                continue
+            service = proxy.get_resolver().get_service()
+            grouped_values.setdefault(service, set()).add(proxy._parse_ref_dict_id())
+        self.fetch(identity, grouped_values)
+
+    def get(self, identity, service, value):
+        """Get a resolved entity (``None`` if it could not be resolved)."""
+        return self._entries[(service.id, value, self._visibility(identity))]
+
+
+class CachedFieldsResolver(MultiFieldsResolver):
+    """Fields resolver looking up the referenced entities in the entity caches.
+
+    Outside of an HTTP request, the entities are only cached for the
+    resolution itself (and across requests, if configured).
+    """
+
+    def _fetch_referenced(self, grouped_values, identity):
+        """Fetch the referenced entities that are not cached yet."""
+        cache = EntityCache.current() or EntityCache()
+        cache.fetch(identity, grouped_values)
+        for service, values in grouped_values.items():
+            for value in values:
+                resolved_rec = cache.get(identity, service, value)
+                for field in self._find_fields(service, value):
+                    field.add_dereferenced_record(service, value, resolved_rec)
+
+
 class EntityResolverExpandableField(ExpandableField):
     """Expandable entity resolver field.
 
@@ -50,58 +472,65 @@ class MultiEntityResolverExpandableField(ExpandableField):
     It uses the Entity resolver registry to retrieve the service to
     use to fetch records and the fields to return when serializing
     the referenced records.
+
+    The entity proxies are built once per referenced entity and indexed by
+    the type and ID of their reference, so that picking the fields of a
+    resolved (or ghost) record doesn't depend on the number of references.
     """
 
     def __init__(self, key):
         """Initialize the field."""
         super().__init__(key)
-        self.entity_proxies = []
+        self._proxies = {}
+        self._service_types = {}
+        self._current_key = None
+
+    def _get_proxy(self, reference):
+        """Get the (cached) entity proxy and service of a reference dict."""
+        key = next(iter(reference.items()))
+        entry = self._proxies.get(key)
+        if entry is None:
+            proxy = ResolverRegistry.resolve_entity_proxy(reference)
+            service = proxy.get_resolver().get_service()
+            entry = self._proxies[key] = (proxy, service)
+            self._service_types[service.id] = key[0]
+        return entry
 
     def ghost_record(self, value):
         """Return ghost representation for unresolved values."""
-        proxy = ResolverRegistry.resolve_entity_proxy(value)
+        proxy, _ = self._get_proxy(value)
         return proxy.ghost_record({"id": proxy._parse_ref_dict_id()})
 
     def system_record(self):
         """Return the representation of a system user."""
-        return [
-            ResolverRegistry.resolve_entity_proxy(value).system_record()
-            for value in self.get_cached_value()
-        ]
+        proxy, _ = self._get_proxy({"user": system_user_id})
+        return proxy.system_record()
 
     def get_value_service(self, values):
         """Return a list of (value, service) tuples for multiple references."""
-        self.entity_proxies = [
-            ResolverRegistry.resolve_entity_proxy(value) for value in values
-        ]
-
         results = []
-        for proxy in self.entity_proxies:
-            ref_id = proxy._parse_ref_dict_id()
-            resolver = proxy.get_resolver()
-            service = resolver.get_service()
-            results.append((ref_id, service))
+        for value in values:
+            proxy, service = self._get_proxy(value)
+            results.append((proxy._parse_ref_dict_id(), service))
         return results
 
+    def get_dereferenced_record(self, service, value):
+        """Return the dereferenced record, and keep track of its reference."""
+        self._current_key = (self._service_types[service.id], value)
+        return super().get_dereferenced_record(service, value)
+
     def pick(self, identity, resolved_record):
         """Pick fields from resolved records based on the entity resolver."""
-        for proxy in self.entity_proxies:
-            if proxy._parse_ref_dict_id() == resolved_record["id"]:
-                return proxy.pick_resolved_fields(identity, resolved_record)
+        proxy, _ = self._proxies[self._current_key]
+        return proxy.pick_resolved_fields(identity, resolved_record)
 
     def add_dereferenced_record(self, service, value, resolved_rec):
         """Save the dereferenced record."""
         # mark the record as a "ghost" or "system" record i.e not resolvable
         if resolved_rec is None:
+            proxy, _ = self._proxies[(self._service_types[service.id], value)]
             if value == system_user_id:
-                resolved_rec = self.system_record()
+                resolved_rec = proxy.system_record()
             else:
-                resolver_type = self._get_resolver_type(service)
-                resolved_rec = self.ghost_record({resolver_type: value})
+                resolved_rec = proxy.ghost_record({"id": value})
         self._service_values[service][value] = resolved_rec
-
-    def _get_resolver_type(self, service):
-        """Return the resolver type."""
-        for resolver in ResolverRegistry.get_registered_resolvers():
-            if resolver._service_id == service.id:
-                return resolver.type_id
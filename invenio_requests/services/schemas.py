@@ -49,37 +49,35 @@ class RequestEventSchema(BaseRecordSchema):
         """Return permissions to act on comments or empty dict."""
         service = current_requests.request_events_service
 
-        current_identity = context_schema.get()["identity"]
-        current_request = context_schema.get().get("request", None)
+        context = context_schema.get()
+        current_identity = context["identity"]
+        current_request = context.get("request", None)
+        # Result lists share an evaluator to check the permissions of all events.
+        evaluator = context.get("permissions_evaluator", None)
         permissions = {}
 
         if current_request is None:
             return {}
 
-        if obj.type == CommentEventType:
-            permissions["can_update_comment"] = service.check_permission(
+        def check(action):
+            if evaluator is not None:
+                return evaluator.allows(action, obj)
+            return service.check_permission(
                 current_identity,
-                "update_comment",
-                event=obj,
-                request=current_request,
-            )
-            permissions["can_delete_comment"] = service.check_permission(
-                current_identity,
-                "delete_comment",
+                action,
                 event=obj,
                 request=current_request,
             )
+
+        if obj.type == CommentEventType:
+            permissions["can_update_comment"] = check("update_comment")
+            permissions["can_delete_comment"] = check("delete_comment")
         else:
             # Other event types (e.g. log events) might be deleted comments, for which these permissions are inherently False.
             permissions["can_update_comment"] = False
             permissions["can_delete_comment"] = False
 
-        permissions["can_reply_comment"] = service.check_permission(
-            current_identity,
-            "reply_comment",
-            event=obj,
-            request=current_request,
-        )
+        permissions["can_reply_comment"] = check("reply_comment")
 
         return permissions
 
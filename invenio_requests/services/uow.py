@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Unit of work and operations for requests."""
+
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app
+from invenio_db import db
+from invenio_records_resources.services.uow import (
+    IndexRefreshOp,
+    Operation,
+    RecordCommitOp,
+    RecordDeleteOp,
+    RecordIndexOp,
+    UnitOfWork,
+)
+from invenio_search.engine import search
+
+
+class RequestIndexOp(Operation):
+    """Coalescing (re)index operation for a request.
+
+    Events register this operation for their request, to update the
+    events-related computed fields of the indexed request. Within a unit of
+    work, only the last of these operations for a given request is executed,
+    and none of them is executed if the request is also indexed by a
+    ``RecordCommitOp`` or a ``BulkIndexOp``, or deleted by a ``RecordDeleteOp``.
+
+    A ``RequestsUnitOfWork`` drops the redundant operations before committing.
+    In other units of work (e.g. the one of Invenio-Records-Resources), each
+    operation checks the others of the unit of work itself.
+
+    Depending on ``REQUESTS_REINDEX_STRATEGY``, the request is either indexed
+    when the unit of work is committed, or sent to the indexer's bulk queue.
+    """
+
+    def __init__(self, request, indexer):
+        """Constructor."""
+        self._request = request
+        self._indexer = indexer
+        self._skip = False
+
+    def _targets(self, op):
+        """Check if the given operation targets the same request."""
+        if isinstance(op, BulkIndexOp):
+            return any(record.id == self._request.id for record in op._records)
+        record = getattr(op, "_record", getattr(op, "_request", None))
+        return record is not None and getattr(record, "id", None) == self._request.id
+
+    def _is_superseded(self, uow):
+        """Check if another operation of the unit of work covers this one."""
+        registered_after = False
+        for op in uow._operations:
+            if op is self:
+                registered_after = True
+            elif not self._targets(op):
+                continue
+            elif isinstance(op, RecordDeleteOp):
+                return True
+            elif isinstance(op, RecordCommitOp) and op._indexer is not None:
+                return True
+            elif isinstance(op, BulkIndexOp) and op._indexer is not None:
+                return True
+            elif isinstance(op, RequestIndexOp) and registered_after:
+                return True
+        return False
+
+    def _use_queue(self):
+        """Check if the request should be sent to the bulk indexing queue."""
+        return current_app.config["REQUESTS_REINDEX_STRATEGY"] == "queue"
+
+    def on_commit(self, uow):
+        """Index the request, unless it's queued or covered by another op."""
+        # A RequestsUnitOfWork already dropped the redundant operations
+        if not isinstance(uow, RequestsUnitOfWork):
+            self._skip = self._is_superseded(uow)
+        if not self._skip and not self._use_queue():
+            self._indexer.index(self._request)
+
+    def on_post_commit(self, uow):
+        """Send the request to the bulk indexing queue."""
+        if not self._skip and self._use_queue():
+            self._indexer.bulk_index([str(self._request.id)])
+
+
+class BulkIndexOp(Operation):
+    """Index several records with a single bulk request.
+
+    Unlike ``RecordBulkIndexOp``, which sends the record IDs to the bulk
+    indexing queue, the given records are indexed when the unit of work is
+    committed, as with ``RecordCommitOp``.
+    """
+
+    def __init__(self, records, indexer, index_refresh=False):
+        """Constructor."""
+        self._records = records
+        self._indexer = indexer
+        self._index_refresh = index_refresh
+
+    def _index_action(self, record):
+        """Bulk index action for a record."""
+        index = self._indexer.record_to_index(record)
+        arguments = {}
+        body = self._indexer._prepare_record(record, index, arguments)
+        return {
+            "_op_type": "index",
+            "_index": self._indexer._prepare_index(index),
+            "_id": str(record.id),
+            "_version": record.revision_id,
+            "_version_type": self._indexer._version_type,
+            "_source": body,
+            **arguments,
+        }
+
+    def on_commit(self, uow):
+        """Index the records."""
+        if self._records:
+            arguments = {"refresh": self._index_refresh} if self._index_refresh else {}
+            search.helpers.bulk(
+                self._indexer.client,
+                (self._index_action(record) for record in self._records),
+                **arguments,
+            )
+
+
+class RequestCommitOp(RecordCommitOp):
+    """Record commit operation whose index refresh can be ``"wait_for"``.
+
+    With ``index_refresh="wait_for"``, the index call returns only once the
+    changes are visible to search, without forcing a refresh of the index.
+    """
+
+    def on_commit(self, uow):
+        """Index the record with the given refresh."""
+        if self._indexer is not None:
+            arguments = {"refresh": self._index_refresh} if self._index_refresh else {}
+            self._indexer.index(self._record, arguments=arguments)
+
+
+def merge_index_refresh(refresh, other):
+    """Merge two index refresh values, keeping the strongest one."""
+    if refresh is True or other is True:
+        return True
+    return refresh or other
+
+
+class RequestsUnitOfWork(UnitOfWork):
+    """Unit of work that elides redundant indexing operations.
+
+    Before the commit operations run, the following operations are dropped:
+
+    - index operations (``RecordCommitOp``, ``RecordIndexOp`` and
+      ``RequestIndexOp``) of a record that is deleted by a later
+      ``RecordDeleteOp``,
+    - index operations of a record that is indexed again by a later operation
+      (including a ``BulkIndexOp``) with at least the same index refresh, or by
+      any ``RecordCommitOp`` or ``BulkIndexOp`` in case of a ``RequestIndexOp``,
+    - repeated ``IndexRefreshOp`` of the same index.
+
+    The records are flushed to the database when the operations are registered,
+    so only the indexing is elided. The number of elided operations is available
+    in ``elided_ops`` after the commit.
+    """
+
+    #: Operation classes whose commit phase only indexes the record.
+    index_op_classes = (RecordCommitOp, RecordIndexOp, RequestCommitOp)
+
+    def __init__(self, session=None):
+        """Constructor."""
+        super().__init__(session=session)
+        self.elided_ops = 0
+
+    @staticmethod
+    def _record_key(record):
+        """Key identifying a record across its Python instances."""
+        return (type(record), str(record.id))
+
+    def _is_index_op(self, op):
+        """Check if the operation only indexes a record on commit."""
+        return type(op) in self.index_op_classes and op._indexer is not None
+
+    @staticmethod
+    def _applied_index_refresh(op):
+        """The index refresh of an operation, as it is applied."""
+        if isinstance(op, (RequestCommitOp, BulkIndexOp)):
+            return op._index_refresh
+        # Other operations fully refresh the index for any refresh value
+        return bool(op._index_refresh)
+
+    def _merge_index_refresh(self, kept, op):
+        """Merge the index refresh of an operation into a later one of its record.
+
+        Only ``RequestCommitOp`` takes any refresh value, so the refresh of the
+        elided operation is merged into it. Other operations are only elided if
+        they don't refresh the index more than the kept one.
+
+        :returns: whether the operation can be elided.
+        """
+        refresh = self._applied_index_refresh(op)
+        kept_refresh = self._applied_index_refresh(kept)
+        if not refresh or kept_refresh is True or kept_refresh == refresh:
+            return True
+        if type(kept) is RequestCommitOp:
+            kept._index_refresh = merge_index_refresh(kept_refresh, refresh)
+            return True
+        return False
+
+    def _elide_redundant_ops(self):
+        """Drop the operations that are covered by other operations."""
+        committed = set()
+        for op in self._operations:
+            if self._is_index_op(op):
+                committed.add(self._record_key(op._record))
+            elif isinstance(op, BulkIndexOp) and op._indexer is not None:
+                committed.update(self._record_key(r) for r in op._records)
+
+        deleted, indexed, refreshed = set(), {}, set()
+        operations = []
+        for op in reversed(self._operations):
+            if isinstance(op, RecordDeleteOp):
+                deleted.add(self._record_key(op._record))
+            elif self._is_index_op(op):
+                key = self._record_key(op._record)
+                if key in deleted:
+                    continue
+                if key in indexed and self._merge_index_refresh(indexed[key], op):
+                    continue
+                indexed.setdefault(key, op)
+            elif isinstance(op, BulkIndexOp) and op._indexer is not None:
+                # Keep the bulk operation, and cover the records it indexes
+                for record in op._records:
+                    key = self._record_key(record)
+                    if key not in deleted:
+                        indexed.setdefault(key, op)
+            elif isinstance(op, RequestIndexOp):
+                key = self._record_key(op._request)
+                if key in deleted or key in committed or key in indexed:
+                    continue
+                indexed[key] = op
+            elif type(op) is IndexRefreshOp:
+                key = (
+                    type(op._indexer),
+                    getattr(op._indexer, "record_cls", None),
+                    op._index,
+                    repr(sorted(op._kwargs.items())),
+                )
+                if key in refreshed:
+                    continue
+                refreshed.add(key)
+            operations.append(op)
+
+        operations.reverse()
+        self.elided_ops += len(self._operations) - len(operations)
+        self._operations = operations
+
+    @contextmanager
+    def savepoint(self):
+        """Undo the changes of a block of the unit of work if it fails.
+
+        The database changes of the block are rolled back to a savepoint, and the
+        operations registered within the block are dropped, while the changes
+        and the operations of the unit of work made before the block are kept.
+        """
+        num_ops = len(self._operations)
+        try:
+            with self.session.begin_nested():
+                yield self
+        except Exception:
+            del self._operations[num_ops:]
+            raise
+
+    def commit(self):
+        """Commit the unit of work, without the redundant operations."""
+        self._elide_redundant_ops()
+        if self.elided_ops:
+            current_app.logger.debug(
+                "Elided %s redundant unit of work operations.", self.elided_ops
+            )
+        super().commit()
+
+
+def unit_of_work(**kwargs):
+    """Decorator to auto-inject a ``RequestsUnitOfWork`` if none is provided.
+
+    Same as the decorator of Invenio-Records-Resources, but for the requests
+    unit of work. A unit of work that is passed in is used as is.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def inner(self, *args, **kwargs):
+            if kwargs.get("uow") is None:
+                with RequestsUnitOfWork(db.session) as uow:
+                    kwargs["uow"] = uow
+                    res = f(self, *args, **kwargs)
+                    uow.commit()
+                    return res
+            return f(self, *args, **kwargs)
+
+        return inner
+
+    return decorator
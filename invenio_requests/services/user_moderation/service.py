@@ -10,7 +10,6 @@
 from flask import current_app
 from invenio_accounts.models import Role
 from invenio_i18n import gettext as _
-from invenio_records_resources.services.uow import unit_of_work
 from invenio_search.engine import dsl
 
 from invenio_requests.customizations.user_moderation.user_moderation import (
@@ -20,6 +19,7 @@ from invenio_requests.proxies import current_request_type_registry
 from invenio_requests.services.user_moderation.errors import OpenRequestAlreadyExists
 
 from ..results import EntityResolverExpandableField
+from ..uow import unit_of_work
 
 
 class UserModerationRequestService:
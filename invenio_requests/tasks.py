@@ -13,40 +13,238 @@ from datetime import datetime, timezone
 from celery import shared_task
 from flask import current_app
 from invenio_access.permissions import system_identity
+from invenio_db import db
 from invenio_search.engine import dsl
+from sqlalchemy.orm.exc import NoResultFound
 
-from invenio_requests.proxies import current_user_moderation_service
+from invenio_requests.customizations import RequestState
+from invenio_requests.errors import CannotExecuteActionError
+from invenio_requests.proxies import (
+    current_request_type_registry,
+    current_user_moderation_service,
+)
+from invenio_requests.services.uow import RequestsUnitOfWork
 from invenio_requests.services.user_moderation.errors import OpenRequestAlreadyExists
 
 from .proxies import current_requests_service
 
 
-@shared_task
-def check_expired_requests():
-    """Retrieve expired requests and perform expired action."""
+def _expired_requests_chunks(chunk_size):
+    """Yield the IDs of the expired open requests, in chunks.
+
+    The requests are paged through with ``search_after``, sorted by expiry date
+    and ID, so that only one chunk is held in memory at a time. As the sort
+    values of the requests don't change when they expire, expiring the previous
+    chunks while paging doesn't skip any request.
+    """
     service = current_requests_service
     now = datetime.now(timezone.utc).isoformat()
 
-    # using scan to get all requests
-    requests_list = service.scan(
-        identity=system_identity,
-        extra_filter=dsl.query.Bool(
-            "must",
-            must=[
-                # somehow querying for '"term", **{"is_expired: True"}' will not return any requests # noqa
-                dsl.Q("range", **{"expires_at": {"lte": now}}),
-                dsl.Q("term", **{"is_open": True}),
-            ],
+    search = (
+        service.create_search(
+            system_identity, service.record_cls, service.config.search
+        )
+        .filter(
+            dsl.query.Bool(
+                "must",
+                must=[
+                    # somehow querying for '"term", **{"is_expired: True"}' will not return any requests # noqa
+                    dsl.Q("range", **{"expires_at": {"lte": now}}),
+                    dsl.Q("term", **{"is_open": True}),
+                ],
+            )
+        )
+        .sort("expires_at", "id")
+        .source(False)
+        .extra(size=chunk_size, track_total_hits=False)
+    )
+
+    while True:
+        hits = list(search.execute())
+        if not hits:
+            break
+        yield [hit.meta.id for hit in hits]
+        search = search.extra(search_after=list(hits[-1].meta.sort))
+
+
+@shared_task
+def check_expired_requests():
+    """Retrieve expired requests and dispatch their expiry in chunks.
+
+    Each chunk of ``REQUESTS_EXPIRY_CHUNK_SIZE`` requests is expired by a
+    separate ``expire_requests`` task, so that the work is spread over the
+    workers.
+
+    :returns: the number of dispatched chunks.
+    """
+    chunk_size = current_app.config["REQUESTS_EXPIRY_CHUNK_SIZE"]
+
+    num_chunks = 0
+    for ids in _expired_requests_chunks(chunk_size):
+        expire_requests.delay(ids)
+        num_chunks += 1
+    return num_chunks
+
+
+def _execute_expire(ids, uow=None):
+    """Execute the expire action on the given requests."""
+    return current_requests_service.execute_action_bulk(
+        identity=system_identity, ids=ids, action="expire", uow=uow, refresh=False
+    )
+
+
+def _expire_requests(ids):
+    """Expire the given requests, in a single transaction.
+
+    If the transaction fails with an unexpected error (e.g. in the expire
+    action of one request), it is rolled back and the requests are expired one
+    at a time instead, each in its own transaction, so that the failing request
+    doesn't hold back the others. The rollback releases the locks of the
+    requests, but the expire action is only executed if it still can be.
+
+    :returns: the number of requests that were processed, skipped or failed,
+        and the IDs of the skipped and of the failed requests.
+    """
+    try:
+        results = [_execute_expire(ids)]
+        unexpected = []
+    except Exception:
+        current_app.logger.exception(
+            "Could not expire requests %s at once, expiring them one at a time", ids
+        )
+        results, unexpected = [], []
+        for id_ in ids:
+            try:
+                with RequestsUnitOfWork(db.session) as uow:
+                    result = _execute_expire([id_], uow=uow)
+                    uow.commit()
+                results.append(result)
+            except Exception:
+                current_app.logger.exception("Could not expire request %s", id_)
+                unexpected.append(str(id_))
+
+    skipped, failed = [], list(unexpected)
+    for result in results:
+        for id_, error in result.errors:
+            if isinstance(error, (CannotExecuteActionError, NoResultFound)):
+                skipped.append(id_)
+            else:
+                failed.append(id_)
+                current_app.logger.warning(
+                    "Could not expire request %s: %s", id_, error
+                )
+
+    counts = {
+        "processed": sum(len(result.items) for result in results),
+        "skipped": len(skipped),
+        "failed": len(failed),
+    }
+    return counts, skipped, failed
+
+
+@shared_task
+def expire_requests(ids):
+    """Expire the given requests, in a single transaction.
+
+    Requests that can't be expired anymore (e.g. closed or deleted since they
+    were found) are skipped.
+
+    :returns: the number of requests that were processed, skipped or failed.
+    """
+    counts, _, _ = _expire_requests(ids)
+    current_app.logger.info("Expired requests: %s", counts)
+    return counts
+
+
+def _expire_locked_batches(lock_batch, unschedule_skipped=False):
+    """Expire the batches of requests locked by the given function.
+
+    Each batch is expired in its own transaction, whose commit releases the
+    locks. The requests that aren't expired are excluded from the next batches.
+
+    :param lock_batch: function locking a batch of requests, given the IDs of
+        the requests to exclude, and returning their IDs.
+    :param unschedule_skipped: whether to remove the skipped requests from their
+        expiry buckets.
+    :returns: the number of requests that were processed, skipped or failed.
+    """
+    counts = {"processed": 0, "skipped": 0, "failed": 0}
+    not_expired = set()
+    while True:
+        ids = lock_batch(not_expired)
+        if not ids:
+            break
+        batch_counts, skipped, failed = _expire_requests(ids)
+        for key, value in batch_counts.items():
+            counts[key] += value
+        not_expired.update(skipped, failed)
+
+        if unschedule_skipped and skipped:
+            current_requests_service.record_cls.unschedule_expiry(skipped)
+            db.session.commit()
+
+    # Release the locks of the last (empty) query
+    db.session.commit()
+    return counts
+
+
+def _open_statuses():
+    """Get the statuses of open requests, over all request types."""
+    return {
+        status
+        for request_type in current_request_type_registry
+        for status, state in request_type.available_statuses.items()
+        if state == RequestState.OPEN
+    }
+
+
+@shared_task
+def sweep_expired_requests():
+    """Expire the expired open requests, found in the database.
+
+    Unlike ``check_expired_requests``, the requests are found with the status
+    stored in the database instead of the search index. Each batch of
+    ``REQUESTS_EXPIRY_CHUNK_SIZE`` requests is locked with ``SKIP LOCKED`` and
+    expired in its own transaction, so that several sweeps can run concurrently
+    without processing the same requests.
+
+    :returns: the number of requests that were processed, skipped or failed.
+    """
+    batch_size = current_app.config["REQUESTS_EXPIRY_CHUNK_SIZE"]
+    statuses = _open_statuses()
+    now = datetime.now(timezone.utc)
+
+    counts = _expire_locked_batches(
+        lambda exclude: current_requests_service.record_cls.lock_expired_ids(
+            statuses, batch_size, exclude=exclude, now=now
+        )
+    )
+    current_app.logger.info("Swept expired requests: %s", counts)
+    return counts
+
+
+@shared_task
+def expire_due_requests():
+    """Expire the requests of the due expiry buckets.
+
+    Open requests with an expiry date are filed into time buckets (see
+    ``REQUESTS_EXPIRY_BUCKET_SIZE``), so that the cost of this task depends on
+    the number of due requests only, and not on the number of open ones. As for
+    ``sweep_expired_requests``, the batches are locked with ``SKIP LOCKED``.
+
+    :returns: the number of requests that were processed, skipped or failed.
+    """
+    batch_size = current_app.config["REQUESTS_EXPIRY_CHUNK_SIZE"]
+    now = datetime.now(timezone.utc)
+
+    counts = _expire_locked_batches(
+        lambda exclude: current_requests_service.record_cls.lock_due_ids(
+            batch_size, exclude=exclude, now=now
         ),
+        unschedule_skipped=True,
     )
-    for r in requests_list:
-        try:
-            service.execute_action(
-                identity=system_identity, id_=r["id"], action="expire"
-            )
-        except Exception as e:
-            current_app.logger.warning(e)
-            pass
+    current_app.logger.info("Expired due requests: %s", counts)
+    return counts
 
 
 @shared_task(ignore_result=True)
@@ -8,7 +8,11 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 import pytest
+from invenio_records.extensions import RecordExtension
 from jsonschema import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 from invenio_requests.customizations.event_types import CommentEventType
 from invenio_requests.records import RequestEvent
@@ -32,3 +36,102 @@ def test_request_event_jsonschema(app, db, example_request):
             request_id=example_request.number,
             type=CommentEventType,
         )
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN of a statement."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        """Constructor."""
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kwargs):
+    """Compile the EXPLAIN for the current database."""
+    prefix = "EXPLAIN QUERY PLAN" if compiler.dialect.name == "sqlite" else "EXPLAIN"
+    return f"{prefix} {compiler.process(element.statement, **kwargs)}"
+
+
+def test_last_reply_query_uses_index(app, db, example_request):
+    """The last reply lookup is served by the composite index."""
+    if db.engine.name == "postgresql":
+        # The tables are too small for the planner to prefer the index
+        db.session.execute(text("SET LOCAL enable_seqscan = off"))
+
+    query = RequestEvent.last_reply_query(example_request.id).limit(1)
+    plan = db.session.execute(Explain(query.statement)).cursor.fetchall()
+    assert "ix_request_events_request_id_type_created" in str(plan)
+
+
+def test_parent_id_column(app, db, example_request):
+    """The parent of a reply is stored in an indexed column."""
+
+    def _create(**kwargs):
+        event = RequestEvent.create(
+            {},
+            request=example_request.model,
+            request_id=str(example_request.id),
+            type=CommentEventType,
+            **kwargs,
+        )
+        event.commit()
+        return event
+
+    parent = _create()
+    replies = [_create(parent_id=parent.id) for _ in range(2)]
+    db.session.commit()
+
+    assert "parent_id" not in replies[0].model.data
+    assert RequestEvent.get_record(replies[0].id).parent_id == parent.id
+    assert RequestEvent.get_reply_stats(example_request.id, parent.id)[0] == 2
+    dump = replies[0].dumps()
+    assert dump["parent_id"] == str(parent.id)
+    assert RequestEvent.loads(dump).parent_id == parent.id
+    # Top-level events are dumped without a parent
+    dump = parent.dumps()
+    assert "parent_id" not in dump
+    assert RequestEvent.loads(dump).parent_id is None
+
+    if db.engine.name == "sqlite":
+        # Foreign keys are not enforced by SQLite
+        return
+
+    # Deleting the parent deletes its replies
+    parent.delete(force=True)
+    db.session.commit()
+    db.session.expire_all()
+    assert RequestEvent.model_cls.query.filter_by(parent_id=parent.id).count() == 0
+
+
+def test_create_many(app, db, example_request, monkeypatch):
+    """Events created in bulk run the same extensions as `create` and `commit`."""
+    calls = []
+
+    class _Extension(RecordExtension):
+        def post_create(self, record):
+            calls.append("post_create")
+
+        def post_commit(self, record):
+            calls.append("post_commit")
+
+    monkeypatch.setattr(
+        RequestEvent, "_extensions", RequestEvent._extensions + [_Extension()]
+    )
+    events = RequestEvent.create_many(
+        [
+            RequestEvent.build(
+                {},
+                request=example_request.model,
+                request_id=str(example_request.id),
+                type=CommentEventType,
+            )
+            for _ in range(2)
+        ]
+    )
+    db.session.commit()
+
+    assert calls == ["post_create", "post_commit"] * 2
+    assert RequestEvent.get_records([e.id for e in events])
@@ -12,8 +12,9 @@ from datetime import timezone
 from helpers import add_comment, add_log_event
 from invenio_access.permissions import system_identity
 
+from invenio_requests.proxies import current_events_service as events_service
 from invenio_requests.proxies import current_requests_service as requests_service
-from invenio_requests.records.api import Request
+from invenio_requests.records.api import Request, RequestEvent
 
 
 def test_last_reply_tracking_basic(example_request, user1, user2):
@@ -135,3 +136,32 @@ def test_search_index_last_reply(example_request, user2, search_clear):
 
     assert results["hits"]["total"] == 1
     _assert_hit_eq(results["hits"]["hits"][0])
+
+
+def test_last_reply_persisted(example_request, user1, monkeypatch):
+    """Test that the last reply is read from the request's model."""
+    revision_id = example_request.revision_id
+    comment1 = add_comment(example_request, user1.identity, "First comment")
+    comment2 = add_comment(example_request, user1.identity, "Second comment")
+
+    example_request = Request.get_record(example_request.id)
+    assert example_request.model.last_reply_id == comment2.id
+    assert example_request.model.last_activity_at == comment2.model.created
+    # Comments don't bump the revision of the request
+    assert example_request.revision_id == revision_id
+
+    # Dumping the request doesn't look up the last comment
+    def _fail(*args, **kwargs):
+        raise AssertionError("The last comment should not be queried.")
+
+    monkeypatch.setattr(RequestEvent, "get_last_reply_model", _fail)
+    dump = example_request.dumps()
+    assert dump["last_reply"]["id"] == str(comment2.id)
+    assert dump["last_activity_at"] == comment2.model.created.isoformat()
+    monkeypatch.undo()
+
+    # Deleting the last comment falls back to the previous one
+    events_service.delete(user1.identity, comment2.id)
+    example_request = Request.get_record(example_request.id)
+    assert example_request.model.last_reply_id == comment1.id
+    assert example_request.last_reply.id == comment1.id
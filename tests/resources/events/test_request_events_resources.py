@@ -13,6 +13,7 @@ import copy
 
 from invenio_requests.customizations.event_types import CommentEventType, LogEventType
 from invenio_requests.records.api import RequestEvent
+from invenio_requests.services.events.params import encode_cursor
 
 
 def assert_api_response_json(expected_json, received_json):
@@ -635,6 +636,82 @@ def test_get_replies_endpoint(
     assert len(hits) == 1, "Should return 1 reply (remaining)"
 
 
+def test_timeline_cursor_pagination(
+    app, client_logged_as, headers, events_resource_data, example_request
+):
+    """Test cursor-based (search_after) pagination of the timeline and replies."""
+    client = client_logged_as("user1@example.org")
+    request_id = example_request.id
+
+    comment_ids = []
+    for i in range(5):
+        data = copy.deepcopy(events_resource_data)
+        data["payload"]["content"] = f"Comment {i + 1}"
+        response = client.post(
+            f"/requests/{request_id}/comments", headers=headers, json=data
+        )
+        assert response.status_code == 201
+        comment_ids.append(response.json["id"])
+
+    for i in range(3):
+        data = copy.deepcopy(events_resource_data)
+        data["payload"]["content"] = f"Reply {i + 1}"
+        response = client.post(
+            f"/requests/{request_id}/comments/{comment_ids[0]}/reply",
+            headers=headers,
+            json=data,
+        )
+        assert response.status_code == 201
+
+    RequestEvent.index.refresh()
+    api_url = "https://127.0.0.1:5000/api"
+
+    # An empty cursor starts the cursor pagination
+    seen = []
+    url = f"/requests/{request_id}/timeline?size=2&cursor="
+    while url:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert "page" not in response.json
+        assert "prev" not in response.json["links"]
+        seen.extend(hit["id"] for hit in response.json["hits"]["hits"])
+        url = response.json["links"].get("next", "").replace(api_url, "")
+    assert seen == comment_ids
+
+    # Same for the replies of a comment
+    response = client.get(
+        f"/requests/{request_id}/comments/{comment_ids[0]}/replies?size=2&cursor=",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert len(response.json["hits"]["hits"]) == 2
+    url = response.json["links"]["next"].replace(api_url, "")
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert [h["payload"]["content"] for h in response.json["hits"]["hits"]] == [
+        "Reply 3"
+    ]
+    assert "next" not in response.json["links"]
+
+    # Invalid cursors are rejected
+    response = client.get(
+        f"/requests/{request_id}/timeline?cursor=invalid", headers=headers
+    )
+    assert response.status_code == 400
+    for sort_values in [["2026-01-01", comment_ids[0]], [1, "invalid"], [1, 2]]:
+        response = client.get(
+            f"/requests/{request_id}/timeline?cursor={encode_cursor(sort_values)}",
+            headers=headers,
+        )
+        assert response.status_code == 400
+
+    # Sorts without a stable order can't be paginated with a cursor
+    response = client.get(
+        f"/requests/{request_id}/timeline?sort=bestmatch&cursor=", headers=headers
+    )
+    assert response.status_code == 400
+
+
 def test_children_preview_limit(
     app, client_logged_as, headers, events_resource_data, example_request
 ):
@@ -978,3 +1055,68 @@ def test_join_relationship_queries(
     results_dict = result.to_dict()
     child_contents = [hit["payload"]["content"] for hit in results_dict["hits"]["hits"]]
     assert "Updated first reply for join test" in child_contents
+
+
+def test_bulk_comments(
+    app, client_logged_as, headers, events_resource_data, example_request, monkeypatch
+):
+    client = client_logged_as("user1@example.org")
+    request_id = str(example_request.id)
+
+    response = client.post(
+        f"/requests/{request_id}/comments", headers=headers, json=events_resource_data
+    )
+    parent_id = response.json["id"]
+
+    comments = [
+        {"request_id": request_id, **events_resource_data},
+        {"request_id": request_id, "parent_id": parent_id, **events_resource_data},
+    ]
+    response = client.post("/requests/comments/bulk", headers=headers, json=comments)
+    assert response.status_code == 201
+    hits = response.json["hits"]["hits"]
+    assert response.json["hits"]["total"] == 2
+    assert [hit["parent_id"] for hit in hits] == [None, parent_id]
+    assert all(hit["type"] == CommentEventType.type_id for hit in hits)
+
+    # Errors are reported per comment
+    response = client.post(
+        "/requests/comments/bulk",
+        headers=headers,
+        json=[{"request_id": request_id, **events_resource_data}, {}],
+    )
+    assert response.status_code == 400
+    assert response.json["errors"] == [
+        {"field": "1.request_id", "messages": ["Missing data for required field."]}
+    ]
+
+    response = client.post(
+        "/requests/comments/bulk",
+        headers=headers,
+        json=[{"request_id": request_id, "parent_id": "1", **events_resource_data}],
+    )
+    assert response.status_code == 400
+    assert response.json["errors"] == [
+        {"field": "0.parent_id", "messages": ["Not a valid UUID."]}
+    ]
+
+    # The body must be a list of comments
+    response = client.post(
+        "/requests/comments/bulk",
+        headers=headers,
+        json={"request_id": request_id, **events_resource_data},
+    )
+    assert response.status_code == 400
+
+    # The number of comments is limited
+    response = client.post("/requests/comments/bulk", headers=headers, json=[])
+    assert response.status_code == 400
+    monkeypatch.setitem(app.config, "REQUESTS_BULK_COMMENTS_MAX_ITEMS", 1)
+    response = client.post("/requests/comments/bulk", headers=headers, json=comments)
+    assert response.status_code == 400
+    assert response.json["errors"] == [
+        {
+            "field": "_schema",
+            "messages": ["At most 1 comments can be created at once."],
+        }
+    ]
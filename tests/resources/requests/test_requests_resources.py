@@ -262,3 +262,67 @@ def test_lock_request_disabled(
     # Lock request is not allowed
     response = client.get(f"/requests/{id_}/lock", headers=headers)
     assert response.status_code == 403
+
+
+def test_action_read_your_writes(app, client_logged_as, headers, example_request):
+    """The request is searchable right after executing an action."""
+    client = client_logged_as("user1@example.org")
+    id_ = str(example_request.id)
+
+    # The default "wait_for" refresh makes the action visible to search
+    response = client.post(f"/requests/{id_}/actions/submit", headers=headers)
+    assert response.status_code == 200
+    response = client.get(f'/requests?q=id:"{id_}"', headers=headers)
+    assert response.json["hits"]["hits"][0]["status"] == "submitted"
+
+    # The refresh can also be forced per call
+    response = client.post(
+        f"/requests/{id_}/actions/cancel?refresh=true", headers=headers
+    )
+    assert response.status_code == 200
+    response = client.get(f'/requests?q=id:"{id_}"', headers=headers)
+    assert response.json["hits"]["hits"][0]["status"] == "cancelled"
+
+    # Invalid refresh values are rejected
+    response = client.post(
+        f"/requests/{id_}/actions/cancel?refresh=maybe", headers=headers
+    )
+    assert response.status_code == 400
+
+
+def test_bulk_action(app, client_logged_as, headers, example_request, monkeypatch):
+    client = client_logged_as("user1@example.org")
+    id_ = str(example_request.id)
+
+    response = client.post(
+        "/requests/actions/submit", headers=headers, json={"ids": [id_, id_]}
+    )
+    assert response.status_code == 200
+    assert [hit["id"] for hit in response.json["hits"]["hits"]] == [id_]
+    assert response.json["hits"]["hits"][0]["status"] == "submitted"
+    assert response.json["errors"] == []
+
+    # Requests on which the action can't be executed are reported
+    response = client.post(
+        "/requests/actions/submit", headers=headers, json={"ids": [id_]}
+    )
+    assert response.status_code == 200
+    assert response.json["hits"]["total"] == 0
+    assert [error["id"] for error in response.json["errors"]] == [id_]
+
+    # The IDs are required
+    response = client.post("/requests/actions/submit", headers=headers, json={})
+    assert response.status_code == 400
+
+    # The IDs must be UUIDs, and their number is limited
+    response = client.post(
+        "/requests/actions/submit", headers=headers, json={"ids": ["1"]}
+    )
+    assert response.status_code == 400
+    assert response.json["errors"][0]["field"] == "ids.0"
+    monkeypatch.setitem(app.config, "REQUESTS_BULK_ACTION_MAX_REQUESTS", 1)
+    response = client.post(
+        "/requests/actions/submit", headers=headers, json={"ids": [id_, id_]}
+    )
+    assert response.status_code == 400
+    assert response.json["errors"][0]["field"] == "ids"
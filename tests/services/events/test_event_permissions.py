@@ -10,11 +10,17 @@
 """Permission tests."""
 
 import pytest
+from invenio_records_permissions.generators import Generator
 from invenio_records_resources.services.errors import PermissionDeniedError
 
 from invenio_requests.customizations.event_types import CommentEventType, LogEventType
 from invenio_requests.errors import RequestLockedError
 from invenio_requests.records.api import RequestEvent
+from invenio_requests.services.generators import IfLocked, Receiver
+from invenio_requests.services.permissions import (
+    PermissionPolicy,
+    RequestEventPermissionsEvaluator,
+)
 
 
 def test_creator_and_receiver_can_comment(
@@ -208,3 +214,64 @@ def test_commenting_on_locked_request(
     results = request_events_service.search(identity_simple_2, request.id)
     assert 3 == results.total  # comment + locked + declined
     # Creation and submission events are not logged because they have log_event=False
+
+
+def test_permissions_evaluator_matches_policy(
+    app,
+    identity_simple,
+    identity_simple_2,
+    identity_stranger,
+    request_events_service,
+    requests_service,
+    events_service_data,
+    request_with_locking_enabled,
+    monkeypatch,
+):
+    monkeypatch.setitem(app.config, "REQUESTS_LOCKING_ENABLED", True)
+    request = request_with_locking_enabled
+    comment = events_service_data["comment"]
+
+    events = [
+        RequestEvent.get_record(
+            request_events_service.create(
+                identity, request.id, comment, CommentEventType
+            ).id
+        )
+        for identity in [identity_simple, identity_simple_2]
+    ]
+
+    def assert_same_permissions():
+        request_record = requests_service.record_cls.get_record(request.id)
+        for identity in [identity_simple, identity_simple_2, identity_stranger]:
+            evaluator = RequestEventPermissionsEvaluator(
+                request_events_service, identity, request_record
+            )
+            for action in ["update_comment", "delete_comment", "reply_comment"]:
+                for event in events:
+                    assert evaluator.allows(
+                        action, event
+                    ) == request_events_service.check_permission(
+                        identity, action, event=event, request=request_record
+                    )
+
+    assert_same_permissions()
+    requests_service.lock_request(identity_simple_2, request.id)
+    assert_same_permissions()
+
+    # Generators the evaluator doesn't know are checked with the policy
+    monkeypatch.setitem(app.config, "REQUESTS_PERMISSION_POLICY", CustomPolicy)
+    assert_same_permissions()
+    requests_service.unlock_request(identity_simple_2, request.id)
+    assert_same_permissions()
+
+
+class EventCreator(Generator):
+    """An event-dependent generator the evaluator doesn't know."""
+
+    def needs(self, event=None, **kwargs):
+        return event.created_by.get_needs()
+
+
+class CustomPolicy(PermissionPolicy):
+    can_update_comment = [EventCreator()]
+    can_reply_comment = [IfLocked(then_=[Receiver()], else_=[EventCreator()])]
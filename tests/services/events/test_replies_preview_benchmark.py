@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Benchmark of the replies preview strategies.
+
+Indexing the timeline takes a while, so the benchmark only runs when the
+``REQUESTS_BENCHMARK`` environment variable is set, e.g.:
+
+    REQUESTS_BENCHMARK=1 pytest -s tests/services/events/test_replies_preview_benchmark.py
+"""
+
+import os
+import time
+
+import pytest
+from invenio_db import db
+from invenio_search.engine import search
+
+from invenio_requests.customizations import CommentEventType
+from invenio_requests.records.api import RequestEvent
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("REQUESTS_BENCHMARK"),
+    reason="Set REQUESTS_BENCHMARK to run the benchmarks.",
+)
+
+NUM_PARENTS = 10000
+REPLIES_EVERY = 10
+REPLIES_PER_THREAD = 3
+PAGES = 20
+
+
+def _create_timeline(request, identity):
+    """Create the timeline events in the database, without indexing them."""
+    comment = {"payload": {"content": "Benchmark comment", "format": "html"}}
+    events = []
+    for i in range(NUM_PARENTS):
+        parent = RequestEvent.create(
+            {}, request=request.model, request_id=str(request.id), type=CommentEventType
+        )
+        parent.update(comment)
+        parent.created_by = {"user": str(identity.id)}
+        has_replies = i % REPLIES_EVERY == 0
+        parent.reply_count = REPLIES_PER_THREAD if has_replies else 0
+        events.append(parent)
+
+        if has_replies:
+            for _ in range(REPLIES_PER_THREAD):
+                reply = RequestEvent.create(
+                    {},
+                    request=request.model,
+                    request_id=str(request.id),
+                    type=CommentEventType,
+                )
+                reply.update(comment)
+                reply.created_by = {"user": str(identity.id)}
+                reply.parent_id = str(parent.id)
+                events.append(reply)
+
+    for event in events:
+        event.commit()
+    db.session.commit()
+    return events
+
+
+def test_replies_preview_strategies(
+    app, identity_simple, create_request, request_events_service, monkeypatch
+):
+    """Compare the timings of the replies preview strategies."""
+    request = create_request(identity_simple)
+    events = _create_timeline(request, identity_simple)
+
+    indexer = request_events_service.indexer
+    search.helpers.bulk(
+        indexer.client, (indexer._index_action({"id": e.id}) for e in events)
+    )
+    RequestEvent.index.refresh()
+
+    results = {}
+    for strategy in ["join", "batched", "collapse"]:
+        monkeypatch.setitem(app.config, "REQUESTS_COMMENT_PREVIEW_STRATEGY", strategy)
+        hits = []
+        start = time.perf_counter()
+        for page in range(1, PAGES + 1):
+            res = request_events_service.search(
+                identity_simple,
+                request.id,
+                params={"page": page, "size": 25},
+                preview_size=2,
+            ).to_dict()
+            hits.extend(res["hits"]["hits"])
+        elapsed = time.perf_counter() - start
+        results[strategy] = hits
+        print(
+            f"{strategy}: {elapsed / PAGES * 1000:.1f} ms/page "
+            f"({NUM_PARENTS} parents, {PAGES} pages)"
+        )
+
+    assert results["batched"] == results["join"]
+    assert results["collapse"] == results["join"]
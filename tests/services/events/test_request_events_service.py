@@ -11,12 +11,20 @@
 """Service tests."""
 
 import copy
+import uuid
 from unittest.mock import MagicMock
 
 import pytest
 from invenio_access.permissions import system_identity
+from invenio_accounts.models import User
+from invenio_db import db
 from invenio_notifications.proxies import current_notifications_manager
+from invenio_records_resources.services.errors import PermissionDeniedError
 from invenio_records_resources.services.records.components import ServiceComponent
+from invenio_records_resources.services.uow import UnitOfWork
+from invenio_search import current_search_client
+from marshmallow import ValidationError
+from sqlalchemy import event
 
 from invenio_requests.customizations import CommentEventType, LogEventType
 from invenio_requests.customizations.event_types import EventType
@@ -24,8 +32,15 @@ from invenio_requests.errors import RequestEventPermissionError
 from invenio_requests.notifications.builders import (
     CommentRequestEventCreateNotificationBuilder,
 )
+from invenio_requests.notifications.generators import (
+    CommentRepliesParticipantsRecipient,
+    RequestParticipantsRecipient,
+)
 from invenio_requests.proxies import current_event_type_registry, current_requests
-from invenio_requests.records.api import RequestEvent
+from invenio_requests.records.api import Request, RequestEvent
+from invenio_requests.services.requests.config import RequestRecordIndexer
+from invenio_requests.services.results import EntityCache
+from invenio_requests.services.uow import RequestsUnitOfWork
 
 
 def test_schemas(app, example_request):
@@ -177,6 +192,57 @@ def test_events_are_searchable(
     assert search_log_event["type"] == LogEventType.type_id
 
 
+def test_focused_list(
+    app, identity_simple, events_service_data, create_request, request_events_service
+):
+    """The focused timeline returns the page containing the focused event."""
+    request = create_request(identity_simple)
+    request_id = request.id
+    comment = events_service_data["comment"]
+
+    comment_ids = [
+        str(
+            request_events_service.create(
+                identity_simple, request_id, dict(**comment), CommentEventType
+            ).id
+        )
+        for _ in range(5)
+    ]
+    reply_ids = [
+        str(
+            request_events_service.create(
+                identity_simple,
+                request_id,
+                dict(**comment),
+                CommentEventType,
+                parent_id=comment_ids[3],
+            ).id
+        )
+        for _ in range(3)
+    ]
+    RequestEvent.index.refresh()
+
+    def _focused_page(focus_event_id):
+        res = request_events_service.focused_list(
+            identity_simple, request_id, focus_event_id, page_size=2
+        ).to_dict()
+        return res["page"], [hit["id"] for hit in res["hits"]["hits"]]
+
+    assert _focused_page(comment_ids[0]) == (1, comment_ids[:2])
+    assert _focused_page(comment_ids[4]) == (3, comment_ids[4:])
+    # Focusing on a reply returns the page of its parent
+    assert _focused_page(reply_ids[0]) == (2, comment_ids[2:4])
+    # Unknown events fall back to the first page
+    assert _focused_page(str(uuid.uuid4())) == (1, comment_ids[:2])
+
+    # Replies are sorted from newest to oldest
+    res = request_events_service.focused_reply_list(
+        identity_simple, comment_ids[3], reply_ids[0], page_size=2
+    ).to_dict()
+    assert res["page"] == 2
+    assert [hit["id"] for hit in res["hits"]["hits"]] == [reply_ids[0]]
+
+
 #
 # invenio-notification testcases
 #
@@ -524,3 +590,480 @@ def test_delete_component_called(
 
     assert deleted["payload"]["content"] == "Component modified deletion message"
     assert deleted["type"] == LogEventType.type_id
+
+
+def test_search_hit_projection(
+    app,
+    identity_simple,
+    events_service_data,
+    create_request,
+    request_events_service,
+    monkeypatch,
+):
+    """Timeline results are the same with and without hit projections."""
+    request = create_request(identity_simple)
+    comment = events_service_data["comment"]
+    parent = request_events_service.create(
+        identity_simple, request.id, dict(**comment), CommentEventType
+    )
+    request_events_service.create(
+        identity_simple,
+        request.id,
+        dict(**comment),
+        CommentEventType,
+        parent_id=str(parent.id),
+    )
+    RequestEvent.index.refresh()
+
+    def _search():
+        return request_events_service.search(
+            identity_simple, request.id, expand=True
+        ).to_dict()
+
+    projected = _search()
+    monkeypatch.setattr(
+        request_events_service.config.result_list_cls, "hit_projection_cls", None
+    )
+    loaded = _search()
+
+    assert projected["hits"]["hits"][0]["children"]
+    assert projected == loaded
+
+
+def test_entity_cache(
+    app,
+    identity_simple,
+    events_service_data,
+    create_request,
+    request_events_service,
+    requests_service,
+):
+    """Entities are resolved once per HTTP request, across all expanded results."""
+    request = create_request(identity_simple)
+    comment = events_service_data["comment"]
+    parent = request_events_service.create(
+        identity_simple, request.id, dict(**comment), CommentEventType
+    )
+    request_events_service.create(
+        identity_simple,
+        request.id,
+        dict(**comment),
+        CommentEventType,
+        parent_id=str(parent.id),
+    )
+    RequestEvent.index.refresh()
+
+    assert EntityCache.current() is None
+
+    with app.app_context(), app.test_request_context():
+        # the creator of the reply was resolved with its parent
+        request_events_service.search(
+            identity_simple, request.id, expand=True
+        ).to_dict()
+        cache = EntityCache.current()
+        misses, hits = cache.misses, cache.hits
+        assert misses >= 1 and hits >= 1
+
+        # the creator of the request was resolved with the events
+        requests_service.read(identity_simple, request.id, expand=True).to_dict()
+        assert cache.hits > hits
+
+        # everything is cached the second time
+        misses = cache.misses
+        requests_service.read(identity_simple, request.id, expand=True).to_dict()
+        assert cache.misses == misses
+
+    with app.app_context(), app.test_request_context():
+        assert EntityCache.current().misses == 0
+
+
+def test_entity_cache_across_requests(
+    app,
+    identity_simple,
+    user1,
+    events_service_data,
+    create_request,
+    request_events_service,
+    monkeypatch,
+):
+    """Users are cached across HTTP requests, until they are updated."""
+    monkeypatch.setitem(app.config, "REQUESTS_ENTITY_CACHE_TTL", {"user": 60})
+    current_requests.resolved_entities_cache.clear()
+    request = create_request(identity_simple)
+    request_events_service.create(
+        identity_simple,
+        request.id,
+        dict(**events_service_data["comment"]),
+        CommentEventType,
+    )
+    RequestEvent.index.refresh()
+
+    def _misses():
+        with app.app_context(), app.test_request_context():
+            request_events_service.search(
+                identity_simple, request.id, expand=True
+            ).to_dict()
+            return EntityCache.current().misses
+
+    assert _misses() >= 1
+    assert _misses() == 0
+
+    user = db.session.get(User, user1.id)
+    user.username = "user1-renamed"
+    db.session.commit()
+    assert _misses() >= 1
+
+    # An entity read between the flush and the commit is not cached stale
+    assert _misses() == 0
+    user = db.session.get(User, user1.id)
+    user.username = "user1-renamed-again"
+    db.session.flush()
+    _misses()
+    db.session.commit()
+    assert _misses() >= 1
+
+
+def test_reply_counters(
+    app, identity_simple, events_service_data, create_request, request_events_service
+):
+    """Parent events keep track of the number of replies and of the last one."""
+    request = create_request(identity_simple)
+    comment = events_service_data["comment"]
+    parent = request_events_service.create(
+        identity_simple, request.id, dict(**comment), CommentEventType
+    )
+    parent_record = RequestEvent.get_record(parent.id)
+    assert parent_record.reply_count == 0
+    revision_id, updated = parent_record.revision_id, parent_record.updated
+
+    replies = [
+        request_events_service.create(
+            identity_simple,
+            request.id,
+            dict(**comment),
+            CommentEventType,
+            parent_id=str(parent.id),
+        )
+        for _ in range(2)
+    ]
+    parent_record = RequestEvent.get_record(parent.id)
+    assert parent_record.reply_count == 2
+    last_reply = RequestEvent.get_record(replies[-1].id)
+    assert parent_record.last_reply_at == last_reply.model.created.isoformat()
+    # The counters don't change the revision of the parent, nor its update date
+    assert parent_record.revision_id == revision_id
+    assert parent_record.updated == updated
+    RequestEvent.index.refresh()
+    hit = request_events_service.read(identity_simple, parent.id).to_dict()
+    assert hit["reply_count"] == 2
+    # Serialized from the index, the top-level event has no parent
+    timeline = request_events_service.search(identity_simple, request.id).to_dict()
+    assert [hit["parent_id"] for hit in timeline["hits"]["hits"]] == [None]
+    assert "parent_id" not in RequestEvent.get_record(parent.id).dumps()
+
+    # Deleted replies are kept as log events in the thread
+    request_events_service.delete(identity_simple, replies[0].id)
+    assert RequestEvent.get_record(parent.id).reply_count == 2
+
+    # An update of the parent loaded before a reply doesn't lose the reply
+    stale_parent = RequestEvent.get_record(parent.id)
+    request_events_service.create(
+        identity_simple,
+        request.id,
+        dict(**comment),
+        CommentEventType,
+        parent_id=str(parent.id),
+    )
+    stale_parent["payload"]["content"] = "Edited"
+    stale_parent.commit()
+    db.session.commit()
+    parent_record = RequestEvent.get_record(parent.id)
+    assert parent_record["payload"]["content"] == "Edited"
+    assert parent_record.reply_count == 3
+
+
+def test_batched_replies_preview(
+    app,
+    identity_simple,
+    events_service_data,
+    create_request,
+    request_events_service,
+    monkeypatch,
+):
+    """Batched reply previews are the same as the join inner hits."""
+    request = create_request(identity_simple)
+    comment = events_service_data["comment"]
+    parents = [
+        request_events_service.create(
+            identity_simple, request.id, dict(**comment), CommentEventType
+        )
+        for _ in range(3)
+    ]
+    for _ in range(3):
+        request_events_service.create(
+            identity_simple,
+            request.id,
+            dict(**comment),
+            CommentEventType,
+            parent_id=str(parents[1].id),
+        )
+    RequestEvent.index.refresh()
+
+    def _search():
+        res = request_events_service.search(
+            identity_simple, request.id, preview_size=2
+        ).to_dict()
+        return res["hits"]["hits"]
+
+    joined = _search()
+    for strategy in ["batched", "collapse"]:
+        monkeypatch.setitem(app.config, "REQUESTS_COMMENT_PREVIEW_STRATEGY", strategy)
+        batched = _search()
+
+        assert [len(hit["children"]) for hit in batched] == [0, 2, 0]
+        assert [hit["children_count"] for hit in batched] == [0, 3, 0]
+        assert batched == joined
+
+
+@pytest.mark.parametrize("uow_cls", [RequestsUnitOfWork, UnitOfWork])
+def test_request_reindex_coalesced(
+    app,
+    identity_simple,
+    events_service_data,
+    create_request,
+    requests_service,
+    request_events_service,
+    monkeypatch,
+    uow_cls,
+):
+    """Events of a unit of work reindex their request only once.
+
+    Other units of work than ``RequestsUnitOfWork`` are checked by the
+    operations themselves.
+    """
+    request = create_request(identity_simple)
+    comment = events_service_data["comment"]
+    index = MagicMock()
+    bulk_index = MagicMock()
+    monkeypatch.setattr(RequestRecordIndexer, "index", index)
+    monkeypatch.setattr(RequestRecordIndexer, "bulk_index", bulk_index)
+
+    def _create_comments():
+        with uow_cls(db.session) as uow:
+            for _ in range(3):
+                request_events_service.create(
+                    identity_simple,
+                    request.id,
+                    dict(**comment),
+                    CommentEventType,
+                    uow=uow,
+                )
+            uow.commit()
+
+    _create_comments()
+    assert index.call_count == 1
+    assert not bulk_index.called
+
+    index.reset_mock()
+    monkeypatch.setitem(app.config, "REQUESTS_REINDEX_STRATEGY", "queue")
+    _create_comments()
+    assert not index.called
+    bulk_index.assert_called_once_with([str(request.id)])
+
+    # The deleted request isn't reindexed for its deletion log event
+    bulk_index.reset_mock()
+    with uow_cls(db.session) as uow:
+        requests_service.delete(identity_simple, request.id, uow=uow)
+        uow.commit()
+    assert not index.called
+    assert not bulk_index.called
+
+
+def test_create_many(
+    app,
+    identity_simple,
+    events_service_data,
+    create_request,
+    request_events_service,
+    monkeypatch,
+):
+    """Events are created in bulk, and each request is reindexed once."""
+    requests = [create_request(identity_simple) for _ in range(2)]
+    comment = events_service_data["comment"]
+    parent = request_events_service.create(
+        identity_simple, requests[0].id, dict(**comment), CommentEventType
+    )
+    index = MagicMock()
+    monkeypatch.setattr(RequestRecordIndexer, "index", index)
+
+    items = [
+        {"request_id": r.id, "event_type": CommentEventType, "data": dict(**comment)}
+        for r in requests
+        for _ in range(2)
+    ]
+    items.append(
+        {
+            "request_id": requests[0].id,
+            "event_type": CommentEventType,
+            "data": dict(**comment),
+            "parent_id": str(parent.id),
+        }
+    )
+    items.append(
+        {
+            "request_id": requests[1].id,
+            "event_type": LogEventType,
+            "data": events_service_data["log"],
+        }
+    )
+    results = request_events_service.create_many(identity_simple, items)
+    RequestEvent.index.refresh()
+
+    assert len(results) == len(items)
+    assert index.call_count == len(requests)
+    assert RequestEvent.get_record(parent.id).reply_count == 1
+    for request in requests:
+        events = request_events_service.search(identity_simple, request.id)
+        assert events.total == 3
+    last_reply_ids = [
+        str(Request.get_record(r.id).model.last_reply_id) for r in requests
+    ]
+    assert last_reply_ids == [str(results[4].id), str(results[3].id)]
+
+    # Validation errors of all items are reported together, nothing is created
+    invalid = {"payload": {"content": "", "format": "html"}}
+    items = [
+        {"request_id": requests[0].id, "event_type": CommentEventType, "data": d}
+        for d in [dict(**comment), invalid, invalid]
+    ]
+    with pytest.raises(ValidationError) as e:
+        request_events_service.create_many(identity_simple, items)
+    assert list(e.value.messages) == [1, 2]
+    assert (
+        RequestEvent.model_cls.query.filter_by(request_id=requests[0].id).count() == 4
+    )
+
+    # Replies are only created on parents of the same request, as for `create`
+    reply = {
+        "request_id": requests[1].id,
+        "event_type": CommentEventType,
+        "data": dict(**comment),
+        "parent_id": str(parent.id),
+    }
+    with pytest.raises(PermissionDeniedError):
+        request_events_service.create(
+            identity_simple,
+            requests[1].id,
+            dict(**comment),
+            CommentEventType,
+            parent_id=parent.id,
+        )
+    with pytest.raises(PermissionDeniedError):
+        request_events_service.create_many(identity_simple, [reply])
+    assert (
+        RequestEvent.model_cls.query.filter_by(request_id=requests[1].id).count() == 3
+    )
+
+
+@pytest.mark.parametrize("lookup", ["database", "aggregation"])
+def test_request_participants_recipients(
+    app,
+    events_service_data,
+    submit_request,
+    request_events_service,
+    requests_service,
+    user1,
+    user2,
+    superuser,
+    lookup,
+):
+    """Participants are found without scanning the timeline of the request."""
+    request = submit_request(user2.identity, receiver=user1.user)
+    comment = events_service_data["comment"]
+    request_events_service.create(
+        superuser.identity, request.id, dict(**comment), CommentEventType
+    )
+    RequestEvent.index.refresh()
+
+    assert Request.get_participant_ids(request.id) == {
+        str(user2.id),
+        str(superuser.id),
+    }
+
+    notification = MagicMock()
+    notification.context = {
+        "request": requests_service.read(system_identity, request.id).to_dict()
+    }
+    generator = RequestParticipantsRecipient(key="request", lookup=lookup)
+    recipients = generator(notification, {})
+    assert set(recipients) == {str(user1.id), str(user2.id), str(superuser.id)}
+
+
+@pytest.mark.parametrize("lookup", ["database", "aggregation"])
+def test_comment_replies_participants_recipients(
+    app,
+    events_service_data,
+    submit_request,
+    request_events_service,
+    requests_service,
+    user1,
+    user2,
+    superuser,
+    lookup,
+    monkeypatch,
+):
+    """Thread participants are found with a single query, however long it is."""
+    request = submit_request(user2.identity, receiver=user1.user)
+    comment = events_service_data["comment"]
+    parent = request_events_service.create(
+        user2.identity, request.id, dict(**comment), CommentEventType
+    )
+    request_events_service.create_many(
+        superuser.identity,
+        [
+            {
+                "request_id": request.id,
+                "event_type": CommentEventType,
+                "data": dict(**comment),
+                "parent_id": parent.id,
+            }
+            for _ in range(1000)
+        ],
+    )
+    # a comment outside of the thread
+    request_events_service.create(
+        user1.identity, request.id, dict(**comment), CommentEventType
+    )
+    RequestEvent.index.refresh()
+
+    notification = MagicMock()
+    notification.context = {
+        "request": requests_service.read(system_identity, request.id).to_dict(),
+        "request_event": {"id": parent.id, "parent_id": parent.id},
+    }
+    generator = CommentRepliesParticipantsRecipient(
+        key="request", event_key="request_event", lookup=lookup
+    )
+
+    statements = []
+    searches = []
+    search = current_search_client.search
+
+    def _search(*args, **kwargs):
+        searches.append(kwargs)
+        return search(*args, **kwargs)
+
+    def _count(*args):
+        statements.append(args[2])
+
+    monkeypatch.setattr(current_search_client, "search", _search)
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        recipients = generator(notification, {})
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert set(recipients) == {str(user2.id), str(superuser.id)}
+    # the participants and their users are looked up independently of the
+    # number of replies
+    assert len(statements) + len(searches) <= 4
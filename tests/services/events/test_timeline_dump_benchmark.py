@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Benchmark of the dumping of a page of timeline events.
+
+The benchmark only runs when the ``REQUESTS_BENCHMARK`` environment variable
+is set, e.g.:
+
+    REQUESTS_BENCHMARK=1 pytest -s tests/services/events/test_timeline_dump_benchmark.py
+"""
+
+import os
+import time
+
+import pytest
+from invenio_records_resources.services import ServiceSchemaWrapper
+
+from invenio_requests.customizations import CommentEventType
+from invenio_requests.proxies import current_requests
+from invenio_requests.records.api import RequestEvent
+from invenio_requests.services.results import wrap_type_schema
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("REQUESTS_BENCHMARK"),
+    reason="Set REQUESTS_BENCHMARK to run the benchmarks.",
+)
+
+PAGE_SIZE = 100
+ROUNDS = 20
+
+
+def test_timeline_dump(app, identity_simple, create_request, request_events_service):
+    """Dump a page of comments with fresh and with cached schema wrappers."""
+    request = create_request(identity_simple)
+    events = []
+    for _ in range(PAGE_SIZE):
+        event = RequestEvent.create(
+            {"payload": {"content": "Benchmark comment", "format": "html"}},
+            request=request.model,
+            request_id=str(request.id),
+            type=CommentEventType,
+        )
+        event.created_by = {"user": str(identity_simple.id)}
+        events.append(event)
+    cache = current_requests._wrapped_events_schema_cache
+
+    def _fresh(event):
+        return ServiceSchemaWrapper(
+            request_events_service, event.type.marshmallow_schema()
+        )
+
+    def _cached(event):
+        return wrap_type_schema(request_events_service, event.type, cache)
+
+    def _dump(get_schema):
+        timings = []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            dumps = [
+                get_schema(e).dump(
+                    e, context={"identity": identity_simple, "record": e}
+                )
+                for e in events
+            ]
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return timings[len(timings) // 2], dumps
+
+    fresh, fresh_dumps = _dump(_fresh)
+    cached, cached_dumps = _dump(_cached)
+
+    assert cached_dumps == fresh_dumps
+    print(
+        f"\n{PAGE_SIZE} events: fresh schemas {fresh * 1000:.1f} ms, "
+        f"cached schemas {cached * 1000:.1f} ms"
+    )
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Benchmark of the rendering of the links of a page of requests.
+
+The benchmark only runs when the ``REQUESTS_BENCHMARK`` environment variable
+is set, e.g.:
+
+    REQUESTS_BENCHMARK=1 pytest -s tests/services/requests/test_links_benchmark.py
+"""
+
+import os
+import time
+
+import pytest
+from invenio_base import invenio_url_for
+
+from invenio_requests.services.links import URLTemplates
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("REQUESTS_BENCHMARK"),
+    reason="Set REQUESTS_BENCHMARK to run the benchmarks.",
+)
+
+PAGE_SIZE = 100
+ROUNDS = 20
+
+
+def test_links_page(app, identity_simple, submit_request, requests_service):
+    """Render the links of a page of submitted requests, with their actions."""
+    requests = [submit_request(identity_simple) for _ in range(PAGE_SIZE)]
+    # create, submit, delete, accept, decline, cancel and expire
+    assert len(requests[0].type.available_actions) == 7
+    links_tpl = requests_service.links_item_tpl
+
+    def _render():
+        timings = []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            links = [links_tpl.expand(identity_simple, r) for r in requests]
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return timings[len(timings) // 2], links
+
+    templated, templated_links = _render()
+
+    build = URLTemplates.build
+    URLTemplates.build = lambda self, endpoint, values, anchor=None: invenio_url_for(
+        endpoint, _anchor=anchor, **values
+    )
+    try:
+        built, built_links = _render()
+    finally:
+        URLTemplates.build = build
+
+    assert templated_links == built_links
+    print(
+        f"\n{PAGE_SIZE} requests: templated {templated * 1000:.1f} ms, "
+        f"built {built * 1000:.1f} ms"
+    )
@@ -13,10 +13,16 @@ import copy
 
 import pytest
 from invenio_access.permissions import system_identity
+from invenio_records_permissions.generators import ConditionalGenerator
 from invenio_records_resources.services.errors import PermissionDeniedError
 
 from invenio_requests.errors import CannotExecuteActionError, RequestLockedError
-from invenio_requests.records.api import RequestEventFormat
+from invenio_requests.records.api import Request, RequestEventFormat
+from invenio_requests.services.generators import Creator, Receiver
+from invenio_requests.services.permissions import (
+    PermissionPolicy,
+    RequestPermissionsEvaluator,
+)
 
 
 @pytest.fixture()
@@ -349,3 +355,69 @@ def test_only_system_and_receiver_can_lock_request(
     monkeypatch.setitem(app.config, "REQUESTS_LOCKING_ENABLED", False)
     with pytest.raises(PermissionDeniedError):
         requests_service.lock_request(system_identity, request.id)
+
+
+class IfSubmitted(ConditionalGenerator):
+    """A generator type the evaluator doesn't know."""
+
+    def _condition(self, request=None, **kwargs):
+        return request.status == "submitted"
+
+
+def test_permissions_evaluator_matches_policy(
+    app,
+    identity_simple,
+    identity_simple_2,
+    identity_stranger,
+    requests_service,
+    submit_request,
+    monkeypatch,
+):
+    monkeypatch.setitem(app.config, "REQUESTS_REVIEWERS_ENABLED", True)
+    policy_cls = requests_service.config.permission_policy_cls
+
+    class CustomPolicy(policy_cls):
+        can_read = [IfSubmitted(then_=[Receiver()], else_=[Creator()])]
+
+    request = submit_request(identity_simple)
+    request["reviewers"] = [{"user": str(identity_stranger.id)}]
+    # The actions of the default policy, except the ones that need an event
+    actions = [
+        name[len("can_") :]
+        for name in vars(PermissionPolicy)
+        if name.startswith("can_")
+        and name not in ("can_update_comment", "can_delete_comment")
+    ]
+
+    for status in request.type.available_statuses:
+        request.status = status
+        for identity in [
+            identity_simple,
+            identity_simple_2,
+            identity_stranger,
+            system_identity,
+        ]:
+            for cls in [policy_cls, CustomPolicy]:
+                evaluator = RequestPermissionsEvaluator(cls, identity)
+                for action in actions:
+                    expected = cls(action, request=request).allows(identity)
+                    assert evaluator.allows(action, request) == expected, (
+                        cls,
+                        status,
+                        identity,
+                        action,
+                    )
+
+
+def test_list_has_permissions_to(
+    app, identity_simple, identity_simple_2, requests_service, submit_request
+):
+    requests = [submit_request(identity_simple) for _ in range(2)]
+    Request.index.refresh()
+    actions = ["action_accept", "action_cancel", "update"]
+
+    for identity in [identity_simple, identity_simple_2]:
+        permissions = requests_service.search(identity).has_permissions_to(actions)
+        for request in requests:
+            item = requests_service.read(identity, request.id)
+            assert permissions[str(request.id)] == item.has_permissions_to(actions)
@@ -9,7 +9,11 @@
 
 """Schemas tests."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 from invenio_requests.proxies import current_requests
+from invenio_requests.services.results import wrap_type_schema
+from tests.mock_module.request_type import FakeRequestType
 
 
 def test_load_dump_only_field(app, identity_simple, submit_request, requests_service):
@@ -51,3 +55,31 @@ def test_load_additional_field(
     # This might seem surprising, but it's a side-effect of pre-load cleaning.
     # That the data above has the "is_locked" field because it is marked as load_default=False, is the most important part.
     assert [] == errors
+
+
+def test_wrapped_schema_cache(app, identity_simple, submit_request, requests_service):
+    request = submit_request(identity_simple)
+    cache = current_requests._wrapped_schema_cache
+    context = {"identity": identity_simple, "record": request}
+
+    schema = wrap_type_schema(requests_service, request.type, cache)
+    assert schema is wrap_type_schema(requests_service, request.type, cache)
+    assert schema.dump(request, context=context) == requests_service._wrap_schema(
+        request.type.marshmallow_schema()
+    ).dump(request, context=context)
+
+    # Clearing the schema cache invalidates the wrapped schemas
+    current_requests._schema_cache.clear()
+    assert schema is not wrap_type_schema(requests_service, request.type, cache)
+
+
+def test_wrapped_schema_per_thread(app, identity_simple, requests_service):
+    schema = wrap_type_schema(
+        requests_service, FakeRequestType(), current_requests._wrapped_schema_cache
+    )
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        other = pool.submit(lambda: schema.schema_instance).result()
+
+    # Each thread dumps with its own schema instance
+    assert schema.schema_instance is schema.schema_instance
+    assert other is not schema.schema_instance
@@ -9,11 +9,32 @@
 
 """Service tests."""
 
+import uuid
+from unittest.mock import MagicMock
+
 import pytest
+from invenio_base import invenio_url_for
+from invenio_db import db
 from invenio_records_resources.services.errors import PermissionDeniedError
+from invenio_records_resources.services.uow import (
+    IndexRefreshOp,
+    RecordCommitOp,
+    RecordIndexDeleteOp,
+    RecordIndexOp,
+)
 
 from invenio_requests.customizations.event_types import CommentEventType
+from invenio_requests.errors import CannotExecuteActionError
+from invenio_requests.proxies import current_requests
 from invenio_requests.records.api import Request, RequestEvent, RequestEventFormat
+from invenio_requests.services.links import URLTemplates
+from invenio_requests.services.results import RequestHitProjection
+from invenio_requests.services.uow import (
+    RequestCommitOp,
+    RequestIndexOp,
+    RequestsUnitOfWork,
+)
+from tests.mock_module.request_type import FakeRequestType, anchor_func
 
 
 def test_submit_request(app, identity_simple, submit_request, request_events_service):
@@ -211,3 +232,208 @@ def test_lock_request(
     monkeypatch.setitem(app.config, "REQUESTS_LOCKING_ENABLED", False)
     with pytest.raises(PermissionDeniedError):
         requests_service.lock_request(identity_simple_2, request_id)
+
+
+def test_search_hit_projection(
+    app,
+    identity_simple,
+    submit_request,
+    requests_service,
+    request_events_service,
+    monkeypatch,
+):
+    """Search results are the same with and without hit projections."""
+    request = submit_request(identity_simple)
+    request_events_service.create(
+        identity_simple,
+        request.id,
+        {"payload": {"content": "Hello", "format": "html"}},
+        CommentEventType,
+    )
+    Request.index.refresh()
+
+    def _search():
+        return requests_service.search(identity_simple).to_dict()
+
+    projected = _search()
+    monkeypatch.setattr(
+        requests_service.config.result_list_cls, "hit_projection_cls", None
+    )
+    loaded = _search()
+
+    assert projected["hits"]["hits"]
+    assert projected == loaded
+
+    # Each projected field is the same as the loaded record's
+    def _reference(value):
+        return getattr(value, "reference_dict", value)
+
+    source = Request.get_record(request.id).dumps()
+    projection = RequestHitProjection(source, Request)
+    record = Request.loads(source)
+    for name in RequestHitProjection.fields:
+        value, expected = getattr(projection, name), getattr(record, name)
+        if name == "reviewers":
+            value = [_reference(r) for r in value]
+            expected = [_reference(r) for r in expected]
+        assert _reference(value) == _reference(expected), name
+
+
+def test_expand_reviewers(
+    app, identity_simple, submit_request, requests_service, users
+):
+    """Reviewers are expanded in order, including the ones that don't exist."""
+    request = submit_request(identity_simple)
+    reviewers = [
+        {"user": str(users["user3"].id)},
+        {"user": "999999"},
+        {"user": str(users["user2"].id)},
+    ]
+    request["reviewers"] = reviewers
+    request.commit()
+    db.session.commit()
+
+    expanded = requests_service.read(identity_simple, request.id, expand=True).data[
+        "expanded"
+    ]["reviewers"]
+    assert [r["id"] for r in expanded] == [r["user"] for r in reviewers]
+    assert expanded[1]["is_ghost"]
+
+
+def test_links_url_templates(
+    app, identity_simple, submit_request, requests_service, monkeypatch
+):
+    """Links rendered from URL templates are the same as built ones."""
+    requests = [submit_request(identity_simple) for _ in range(3)]
+
+    def _links():
+        return [
+            requests_service.read(identity_simple, r.id).to_dict()["links"]
+            for r in requests
+        ]
+
+    templated = _links()
+    templates = current_requests.url_templates
+    assert templates._templates
+
+    monkeypatch.setattr(
+        URLTemplates,
+        "build",
+        lambda self, endpoint, values, anchor=None: invenio_url_for(
+            endpoint, _anchor=anchor, **values
+        ),
+    )
+    assert templated == _links()
+
+    # the anchor of the links of request types isn't overridden
+    assert FakeRequestType.links_item["self_html"]._anchor_func is anchor_func
+
+    # values that would be quoted are built as usual
+    monkeypatch.undo()
+    assert templates.build("requests.read", {"id": "a b"}) == invenio_url_for(
+        "requests.read", id="a b"
+    )
+
+
+def test_uow_elides_redundant_ops(app, identity_simple, create_request):
+    request = create_request(identity_simple)
+    indexer = MagicMock()
+
+    with RequestsUnitOfWork(db.session) as uow:
+        uow.register(RequestIndexOp(request, indexer=indexer))
+        uow.register(RecordIndexOp(request, indexer=indexer, index_refresh=True))
+        uow.register(
+            RequestCommitOp(request, indexer=indexer, index_refresh="wait_for")
+        )
+        uow.register(IndexRefreshOp(indexer=indexer))
+        uow.register(IndexRefreshOp(indexer=indexer))
+        uow.commit()
+
+    assert uow.elided_ops == 3
+    indexer.index.assert_called_once_with(request, arguments={"refresh": True})
+    indexer.refresh.assert_called_once()
+
+    # The refresh is only merged into operations that support it
+    indexer.reset_mock()
+    with RequestsUnitOfWork(db.session) as uow:
+        uow.register(RecordIndexOp(request, indexer=indexer, index_refresh=True))
+        uow.register(RecordIndexOp(request, indexer=indexer))
+        uow.commit()
+
+    assert uow.elided_ops == 0
+    assert indexer.index.call_count == 2
+
+    # Index operations of deleted records are dropped
+    indexer.reset_mock()
+    with RequestsUnitOfWork(db.session) as uow:
+        uow.register(RequestIndexOp(request, indexer=indexer))
+        uow.register(RecordIndexOp(request, indexer=indexer))
+        uow.register(RecordIndexDeleteOp(request, indexer=indexer))
+        uow.commit()
+
+    assert uow.elided_ops == 2
+    assert not indexer.index.called
+    indexer.delete.assert_called_once()
+
+
+def test_uow_savepoint(app, identity_simple, create_request):
+    request = create_request(identity_simple)
+    indexer = MagicMock()
+
+    with RequestsUnitOfWork(db.session) as uow:
+        uow.register(RecordIndexOp(request, indexer=indexer))
+        with pytest.raises(CannotExecuteActionError):
+            with uow.savepoint():
+                request["title"] = "Changed"
+                uow.register(RecordCommitOp(request, indexer=indexer))
+                raise CannotExecuteActionError("accept")
+
+        # The changes and operations of the failed block are undone
+        assert len(uow._operations) == 1
+        assert Request.get_record(request.id).get("title") != "Changed"
+        uow.commit()
+    indexer.index.assert_called_once()
+
+
+def test_execute_action_bulk(
+    app,
+    identity_simple,
+    identity_simple_2,
+    create_request,
+    submit_request,
+    requests_service,
+    monkeypatch,
+):
+    submitted = [submit_request(identity_simple) for _ in range(3)]
+    created = create_request(identity_simple)
+    missing = uuid.uuid4()
+    ids = [r.id for r in submitted] + [created.id, missing]
+
+    result = requests_service.execute_action_bulk(identity_simple_2, ids, "accept")
+
+    assert [item.id for item in result.items] == [str(r.id) for r in submitted]
+    assert [str(id_) for id_, _ in result.errors] == [str(created.id), str(missing)]
+    assert isinstance(result.errors[0][1], CannotExecuteActionError)
+    for request in submitted:
+        assert Request.get_record(request.id).status == "accepted"
+    assert Request.get_record(created.id).status == "created"
+
+    # The executed requests are searchable right away
+    q = " OR ".join(f'id:"{r.id}"' for r in submitted)
+    res = requests_service.search(identity_simple_2, params={"q": q})
+    assert [hit["status"] for hit in res.hits] == ["accepted"] * 3
+
+    # Requests without permission are reported as errors too
+    request = submit_request(identity_simple)
+    result = requests_service.execute_action_bulk(
+        identity_simple, [request.id], "accept"
+    )
+    assert not result.items
+    assert isinstance(result.errors[0][1], PermissionDeniedError)
+
+    # Unexpected errors are not reported, but raised
+    monkeypatch.setattr(
+        Request, "commit", MagicMock(side_effect=RuntimeError("unexpected"))
+    )
+    with pytest.raises(RuntimeError):
+        requests_service.execute_action_bulk(identity_simple_2, [request.id], "accept")
@@ -11,10 +11,17 @@
 from datetime import datetime, timedelta, timezone
 
 from invenio_access.permissions import system_identity
+from invenio_db import db
 from invenio_search.engine import dsl
 
+from invenio_requests.customizations.actions import ExpireAction
 from invenio_requests.records.api import Request
-from invenio_requests.tasks import check_expired_requests
+from invenio_requests.tasks import (
+    check_expired_requests,
+    expire_due_requests,
+    expire_requests,
+    sweep_expired_requests,
+)
 
 
 def test_check_expired_requests(
@@ -89,3 +96,117 @@ def test_check_expired_requests(
         ),
     )
     assert request_list.total == 1
+
+
+def test_check_expired_requests_chunks(
+    app, identity_simple, submit_request, requests_service, monkeypatch
+):
+    """Expired requests are dispatched and expired in chunks."""
+    monkeypatch.setitem(app.config, "REQUESTS_EXPIRY_CHUNK_SIZE", 2)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    requests = [
+        submit_request(identity_simple, expires_at=now.isoformat()) for _ in range(3)
+    ]
+    Request.index.refresh()
+
+    assert check_expired_requests() == 2
+    for request in requests:
+        assert Request.get_record(request.id).status == "expired"
+
+    # Requests that are already expired are skipped
+    counts = expire_requests([str(r.id) for r in requests])
+    assert counts == {"processed": 0, "skipped": 3, "failed": 0}
+
+
+def test_sweep_expired_requests(
+    app, identity_simple, create_request, submit_request, monkeypatch
+):
+    """Expired open requests are found and expired from the database."""
+    monkeypatch.setitem(app.config, "REQUESTS_EXPIRY_CHUNK_SIZE", 2)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    expired = [
+        submit_request(identity_simple, expires_at=now.isoformat()) for _ in range(3)
+    ]
+    not_expired = [
+        create_request(identity_simple, expires_at=now.isoformat()),
+        submit_request(identity_simple),
+        submit_request(
+            identity_simple, expires_at=(now + timedelta(days=1)).isoformat()
+        ),
+    ]
+
+    # Excluded requests are not locked
+    ids = Request.lock_expired_ids({"submitted"}, 10, exclude=[expired[0].id])
+    assert {str(id_) for id_ in ids} == {str(r.id) for r in expired[1:]}
+    db.session.commit()
+
+    # The sweep doesn't depend on the search index
+    counts = sweep_expired_requests()
+    assert counts == {"processed": 3, "skipped": 0, "failed": 0}
+    for request in expired:
+        assert Request.get_record(request.id).status == "expired"
+    for request in not_expired:
+        assert Request.get_record(request.id).status != "expired"
+
+    assert sweep_expired_requests()["processed"] == 0
+
+
+def test_expire_due_requests(app, identity_simple, create_request, submit_request):
+    """Only the requests of the due expiry buckets are expired."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    later = (now + timedelta(days=1)).isoformat()
+
+    # Requests are filed into a bucket once they're open
+    created = create_request(identity_simple, expires_at=now.isoformat())
+    assert Request.get_record(created.id).expiry_bucket is None
+    due = submit_request(identity_simple, expires_at=now.isoformat())
+    assert Request.get_record(due.id).expiry_bucket is not None
+    not_due = submit_request(identity_simple, expires_at=later)
+
+    # Changing the expiry date moves the request to another bucket
+    moved = submit_request(identity_simple, expires_at=later)
+    moved = Request.get_record(moved.id)
+    bucket = moved.expiry_bucket
+    moved.expires_at = now
+    moved.commit()
+    db.session.commit()
+    assert moved.expiry_bucket < bucket
+
+    # Excluded requests are not locked
+    ids = Request.lock_due_ids(10, exclude=[due.id])
+    assert [str(id_) for id_ in ids] == [str(moved.id)]
+    db.session.commit()
+
+    counts = expire_due_requests()
+    assert counts == {"processed": 2, "skipped": 0, "failed": 0}
+    for request in [due, moved]:
+        request = Request.get_record(request.id)
+        assert request.status == "expired"
+        assert request.expiry_bucket is None
+    assert Request.get_record(not_due.id).status == "submitted"
+    assert Request.get_record(created.id).status == "created"
+
+
+def test_expire_due_requests_failure(app, identity_simple, submit_request, monkeypatch):
+    """A request whose expiry fails doesn't hold back the others."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+    failing = submit_request(identity_simple, expires_at=now)
+    due = submit_request(identity_simple, expires_at=now)
+
+    execute = ExpireAction.execute
+
+    def _execute(self, identity, uow, **kwargs):
+        if str(self.request.id) == str(failing.id):
+            raise RuntimeError("Expiry failed.")
+        return execute(self, identity, uow, **kwargs)
+
+    monkeypatch.setattr(ExpireAction, "execute", _execute)
+
+    counts = expire_due_requests()
+    assert counts == {"processed": 1, "skipped": 0, "failed": 1}
+    assert Request.get_record(due.id).status == "expired"
+    assert Request.get_record(failing.id).status == "submitted"
+
+    # The failing request is picked up again by the next run
+    counts = expire_due_requests()
+    assert counts == {"processed": 0, "skipped": 0, "failed": 1}
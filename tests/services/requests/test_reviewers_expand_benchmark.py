@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Benchmark of the expansion of the reviewers of a page of requests.
+
+The benchmark only runs when the ``REQUESTS_BENCHMARK`` environment variable
+is set, e.g.:
+
+    REQUESTS_BENCHMARK=1 pytest -s tests/services/requests/test_reviewers_expand_benchmark.py
+"""
+
+import os
+import time
+
+import pytest
+
+from invenio_requests.services.results import (
+    CachedFieldsResolver,
+    MultiEntityResolverExpandableField,
+)
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("REQUESTS_BENCHMARK"),
+    reason="Set REQUESTS_BENCHMARK to run the benchmarks.",
+)
+
+PAGE_SIZE = 100
+ROUNDS = 20
+
+
+def test_expand_reviewers_page(app, identity_simple, users):
+    """Expand a full page of requests with the maximum number of reviewers."""
+    max_reviewers = app.config["REQUESTS_REVIEWERS_MAX_NUMBER"]
+    user_ids = [str(u.id) for u in users.values()]
+    # Mix existing users with ghosts, sharing some reviewers across requests
+    hits = [
+        {
+            "reviewers": [
+                {"user": user_ids[j % len(user_ids)] if j % 3 else str(10000 + i + j)}
+                for j in range(max_reviewers)
+            ]
+        }
+        for i in range(PAGE_SIZE)
+    ]
+
+    timings = []
+    for _ in range(ROUNDS):
+        resolver = CachedFieldsResolver(
+            [MultiEntityResolverExpandableField("reviewers")]
+        )
+        start = time.perf_counter()
+        resolver.resolve(identity_simple, hits)
+        expanded = [resolver.expand(identity_simple, hit) for hit in hits]
+        timings.append(time.perf_counter() - start)
+
+        assert all(len(e["reviewers"]) == max_reviewers for e in expanded)
+
+    timings.sort()
+    print(
+        f"\n{PAGE_SIZE} requests x {max_reviewers} reviewers: "
+        f"median {timings[len(timings) // 2] * 1000:.1f} ms, "
+        f"min {timings[0] * 1000:.1f} ms"
+    )